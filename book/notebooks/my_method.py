@@ -3,13 +3,16 @@ import poptus
 import numpy as np
 
 
-def run_method(configuration, model, logger):
+def run_method(configuration, model, logger, history=None):
+    # history is an optional poptus.HistoryRecorder with scalar f in which
+    # the full trajectory is recorded exactly rather than logged as text
     # Setup logging
     DEBUG_0 = poptus.LOG_LEVEL_MIN_DEBUG
     DEBUG_2 = poptus.LOG_LEVEL_MIN_DEBUG + 2
 
-    log, log_debug, warn, log_and_abort = \
-        poptus.create_log_functions(logger, "Method")
+    functions = poptus.create_log_functions(logger, "Method")
+    log, log_debug, warn, log_and_abort = functions
+    log_array = functions.log_array
 
     # Extract config values & log
     x_0 = np.array(configuration["starting_point"])
@@ -18,9 +21,7 @@ def run_method(configuration, model, logger):
     threshold = configuration["stopping_criteria"]
     
     log("")
-    log("Starting point")
-    for i, coordinate in enumerate(x_0):
-        log(f"\te_{i+1}\t{coordinate}")
+    log_array("Starting point", x_0, poptus.LOG_LEVEL_DEFAULT)
     log(f"Iteration budget = {max_iters}")
     log(f"Stopping criteria = {threshold}")
     log_debug("Expert configuration values", DEBUG_0)
@@ -35,6 +36,8 @@ def run_method(configuration, model, logger):
     for i in range(1, max_iters+1):
         log(f"Iteration {i}")
         f_i = model(x_i)
+        if history is not None:
+            history.append(x_i, f=f_i)
         if f_i <= threshold:
             break
 
@@ -8,7 +8,9 @@ def model_to_wrap(x, p, log_debug):
     # Accept log_debug function rather than logger to avoid recreating log
     # functions with each model evaluation.
     value = np.linalg.norm(x, ord=p)
-    log_debug(f"Value = {value} at {x}", poptus.LOG_LEVEL_MIN_DEBUG)
+    # Defer formatting so that the array is only converted to a string if the
+    # message will actually be logged.
+    log_debug("Value = {} at {}", poptus.LOG_LEVEL_MIN_DEBUG, value, x)
     return value
 
 def construct_model(configuration):
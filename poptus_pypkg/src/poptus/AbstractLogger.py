@@ -1,7 +1,11 @@
+import os
 import sys
 import abc
+import weakref
+import threading
 
 from numbers import Integral
+from collections.abc import Mapping
 
 from ._constants import (
     LOG_LEVELS,
@@ -9,6 +13,34 @@ from ._constants import (
 )
 
 
+# Serializes changes of verbosity levels with the refreshing of all log
+# functions and loggers that depend on them.  The lock is held while forking so
+# that it is not held by a thread that does not exist in the child.
+_LEVELS_LOCK = threading.RLock()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_LEVELS_LOCK.acquire,
+                        after_in_parent=_LEVELS_LOCK.release,
+                        after_in_child=_LEVELS_LOCK.release)
+
+# Log functions and wrapping loggers that must be refreshed when the verbosity
+# levels of a logger change indexed by logger.  These are held weakly so that
+# they can be collected independently of the logger.
+_DEPENDENTS = weakref.WeakKeyDictionary()
+
+
+def _check_level(level):
+    if (not isinstance(level, Integral)) or (level not in LOG_LEVELS):
+        _log_and_abort(ValueError, f"Invalid logging verbosity level ({level})")
+
+
+def _log_and_abort(my_exception, msg):
+    # Do not assume that we can use derived class logging functions.  Mimic
+    # error logging of StandardLogger.
+    sys.stderr.write(f"[{POPTUS_LOG_TAG}] ERROR - {msg}\n")
+    sys.stderr.flush()
+    raise my_exception(msg)
+
+
 class AbstractLogger(metaclass=abc.ABCMeta):
     def __init__(self, level):
         """
@@ -18,20 +50,25 @@ class AbstractLogger(metaclass=abc.ABCMeta):
         In this way, this package helps implement and enforce a common, uniform
         logging interface across the universe.
 
+        The verbosity level of the logger applies to all callers except those
+        given their own level with :py:meth:`set_caller_levels`.  All levels
+        can be changed at any time, including while other threads are logging,
+        and the changes are seen immediately by all log functions created
+        previously with :py:func:`create_log_functions`.
+
         :param level: Verbosity level of the logger
         """
         super().__init__()
 
-        if (not isinstance(level, Integral)) or (level not in LOG_LEVELS):
-            # Do not assume that we can use derived class logging functions yet.
-            # Mimic error logging of StandardLogger.
-            msg = f"Invalid logging verbosity level ({level})"
-            sys.stderr.write(f"[{POPTUS_LOG_TAG}] ERROR - {msg}\n")
-            sys.stderr.flush()
-            raise ValueError(msg)
+        _check_level(level)
 
         self.__level = level
 
+        # Levels set for callers and the levels of all callers resolved so far
+        # indexed by caller name
+        self.__caller_levels = {}
+        self.__resolved = {}
+
     @property
     def level(self):
         """
@@ -39,11 +76,135 @@ class AbstractLogger(metaclass=abc.ABCMeta):
         """
         return self.__level
 
+    @level.setter
+    def level(self, level):
+        """
+        Change the logger's verbosity level.
+
+        :param level: New verbosity level
+        """
+        _check_level(level)
+        with _LEVELS_LOCK:
+            self.__level = level
+            self._levels_changed()
+
+    @property
+    def caller_levels(self):
+        """
+        :return: ``dict`` of verbosity levels set for callers indexed by caller
+            name
+        """
+        return dict(self.__caller_levels)
+
+    def set_caller_levels(self, levels):
+        """
+        Set the verbosity levels of individual callers, replacing all levels
+        set previously.  Caller names are hierarchical with levels separated by
+        periods so that the level set for ``Method`` also applies to
+        ``Method.linesearch`` unless ``Method.linesearch`` is given its own
+        level.  Callers without a level use the logger's level.
+
+        Levels are resolved when first needed for each caller and then cached.
+        Log functions created with :py:func:`create_log_functions` store the
+        resolved level of their caller, which is updated by this method so that
+        changes apply to existing log functions without adding to the cost of
+        each call.
+
+        :param levels: ``dict`` of verbosity levels indexed by caller name
+        """
+        if not isinstance(levels, Mapping):
+            _log_and_abort(TypeError, f"Caller levels not a dict ({levels})")
+        for caller, level in levels.items():
+            if (not isinstance(caller, str)) or (caller == ""):
+                _log_and_abort(TypeError, f"Invalid caller name ({caller})")
+            elif (not isinstance(level, Integral)) or \
+                    (level not in LOG_LEVELS):
+                msg = f"Invalid logging verbosity level for {caller} ({level})"
+                _log_and_abort(ValueError, msg)
+
+        with _LEVELS_LOCK:
+            self.__caller_levels = dict(levels)
+            self._levels_changed()
+
+    def _add_dependent(self, dependent):
+        # Register an object whose _levels_changed method must be called
+        # whenever the levels of this logger change.  Log functions and
+        # loggers that wrap this logger use this.
+        with _LEVELS_LOCK:
+            _DEPENDENTS.setdefault(self, weakref.WeakSet()).add(dependent)
+
+    def _levels_changed(self):
+        # Called with _LEVELS_LOCK held whenever the levels of this logger or
+        # of any logger that it wraps change.  Derived classes that cache
+        # levels should clear their caches and then call this.
+        self.__resolved = {}
+        for dependent in list(_DEPENDENTS.get(self, ())):
+            dependent._levels_changed()
+
+    def level_of(self, caller):
+        """
+        :param caller: Name of calling code
+        :return: Verbosity level that applies to messages of the given caller
+        """
+        try:
+            return self.__resolved[caller]
+        except KeyError:
+            pass
+
+        # Resolve under the lock so that a level resolved with stale settings
+        # cannot be cached after the settings change.
+        with _LEVELS_LOCK:
+            level = self.__level
+            name = caller
+            while name:
+                if name in self.__caller_levels:
+                    level = self.__caller_levels[name]
+                    break
+                name = name.rpartition(".")[0]
+            self.__resolved[caller] = level
+            return level
+
+    def __getstate__(self):
+        # Loggers are copied (e.g., to other processes by pickling) by their
+        # configuration.  Derived classes that hold resources such as open
+        # files, threads, or buffered messages should override this and
+        # __setstate__ so that copies acquire their own resources.  Neither
+        # resolved levels nor dependents are copied.
+        state = self.__dict__.copy()
+        state["_AbstractLogger__resolved"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def flush(self):
+        """
+        Write to their final destination all messages that the logger might
+        have buffered.  Concrete loggers that do not buffer messages need not
+        override this.
+        """
+        pass
+
+    def close(self):
+        """
+        Flush all buffered messages and release all resources held by the
+        logger.  Concrete loggers that hold no resources need not override
+        this.  Loggers are also context managers that are closed on exit.
+        """
+        self.flush()
+
     @abc.abstractmethod
     def log(self, caller, msg, level):
         """
-        Log the given message if the logger's verbosity level is greater than or
-        equal to the given message's level.  The actual, final logged message,
+        Log the given message if the verbosity level of the caller, as given by
+        :py:meth:`level_of`, is greater than or equal to the given message's
+        level.  The actual, final logged message,
         which includes the message provided by the caller, should not given any
         indication that the message indicates a warning or an error.
 
@@ -58,6 +219,28 @@ class AbstractLogger(metaclass=abc.ABCMeta):
         """
         ...
 
+    def log_fields(self, caller, msg, level, fields):
+        """
+        Log the given message along with the given typed key/value fields if
+        the verbosity level of the caller is greater than or equal to the given
+        message's level.
+
+        Concrete loggers that can record typed fields (|eg|
+        :py:class:`JsonLinesLogger`) override this.  By default, each field is
+        appended to the message as ``key=value`` and the result is logged with
+        :py:meth:`log`.
+
+        :param caller: Name of calling code so that concrete logger can include
+            this in actual logged message if so desired
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        :param fields: ``dict`` of typed values (|eg| iteration count,
+            objective function value) indexed by field name
+        """
+        parts = [msg] if msg else []
+        parts += [f"{key}={value}" for key, value in fields.items()]
+        self.log(caller, " ".join(parts), level)
+
     @abc.abstractmethod
     def warn(self, caller, msg):
         """
@@ -83,3 +266,10 @@ class AbstractLogger(metaclass=abc.ABCMeta):
         :param msg: Error message to log
         """
         ...
+
+    def _write_error(self, caller, msg):
+        # Log the given error message like error but without also printing it
+        # to stderr.  Loggers that send each error to several loggers use this
+        # so that the error is printed once.  Concrete loggers that print
+        # errors to stderr and also record them elsewhere should override this.
+        self.error(caller, msg)
@@ -0,0 +1,349 @@
+import os
+import atexit
+import asyncio
+import weakref
+import threading
+
+from numbers import Integral
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ._constants import (
+    LOG_LEVELS, LOG_LEVEL_NONE,
+    QUEUE_POLICY_DROP_OLDEST, QUEUE_POLICY_DROP_NEW,
+    POPTUS_LOG_TAG
+)
+from .AbstractLogger import AbstractLogger
+from .StandardLogger import StandardLogger
+
+# Async loggers that have not been closed.  These are closed at exit so that
+# all queued messages are written.
+_OPEN_LOGGERS = weakref.WeakSet()
+
+
+def _close_open_loggers():
+    for logger in list(_OPEN_LOGGERS):
+        logger.close()
+
+
+def _reset_open_loggers():
+    for logger in list(_OPEN_LOGGERS):
+        logger._after_fork_in_child()
+
+
+atexit.register(_close_open_loggers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_open_loggers)
+
+
+class AsyncLogger(AbstractLogger):
+    def __init__(self, logger, max_size=1024, policy=QUEUE_POLICY_DROP_OLDEST):
+        """
+        A concrete |poptus| logger class for use in ``asyncio`` applications
+        whose log, warning, and error calls never block the event loop.  All
+        messages, including error messages, are pushed onto a bounded queue
+        and written in order by the given logger in a dedicated worker thread
+        so that file I/O is kept off of the loop.  Since log functions created
+        with :py:func:`create_log_functions` only call these methods, they can
+        be used from coroutines as usual.
+
+        Coroutines can wait for all queued messages to be written without
+        blocking the loop with ``await logger.aflush()`` and can close the
+        logger with ``await logger.aclose()``.  Note that error messages are
+        also written asynchronously so that they might appear on ``stderr``
+        after the caller has raised its exception.  Error messages are never
+        dropped.  If the queue is full, they instead replace the oldest queued
+        message that is not an error or, if only errors are queued, are queued
+        regardless.  The logger is closed automatically at exit.  Messages
+        logged after closing the logger are passed on to the given logger
+        synchronously.  Copies of the logger made by pickling or forking start
+        with an empty queue and their own worker thread.
+
+        :param logger: Concrete logger object derived from
+            :py:class:`AbstractLogger` that writes the queued messages.  The
+            verbosity level and caller levels of this logger are also those of
+            the async logger.
+        :param max_size: Maximum number of messages that can be queued
+        :param policy: Message to drop when a message is logged while the
+            queue is full.  ``QUEUE_POLICY_DROP_OLDEST`` drops the oldest
+            queued message and ``QUEUE_POLICY_DROP_NEW`` drops the new message.
+            ``QUEUE_POLICY_BLOCK`` is not accepted since it would block the
+            event loop.
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        if not isinstance(logger, AbstractLogger):
+            log_and_abort(TypeError, "Invalid logger type")
+        elif (not isinstance(max_size, Integral)) or \
+                isinstance(max_size, bool):
+            log_and_abort(TypeError, f"max_size is not an integer ({max_size})")
+        elif max_size <= 0:
+            log_and_abort(ValueError, f"max_size is not positive ({max_size})")
+        elif policy not in (QUEUE_POLICY_DROP_OLDEST, QUEUE_POLICY_DROP_NEW):
+            log_and_abort(ValueError, f"Invalid async policy ({policy})")
+
+        super().__init__(logger.level)
+
+        # LOG_LEVEL_NONE is not an acceptable message level for general logging
+        # as per the documentation in AbstractLogger.
+        self.__valid = set(LOG_LEVELS).difference({LOG_LEVEL_NONE})
+
+        self.__logger = logger
+        self.__max_size = max_size
+        self.__policy = policy
+
+        self.__n_dropped = 0
+        self.__closed = False
+        self.__start()
+
+        logger._add_dependent(self)
+        _OPEN_LOGGERS.add(self)
+
+    def __start(self):
+        # All queue state is protected by the lock, which is never held while
+        # writing.  A single worker thread runs all drains and flushes of the
+        # wrapped logger in the order submitted.
+        self.__records = deque()
+        self.__is_scheduled = False
+        self.__lock = threading.Lock()
+        self.__executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="poptus-AsyncLogger"
+        )
+
+    def __reduce__(self):
+        return (type(self), (self.__logger, self.__max_size, self.__policy))
+
+    def _after_fork_in_child(self):
+        # The worker thread does not exist in the child and the messages that
+        # it had yet to write are written by the parent
+        self.__start()
+
+    @property
+    def logger(self):
+        """
+        :return: Logger that writes the queued messages
+        """
+        return self.__logger
+
+    @property
+    def max_size(self):
+        """
+        :return: Maximum number of messages that can be queued
+        """
+        return self.__max_size
+
+    @property
+    def policy(self):
+        """
+        :return: Message dropped when a message is logged while the queue is
+            full
+        """
+        return self.__policy
+
+    @property
+    def n_dropped(self):
+        """
+        :return: Number of messages dropped so far because the queue was full
+        """
+        with self.__lock:
+            return self.__n_dropped
+
+    @property
+    def level(self):
+        """
+        :return: Verbosity level of the wrapped logger
+        """
+        return self.__logger.level
+
+    @level.setter
+    def level(self, level):
+        """
+        Set the verbosity level of the wrapped logger.
+
+        :param level: New verbosity level
+        """
+        self.__logger.level = level
+
+    @property
+    def caller_levels(self):
+        """
+        :return: ``dict`` of verbosity levels set for callers in the wrapped
+            logger indexed by caller name
+        """
+        return self.__logger.caller_levels
+
+    def set_caller_levels(self, levels):
+        """
+        Set the verbosity levels of individual callers in the wrapped logger.
+        See :py:meth:`AbstractLogger.set_caller_levels`.
+
+        :param levels: ``dict`` of verbosity levels indexed by caller name
+        """
+        self.__logger.set_caller_levels(levels)
+
+    def level_of(self, caller):
+        """
+        :param caller: Name of calling code
+        :return: Verbosity level that the wrapped logger applies to messages of
+            the given caller
+        """
+        return self.__logger.level_of(caller)
+
+    def __evict(self):
+        # Drop the oldest queued message that is not an error, if any
+        for i, (_, _, is_error) in enumerate(self.__records):
+            if not is_error:
+                del self.__records[i]
+                self.__n_dropped += 1
+                return True
+        return False
+
+    def __put(self, write, *args, is_error=False):
+        with self.__lock:
+            if not self.__closed:
+                if len(self.__records) >= self.__max_size:
+                    if is_error:
+                        self.__evict()
+                    elif (self.__policy == QUEUE_POLICY_DROP_NEW) or \
+                            (not self.__evict()):
+                        self.__n_dropped += 1
+                        return
+                self.__records.append((write, args, is_error))
+
+                if self.__is_scheduled:
+                    return
+                self.__is_scheduled = True
+                write = None
+
+        if write is None:
+            self.__submit(self.__drain)
+        else:
+            write(*args)
+
+    def __submit(self, work):
+        # Work cannot be submitted once the interpreter has started shutting
+        # down, in which case it is done by the caller.
+        try:
+            return self.__executor.submit(work)
+        except RuntimeError:
+            self.__drain()
+            return None
+
+    def __drain(self):
+        while True:
+            with self.__lock:
+                if not self.__records:
+                    self.__is_scheduled = False
+                    return
+                batch = list(self.__records)
+                self.__records.clear()
+
+            for write, args, _ in batch:
+                try:
+                    write(*args)
+                except Exception as exc:
+                    msg = f"Unable to write queued message ({exc})"
+                    StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            self.__logger.flush()
+
+    def flush(self):
+        """
+        Block until all queued messages have been written and then flush the
+        wrapped logger.  Coroutines should use :py:meth:`aflush` instead.
+        """
+        with self.__lock:
+            closed = self.__closed
+        # Flushes run after all drains submitted so far
+        future = None if closed else self.__submit(self.__logger.flush)
+        if future is None:
+            self.__logger.flush()
+        else:
+            future.result()
+
+    def close(self):
+        """
+        Block until all queued messages have been written, stop the worker
+        thread, and close the wrapped logger.  Coroutines should use
+        :py:meth:`aclose` instead.
+        """
+        with self.__lock:
+            self.__closed = True
+        self.__executor.shutdown(wait=True)
+        _OPEN_LOGGERS.discard(self)
+        self.__logger.close()
+
+    async def aflush(self):
+        """
+        Wait without blocking the event loop until all queued messages have
+        been written and the wrapped logger flushed.
+        """
+        await asyncio.to_thread(self.flush)
+
+    async def aclose(self):
+        """
+        Wait without blocking the event loop until all queued messages have
+        been written and the logger closed.
+        """
+        await asyncio.to_thread(self.close)
+
+    def log(self, caller, msg, level):
+        """
+        Queue the given message for logging if the caller's verbosity level is
+        greater than or equal to the given message's level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        """
+        # Since the use of these functions is setup by developers rather than
+        # users, we can keep the error checking minimal and light.  If
+        # developers use a bad level, they should find out immediately and
+        # easily.
+        assert level in self.__valid
+
+        if self.__logger.level_of(caller) >= level:
+            self.__put(self.__logger.log, caller, msg, level)
+
+    def log_fields(self, caller, msg, level, fields):
+        """
+        Queue the given message and fields for logging if the caller's
+        verbosity level is greater than or equal to the given message's level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        :param fields: ``dict`` of typed values indexed by field name
+        """
+        assert level in self.__valid
+
+        if self.__logger.level_of(caller) >= level:
+            self.__put(self.__logger.log_fields, caller, msg, level, fields)
+
+    def warn(self, caller, msg):
+        """
+        Queue the given warning message for logging regardless of the logger's
+        verbosity level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            warning
+        :param msg: Warning message to log
+        """
+        self.__put(self.__logger.warn, caller, msg)
+
+    def error(self, caller, msg):
+        """
+        Queue the given error message for logging regardless of the logger's
+        verbosity level.  Error messages are never dropped.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            error
+        :param msg: Error message to log
+        """
+        self.__put(self.__logger.error, caller, msg, is_error=True)
+
+    def _write_error(self, caller, msg):
+        self.__put(self.__logger._write_error, caller, msg, is_error=True)
@@ -0,0 +1,129 @@
+import sys
+import time
+import struct
+
+from ._constants import (
+    LOG_LEVELS, LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT,
+    BINARY_LOG_MAGIC, BINARY_LOG_HEADER,
+    BINARY_LOG_CALLER, BINARY_LOG_WARNING, BINARY_LOG_ERROR,
+    POPTUS_LOG_TAG
+)
+from .FileLogger import FileLogger
+from .StandardLogger import StandardLogger
+
+_HEADER = struct.Struct(BINARY_LOG_HEADER)
+_MAX_N_CALLERS = 2**16
+
+
+class BinaryLogger(FileLogger):
+    def __init__(self, filename, overwrite, level=LOG_LEVEL_DEFAULT,
+                 buffer_size=None):
+        """
+        A concrete |poptus| logger class that writes all log, warning, and error
+        messages to the given file in a compact binary format intended for
+        high-volume debug logging.  Error messages are also written to standard
+        error as text.
+
+        Each caller name is written to file only once and each message is
+        written as a fixed-layout header containing its level, an ID for its
+        caller, and a timestamp followed by the message itself.  Files can be
+        decoded into the text that :py:class:`FileLogger` would have written
+        with :py:func:`decode_binary_log`.
+
+        :param level: Verbosity level of the logger
+        :param filename: Name and path of file to write to
+        :param overwrite: If a file with the given name already exists, then it
+            is overwritten if ``True`` or an error is raised if ``False``.
+        :param buffer_size: ``None`` or the size in bytes of the write buffer
+            of the persistent file handle.  See :py:class:`FileLogger`.  Since
+            line buffering is meaningless for binary files, a size of one
+            makes the persistent file handle unbuffered.
+
+        Copies of the logger made by pickling or forking keep the record of
+        callers already written to file.  Therefore, different processes
+        should not write to the same binary log file.
+        """
+        # This error checks all arguments
+        super().__init__(filename, overwrite, level, buffer_size)
+
+        # LOG_LEVEL_NONE is not an acceptable message level for general logging
+        # as per the documentation in AbstractLogger.
+        self.__valid = set(LOG_LEVELS).difference({LOG_LEVEL_NONE})
+
+        # IDs of callers already written to file indexed by caller name
+        self.__callers = {}
+
+    def _open(self, buffering):
+        # FileLogger manages the file handles.  Line buffering is meaningless
+        # for binary files and so a buffer size of one means unbuffered.
+        if buffering == 1:
+            buffering = 0
+        fptr = open(self.filename, "ab", buffering=buffering)
+        if fptr.tell() == 0:
+            fptr.write(BINARY_LOG_MAGIC)
+        return fptr
+
+    def __write(self, record_type, caller, msg):
+        caller_id = self.__callers.get(caller)
+        if caller_id is None:
+            caller_id = len(self.__callers)
+            if caller_id >= _MAX_N_CALLERS:
+                msg = f"Binary logs are limited to {_MAX_N_CALLERS} callers"
+                StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+                raise RuntimeError(msg)
+            name = caller.encode("utf-8")
+            record = _HEADER.pack(BINARY_LOG_CALLER, caller_id, 0, len(name)) \
+                + name
+            self.__callers[caller] = caller_id
+        else:
+            record = b""
+
+        payload = msg.encode("utf-8")
+        record += _HEADER.pack(record_type, caller_id, time.time_ns(),
+                               len(payload)) + payload
+        self._write(record)
+
+    def log(self, caller, msg, level):
+        """
+        Write the given message to file if the caller's verbosity level is
+        greater than or equal to the given message's level.
+
+        :param caller: Name of calling code for inclusion in record
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        """
+        # Since the use of these functions is setup by developers rather than
+        # users, we can keep the error checking minimal and light.  If
+        # developers use a bad level, they should find out immediately and
+        # easily.
+        assert level in self.__valid
+
+        if self.level_of(caller) >= level:
+            self.__write(level, caller, msg)
+
+    def warn(self, caller, msg):
+        """
+        Write the given message to file as a warning regardless of the logger's
+        verbosity level.
+
+        :param caller: Name of calling code for inclusion in record
+        :param msg: Warning message to log
+        """
+        self.__write(BINARY_LOG_WARNING, caller, msg)
+
+    def error(self, caller, msg):
+        """
+        Print the given message to ``stderr`` and write to file as an error
+        regardless of the logger's verbosity level.
+
+        :param caller: Name of calling code for inclusion in record
+        :param msg: Error message to log
+        """
+        sys.stderr.write(f"[{caller}] ERROR - {msg}\n")
+        sys.stderr.flush()
+
+        self._write_error(caller, msg)
+
+    def _write_error(self, caller, msg):
+        self.__write(BINARY_LOG_ERROR, caller, msg)
+        self.flush()
@@ -0,0 +1,388 @@
+import os
+import sys
+import atexit
+import weakref
+import threading
+
+from numbers import Integral
+from collections import OrderedDict
+
+from ._constants import (
+    LOG_LEVELS, LOG_LEVEL_NONE,
+    POPTUS_LOG_TAG
+)
+from .AbstractLogger import AbstractLogger
+from .StandardLogger import StandardLogger
+
+# All deduplicating loggers so that the number of repeats of their last
+# message is written at exit and their state can be reset after forking
+_LOGGERS = weakref.WeakSet()
+
+# ID of the process, if any, in which the loggers are flushed on exit by
+# multiprocessing
+_FINALIZED_PID = None
+
+
+def _flush_loggers():
+    for logger in list(_LOGGERS):
+        try:
+            logger._end_run()
+        except Exception as exc:
+            msg = f"Unable to write number of repeated messages ({exc})"
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+
+
+def _reset_loggers():
+    for logger in list(_LOGGERS):
+        logger._after_fork_in_child()
+
+
+def _flush_at_process_exit():
+    # multiprocessing ends its child processes without running atexit
+    # handlers, but it does run its own finalizers.  These run before those
+    # of buffered loggers so that the counts are not left in their buffers.
+    global _FINALIZED_PID
+
+    mp_util = sys.modules.get("multiprocessing.util")
+    if (mp_util is not None) and (_FINALIZED_PID != os.getpid()):
+        mp_util.Finalize(None, _flush_loggers, exitpriority=1)
+        _FINALIZED_PID = os.getpid()
+
+
+class _Run:
+    # The last message passed on as (write, caller, msg, level) and the number
+    # of times that it has since been repeated.  This does not reference the
+    # logger so that the count can be written when the logger is finalized.
+    __slots__ = ("last", "n_repeats")
+
+    def __init__(self):
+        self.last = None
+        self.n_repeats = 0
+
+
+def _end_run(run):
+    if run.n_repeats:
+        write, caller, _, level = run.last
+        msg = f"Last message repeated {run.n_repeats} times"
+        if level is None:
+            write(caller, msg)
+        else:
+            write(caller, msg, level)
+    run.last = None
+    run.n_repeats = 0
+
+
+def _write_final_count(run):
+    # Called when the logger is no longer in use or at exit, whichever comes
+    # first.  Since no other thread can use the logger, no lock is needed.
+    try:
+        _end_run(run)
+    except Exception as exc:
+        msg = f"Unable to write number of repeated messages ({exc})"
+        StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+
+
+# Exit handlers run in reverse order of registration and so the counts are
+# written before standard and file loggers, whose modules are imported first,
+# are flushed and closed.
+atexit.register(_flush_loggers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_loggers)
+
+
+class DeduplicatingLogger(AbstractLogger):
+    def __init__(self, logger, warn_once=True, collapse_repeats=True,
+                 max_warnings=1024):
+        """
+        A concrete |poptus| logger class that keeps warnings and messages that
+        are logged many times (|eg| by a method across restarts) from flooding
+        the log and from slowing down the caller.
+
+        If ``warn_once`` is ``True``, then only the first warning with a given
+        caller and message is passed on to the given logger.  The set of
+        warnings already seen is bounded with the least recently seen warning
+        evicted first so that a warning evicted from the set would be logged
+        again.
+
+        If ``collapse_repeats`` is ``True``, then log and warning messages that
+        are identical to the message logged immediately before them are counted
+        rather than passed on.  The count is written as the message ``Last
+        message repeated <N> times`` with the caller and type of the repeated
+        message once a different message is logged, the logger is flushed, the
+        logger is no longer in use, or the process exits.
+        Messages logged with fields are never collapsed.  Error messages are
+        never suppressed.
+
+        Copies of the logger made by pickling start with no warnings seen.
+        Processes created by forking keep the warnings seen by their parent,
+        but not the count of repeats of the last message, which is written by
+        the parent.
+
+        :param logger: Concrete logger object derived from
+            :py:class:`AbstractLogger` that writes messages.  The verbosity
+            level and caller levels of this logger are also those of the
+            deduplicating logger.
+        :param warn_once: Pass on only the first of identical warnings if
+            ``True``
+        :param collapse_repeats: Collapse identical consecutive messages if
+            ``True``
+        :param max_warnings: Maximum number of distinct warnings remembered
+            by warn-once
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        if not isinstance(logger, AbstractLogger):
+            log_and_abort(TypeError, "Invalid logger type")
+        elif not isinstance(warn_once, bool):
+            log_and_abort(TypeError, f"warn_once is not a bool ({warn_once})")
+        elif not isinstance(collapse_repeats, bool):
+            msg = f"collapse_repeats is not a bool ({collapse_repeats})"
+            log_and_abort(TypeError, msg)
+        elif (not isinstance(max_warnings, Integral)) or \
+                isinstance(max_warnings, bool):
+            msg = f"max_warnings is not an integer ({max_warnings})"
+            log_and_abort(TypeError, msg)
+        elif max_warnings <= 0:
+            msg = f"max_warnings is not positive ({max_warnings})"
+            log_and_abort(ValueError, msg)
+
+        super().__init__(logger.level)
+
+        # LOG_LEVEL_NONE is not an acceptable message level for general logging
+        # as per the documentation in AbstractLogger.
+        self.__valid = set(LOG_LEVELS).difference({LOG_LEVEL_NONE})
+
+        self.__logger = logger
+        self.__warn_once = warn_once
+        self.__collapse = collapse_repeats
+        self.__max_warnings = max_warnings
+
+        # Warnings seen ordered from least to most recently seen.  All state
+        # is protected by the lock, which also orders use of the wrapped
+        # logger.  Loggers are typically created by methods and collected
+        # before exit so that the count of repeats of the last message is also
+        # written when the logger is finalized.  The finalizer holds the run,
+        # which is therefore reset in place.
+        self.__seen = OrderedDict()
+        self.__run = _Run()
+        self.__n_suppressed = 0
+        self.__lock = threading.RLock()
+
+        logger._add_dependent(self)
+        _LOGGERS.add(self)
+        weakref.finalize(self, _write_final_count, self.__run)
+
+    def __reduce__(self):
+        return (type(self), (self.__logger, self.__warn_once, self.__collapse,
+                             self.__max_warnings))
+
+    def _after_fork_in_child(self):
+        # The lock might have been held by a thread that does not exist in the
+        # child
+        self.__run.last = None
+        self.__run.n_repeats = 0
+        self.__lock = threading.RLock()
+
+    @property
+    def logger(self):
+        """
+        :return: Logger that writes messages
+        """
+        return self.__logger
+
+    @property
+    def level(self):
+        """
+        :return: Verbosity level of the wrapped logger
+        """
+        return self.__logger.level
+
+    @level.setter
+    def level(self, level):
+        """
+        Set the verbosity level of the wrapped logger.
+
+        :param level: New verbosity level
+        """
+        self.__logger.level = level
+
+    @property
+    def caller_levels(self):
+        """
+        :return: ``dict`` of verbosity levels set for callers in the wrapped
+            logger indexed by caller name
+        """
+        return self.__logger.caller_levels
+
+    def set_caller_levels(self, levels):
+        """
+        Set the verbosity levels of individual callers in the wrapped logger.
+        See :py:meth:`AbstractLogger.set_caller_levels`.
+
+        :param levels: ``dict`` of verbosity levels indexed by caller name
+        """
+        self.__logger.set_caller_levels(levels)
+
+    def level_of(self, caller):
+        """
+        :param caller: Name of calling code
+        :return: Verbosity level that the wrapped logger applies to messages of
+            the given caller
+        """
+        return self.__logger.level_of(caller)
+
+    @property
+    def warn_once(self):
+        """
+        :return: ``True`` if only the first of identical warnings is passed on
+        """
+        return self.__warn_once
+
+    @property
+    def collapse_repeats(self):
+        """
+        :return: ``True`` if identical consecutive messages are collapsed
+        """
+        return self.__collapse
+
+    @property
+    def max_warnings(self):
+        """
+        :return: Maximum number of distinct warnings remembered by warn-once
+        """
+        return self.__max_warnings
+
+    @property
+    def n_suppressed(self):
+        """
+        :return: Number of messages not passed on to the wrapped logger so far
+        """
+        with self.__lock:
+            return self.__n_suppressed
+
+    def _end_run(self):
+        # Called by the exit handlers
+        with self.__lock:
+            self.__end_run()
+
+    def __end_run(self):
+        _end_run(self.__run)
+
+    def __pass_on(self, write, caller, msg, level=None):
+        run = self.__run
+        record = (write, caller, msg, level)
+        if self.__collapse and (record == run.last):
+            if not run.n_repeats:
+                _flush_at_process_exit()
+            run.n_repeats += 1
+            self.__n_suppressed += 1
+            return
+
+        _end_run(run)
+        if level is None:
+            write(caller, msg)
+        else:
+            write(caller, msg, level)
+        if self.__collapse:
+            run.last = record
+
+    def flush(self):
+        """
+        Write the number of times that the last message was repeated, if it
+        was, and then flush the wrapped logger.
+        """
+        with self.__lock:
+            self.__end_run()
+            self.__logger.flush()
+
+    def close(self):
+        """
+        Write the number of times that the last message was repeated, if it
+        was, and then close the wrapped logger.
+        """
+        with self.__lock:
+            self.__end_run()
+            self.__logger.close()
+
+    def log(self, caller, msg, level):
+        """
+        Pass the given message on to the wrapped logger if the caller's
+        verbosity level is greater than or equal to the given message's level
+        and if the message does not repeat the last message.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        """
+        # Since the use of these functions is setup by developers rather than
+        # users, we can keep the error checking minimal and light.  If
+        # developers use a bad level, they should find out immediately and
+        # easily.
+        assert level in self.__valid
+
+        if self.__logger.level_of(caller) >= level:
+            with self.__lock:
+                self.__pass_on(self.__logger.log, caller, msg, level)
+
+    def log_fields(self, caller, msg, level, fields):
+        """
+        Pass the given message and fields on to the wrapped logger if the
+        caller's verbosity level is greater than or equal to the given
+        message's level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        :param fields: ``dict`` of typed values indexed by field name
+        """
+        assert level in self.__valid
+
+        if self.__logger.level_of(caller) >= level:
+            with self.__lock:
+                self.__end_run()
+                self.__logger.log_fields(caller, msg, level, fields)
+
+    def warn(self, caller, msg):
+        """
+        Pass the given warning message on to the wrapped logger regardless of
+        the logger's verbosity level unless it was seen before or repeats the
+        last message.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            warning
+        :param msg: Warning message to log
+        """
+        with self.__lock:
+            if self.__warn_once:
+                key = (caller, msg)
+                if key in self.__seen:
+                    self.__seen.move_to_end(key)
+                    self.__n_suppressed += 1
+                    return
+                self.__seen[key] = None
+                if len(self.__seen) > self.__max_warnings:
+                    self.__seen.popitem(last=False)
+
+            self.__pass_on(self.__logger.warn, caller, msg)
+
+    def error(self, caller, msg):
+        """
+        Write the number of times that the last message was repeated, if it
+        was, and then pass the given error message on to the wrapped logger.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            error
+        :param msg: Error message to log
+        """
+        with self.__lock:
+            self.__end_run()
+            self.__logger.error(caller, msg)
+
+    def _write_error(self, caller, msg):
+        with self.__lock:
+            self.__end_run()
+            self.__logger._write_error(caller, msg)
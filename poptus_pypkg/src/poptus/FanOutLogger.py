@@ -0,0 +1,207 @@
+from ._constants import (
+    LOG_LEVELS, LOG_LEVEL_NONE,
+    POPTUS_LOG_TAG
+)
+from .AbstractLogger import AbstractLogger, _LEVELS_LOCK
+from .StandardLogger import StandardLogger
+
+
+class FanOutLogger(AbstractLogger):
+    def __init__(self, loggers):
+        """
+        A concrete |poptus| logger class that sends each message to several
+        loggers, each with its own verbosity level (|eg| a standard logger for
+        the console and a file logger for the full trace).
+
+        The level of this logger for each caller is the largest level of the
+        given loggers for that caller so that log functions build each message
+        only if at least one logger will log it and then build it only once.
+        The loggers that will log messages of each level from each caller are
+        determined when first needed so that each message is passed only to
+        those loggers.  Warning and error messages are passed to all loggers.
+        Changes made to the levels of the given loggers after creating this
+        logger are taken into account.
+
+        :param loggers: Non-empty iterable of concrete logger objects derived
+            from :py:class:`AbstractLogger` to which messages are sent
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        try:
+            loggers = tuple(loggers)
+        except TypeError:
+            log_and_abort(TypeError, f"loggers is not iterable ({loggers})")
+        if not loggers:
+            log_and_abort(ValueError, "No loggers given")
+        for logger in loggers:
+            if not isinstance(logger, AbstractLogger):
+                log_and_abort(TypeError, f"Invalid logger type ({logger})")
+
+        super().__init__(max(logger.level for logger in loggers))
+
+        # LOG_LEVEL_NONE is not an acceptable message level for general logging
+        # as per the documentation in AbstractLogger.
+        self.__valid = set(LOG_LEVELS).difference({LOG_LEVEL_NONE})
+
+        self.__loggers = loggers
+
+        # Loggers that log messages indexed by caller name and then by message
+        # level
+        self.__interested = {}
+
+        for logger in loggers:
+            logger._add_dependent(self)
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.__interested = {}
+        for logger in self.__loggers:
+            logger._add_dependent(self)
+
+    @property
+    def loggers(self):
+        """
+        :return: ``tuple`` of loggers to which messages are sent
+        """
+        return self.__loggers
+
+    @property
+    def level(self):
+        """
+        :return: Largest verbosity level of the given loggers
+        """
+        return max(logger.level for logger in self.__loggers)
+
+    @level.setter
+    def level(self, level):
+        """
+        Set the verbosity level of all given loggers.
+
+        :param level: New verbosity level
+        """
+        with _LEVELS_LOCK:
+            for logger in self.__loggers:
+                logger.level = level
+
+    def set_caller_levels(self, levels):
+        """
+        Set the verbosity levels of individual callers in this and all given
+        loggers.  See :py:meth:`AbstractLogger.set_caller_levels`.
+
+        :param levels: ``dict`` of verbosity levels indexed by caller name
+        """
+        with _LEVELS_LOCK:
+            super().set_caller_levels(levels)
+            for logger in self.__loggers:
+                logger.set_caller_levels(levels)
+
+    def _levels_changed(self):
+        self.__interested = {}
+        super()._levels_changed()
+
+    def level_of(self, caller):
+        """
+        :param caller: Name of calling code
+        :return: Largest verbosity level of the given loggers that applies to
+            messages of the given caller
+        """
+        return max(logger.level_of(caller) for logger in self.__loggers)
+
+    def __interested_in(self, caller):
+        try:
+            return self.__interested[caller]
+        except KeyError:
+            pass
+
+        with _LEVELS_LOCK:
+            levels = [logger.level_of(caller) for logger in self.__loggers]
+            interested = [
+                tuple(e for e, e_level in zip(self.__loggers, levels)
+                      if e_level >= level)
+                for level in LOG_LEVELS
+            ]
+            self.__interested[caller] = interested
+            return interested
+
+    def flush(self):
+        """
+        Flush all loggers.
+        """
+        for logger in self.__loggers:
+            logger.flush()
+
+    def close(self):
+        """
+        Close all loggers.
+        """
+        for logger in self.__loggers:
+            logger.close()
+
+    def log(self, caller, msg, level):
+        """
+        Send the given message to all loggers whose verbosity level for the
+        caller is greater than or equal to the given message's level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        """
+        # Since the use of these functions is setup by developers rather than
+        # users, we can keep the error checking minimal and light.  If
+        # developers use a bad level, they should find out immediately and
+        # easily.
+        assert level in self.__valid
+
+        for logger in self.__interested_in(caller)[level]:
+            logger.log(caller, msg, level)
+
+    def log_fields(self, caller, msg, level, fields):
+        """
+        Send the given message and fields to all loggers whose verbosity level
+        for the caller is greater than or equal to the given message's level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        :param fields: ``dict`` of typed values indexed by field name
+        """
+        assert level in self.__valid
+
+        for logger in self.__interested_in(caller)[level]:
+            logger.log_fields(caller, msg, level, fields)
+
+    def warn(self, caller, msg):
+        """
+        Send the given warning message to all loggers.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            warning
+        :param msg: Warning message to log
+        """
+        for logger in self.__loggers:
+            logger.warn(caller, msg)
+
+    def error(self, caller, msg):
+        """
+        Send the given error message to all loggers.  Since most loggers also
+        print errors to ``stderr``, only the first logger is asked to print it
+        so that it is printed once.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            error
+        :param msg: Error message to log
+        """
+        # The other loggers log the error first so that standard loggers write
+        # their buffered messages to stdout before it is printed
+        first, *others = self.__loggers
+        for logger in others:
+            logger._write_error(caller, msg)
+        first.error(caller, msg)
+
+    def _write_error(self, caller, msg):
+        for logger in self.__loggers:
+            logger._write_error(caller, msg)
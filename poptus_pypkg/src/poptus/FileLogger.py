@@ -1,27 +1,218 @@
 import os
+import re
 import sys
+import time
+import queue
+import atexit
+import weakref
+import threading
 
 from pathlib import Path
+from numbers import Integral, Real
 
 from ._constants import (
     LOG_LEVELS, LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT,
+    LOG_COMPRESSION_GZIP, LOG_COMPRESSION_LZMA, LOG_COMPRESSIONS,
     POPTUS_LOG_TAG
 )
 from .AbstractLogger import AbstractLogger
 from .StandardLogger import StandardLogger
 
+# Buffered file loggers that presently hold an open file handle.  These are
+# closed at exit so that no buffered messages are lost.  Weak references are
+# used so that this does not keep alive loggers that are no longer in use.
+_OPEN_LOGGERS = weakref.WeakSet()
+
+# ID of the process, if any, in which open loggers are closed on exit by
+# multiprocessing
+_FINALIZED_PID = None
+
+
+def _close_open_loggers():
+    for logger in list(_OPEN_LOGGERS):
+        logger.close()
+
+
+def _flush_open_loggers():
+    for logger in list(_OPEN_LOGGERS):
+        logger.flush()
+
+
+def _reset_open_loggers():
+    for logger in list(_OPEN_LOGGERS):
+        logger._after_fork_in_child()
+
+
+def _close_at_process_exit():
+    # multiprocessing ends its child processes without running atexit
+    # handlers, but it does run its own finalizers.
+    global _FINALIZED_PID
+
+    mp_util = sys.modules.get("multiprocessing.util")
+    if (mp_util is not None) and (_FINALIZED_PID != os.getpid()):
+        mp_util.Finalize(None, _close_open_loggers, exitpriority=0)
+        _FINALIZED_PID = os.getpid()
+
+
+# Buffers are flushed before forking so that the child can close its copies of
+# the parent's file handles without writing buffered messages again.
+atexit.register(_close_open_loggers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_flush_open_loggers,
+                        after_in_child=_reset_open_loggers)
+
+# Rotated log files are compressed by a single background thread so that
+# logging never blocks on compression.  The thread is started when first needed
+# in each process.
+_COMPRESSION_SUFFIXES = {LOG_COMPRESSION_GZIP: ".gz",
+                         LOG_COMPRESSION_LZMA: ".xz"}
+_COMPRESSION_JOBS = None
+_COMPRESSOR = None
+_COMPRESSOR_LOCK = threading.Lock()
+
+
+def rotated_filenames(filename):
+    """
+    :param filename: Name and path of log file
+    :return: ``dict`` that maps the index of each rotated file of the given log
+        file, compressed or not, to its name and path.  Larger indices
+        correspond to more recently rotated files.
+    """
+    filename = Path(filename).resolve()
+
+    suffixes = "|".join(re.escape(e) for e in _COMPRESSION_SUFFIXES.values())
+    pattern = re.compile(rf"{re.escape(filename.name)}\.(\d+)({suffixes})?")
+
+    rotated = {}
+    for path in filename.parent.glob(f"{filename.name}.*"):
+        match = pattern.fullmatch(path.name)
+        if match is not None:
+            rotated[int(match.group(1))] = path
+    return rotated
+
+
+def _remove_old_rotated(filename, newest, keep):
+    # Only files older than the given newest file are considered so that files
+    # rotated since then, which might still be queued for compression, are not
+    # touched.
+    for index, path in rotated_filenames(filename).items():
+        if index <= newest - keep:
+            os.remove(path)
+
+
+def _compress(path, compression):
+    # Compress to a temporary file first so that a complete compressed file
+    # and its uncompressed original never both appear to be missing
+    final = path.with_name(path.name + _COMPRESSION_SUFFIXES[compression])
+    tmp = final.with_name(final.name + ".tmp")
+
+    # These are imported only when needed so that importing poptus does not
+    # import all compression libraries
+    import shutil
+    if compression == LOG_COMPRESSION_GZIP:
+        from gzip import open as open_compressed
+    else:
+        from lzma import open as open_compressed
+
+    with open(path, "rb") as f_in:
+        with open_compressed(tmp, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+    os.replace(tmp, final)
+    os.remove(path)
+
+
+def _run_compressor(jobs):
+    while True:
+        path, compression, filename, index, keep = jobs.get()
+        try:
+            _compress(path, compression)
+            if keep is not None:
+                _remove_old_rotated(filename, index, keep)
+        except Exception as exc:
+            msg = f"Unable to compress rotated log file {path} ({exc})"
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+        finally:
+            jobs.task_done()
+
+
+def _submit_compression(path, compression, filename, index, keep):
+    global _COMPRESSION_JOBS
+    global _COMPRESSOR
+
+    with _COMPRESSOR_LOCK:
+        # Threads do not survive forking
+        if (_COMPRESSOR is None) or (not _COMPRESSOR.is_alive()):
+            _COMPRESSION_JOBS = queue.Queue()
+            _COMPRESSOR = threading.Thread(
+                target=_run_compressor, args=(_COMPRESSION_JOBS,),
+                name="poptus-FileLogger-compressor", daemon=True
+            )
+            _COMPRESSOR.start()
+        _COMPRESSION_JOBS.put((path, compression, filename, index, keep))
+
+
+def _wait_for_compression():
+    with _COMPRESSOR_LOCK:
+        if (_COMPRESSOR is None) or (not _COMPRESSOR.is_alive()):
+            return
+        jobs = _COMPRESSION_JOBS
+    jobs.join()
+
+
+atexit.register(_wait_for_compression)
+
 
 class FileLogger(AbstractLogger):
-    def __init__(self, filename, overwrite, level=LOG_LEVEL_DEFAULT):
+    def __init__(self, filename, overwrite, level=LOG_LEVEL_DEFAULT,
+                 buffer_size=None, max_bytes=None, max_age=None, keep=None,
+                 compression=None):
         """
         A concrete |poptus| logger class that writes all log, warning, and error
         messages to the given file.  Error messages are also written to standard
         error.
 
+        By default, the file is opened and closed for each message.  If a buffer
+        size is given, the file is instead opened once when the first message is
+        logged and kept open with the given write buffer until the logger is
+        closed, which happens automatically at exit and when the logger is no
+        longer in use.  Error messages are always flushed immediately.
+
+        If a maximum size or age is given, the file is rotated before writing a
+        message that would exceed the maximum size or once the first message in
+        the file is older than the maximum age.  Rotated files are renamed
+        ``<filename>.<index>`` with indices increasing from one so that the
+        most recent logging is always in the given file.  Rotated files can be
+        compressed by a background thread and only the most recent can be
+        kept.  Closing the logger, which happens automatically at exit, waits
+        for all compression to finish.
+
+        Loggers can be passed to other processes by pickling or forking.
+        Copies append to the file and open their own file handle when they
+        first log a message.  Buffered messages are written before a process
+        forks so that they are written once.  Since each copy counts only the
+        bytes that it wrote, the file itself is checked before rotating it so
+        that copies do not rotate a file already rotated by another copy or
+        overwrite each other's rotated files.  Use
+        :py:class:`ShardedFileLogger` if several processes log at the same
+        time.
+
         :param level: Verbosity level of the logger
         :param filename: Name and path of file to write to
         :param overwrite: If a file with the given name already exists, then it
             is overwritten if ``True`` or an error is raised if ``False``.
+        :param buffer_size: ``None`` or the size in bytes of the write buffer
+            of the persistent file handle.  As with Python's ``open``, a size
+            of one selects line buffering.
+        :param max_bytes: ``None`` or the maximum size in bytes of the log
+            file.  Individual messages larger than this are written to a file
+            of their own.
+        :param max_age: ``None`` or the maximum time in seconds between logging
+            the first message in the log file and rotating it
+        :param keep: ``None`` to keep all rotated files or the number of most
+            recently rotated files to keep
+        :param compression: ``None`` or one of ``LOG_COMPRESSIONS`` to compress
+            each rotated file with ``gzip`` or ``lzma``.  Compressed files have
+            suffix ``.gz`` or ``.xz``.
         """
         def warn(msg):
             StandardLogger(LOG_LEVEL_NONE).warn(POPTUS_LOG_TAG, msg)
@@ -39,6 +230,35 @@ class FileLogger(AbstractLogger):
             log_and_abort(ValueError, "Empty filename string given")
         elif not isinstance(overwrite, bool):
             log_and_abort(TypeError, f"overwrite is not a bool ({overwrite})")
+        elif buffer_size is not None:
+            if (not isinstance(buffer_size, Integral)) or \
+                    isinstance(buffer_size, bool):
+                msg = f"buffer_size is not an integer ({buffer_size})"
+                log_and_abort(TypeError, msg)
+            elif buffer_size <= 0:
+                msg = f"buffer_size is not positive ({buffer_size})"
+                log_and_abort(ValueError, msg)
+
+        for name, value, value_type in [("max_bytes", max_bytes, Integral),
+                                        ("max_age", max_age, Real),
+                                        ("keep", keep, Integral)]:
+            if value is None:
+                continue
+            elif (not isinstance(value, value_type)) or \
+                    isinstance(value, bool):
+                log_and_abort(TypeError, f"Invalid {name} type ({value})")
+            elif value <= 0:
+                log_and_abort(ValueError, f"{name} is not positive ({value})")
+        if (compression is not None) and \
+                (compression not in LOG_COMPRESSIONS):
+            msg = f"Invalid log compression algorithm ({compression})"
+            log_and_abort(ValueError, msg)
+
+        self.__rotate = (max_bytes is not None) or (max_age is not None)
+        if (not self.__rotate) and \
+                ((keep is not None) or (compression is not None)):
+            msg = "keep and compression require max_bytes or max_age"
+            log_and_abort(ValueError, msg)
 
         self.__filename = Path(filename).resolve()
         if self.__filename.exists():
@@ -52,10 +272,55 @@ class FileLogger(AbstractLogger):
                 warn(f"Overwriting {self.__filename}")
                 os.remove(self.__filename)
 
+        if self.__rotate and rotated_filenames(self.__filename):
+            if not overwrite:
+                msg = f"Rotated {self.__filename} files already exist"
+                log_and_abort(RuntimeError, msg)
+            warn(f"Overwriting rotated {self.__filename} files")
+            for path in rotated_filenames(self.__filename).values():
+                os.remove(path)
+
         # LOG_LEVEL_NONE is not an acceptable message level for general logging
         # as per the documentation in AbstractLogger.
         self.__valid = set(LOG_LEVELS).difference({LOG_LEVEL_NONE})
 
+        # The file is opened lazily so that, as with the unbuffered mode, no
+        # file is created if nothing is logged.
+        self.__buffer_size = buffer_size
+        self.__fptr = None
+        self.__closer = None
+
+        self.__max_bytes = max_bytes
+        self.__max_age = max_age
+        self.__keep = keep
+        self.__compression = compression
+        # Size of, time of first message in, and device and inode numbers of
+        # current file.  Files are never appended to since existing files were
+        # removed above.
+        self.__n_bytes = 0
+        self.__t_first = None
+        self.__file_id = None
+
+    def __getstate__(self):
+        # Copies open their own file handle when first needed and append to
+        # the file rather than overwriting it
+        state = super().__getstate__()
+        state["_FileLogger__fptr"] = None
+        state["_FileLogger__closer"] = None
+        return state
+
+    def _after_fork_in_child(self):
+        # Derived classes that hold their own file handles should override
+        # this to close them.  The buffer was flushed before forking.
+        self.__close_file()
+
+    def __close_file(self):
+        if self.__fptr is not None:
+            self.__closer()
+            self.__fptr = None
+            self.__closer = None
+            _OPEN_LOGGERS.discard(self)
+
     @property
     def filename(self):
         """
@@ -63,9 +328,146 @@ class FileLogger(AbstractLogger):
         """
         return self.__filename
 
+    @property
+    def buffer_size(self):
+        """
+        :return: ``None`` if the file is opened for each message; otherwise,
+            the size in bytes of the persistent file handle's write buffer
+        """
+        return self.__buffer_size
+
+    @property
+    def max_bytes(self):
+        """
+        :return: ``None`` or maximum size in bytes of the log file
+        """
+        return self.__max_bytes
+
+    @property
+    def max_age(self):
+        """
+        :return: ``None`` or maximum age in seconds of the log file
+        """
+        return self.__max_age
+
+    @property
+    def keep(self):
+        """
+        :return: ``None`` if all rotated files are kept; otherwise, the number
+            of most recently rotated files kept
+        """
+        return self.__keep
+
+    @property
+    def compression(self):
+        """
+        :return: ``None`` or the algorithm used to compress rotated files
+        """
+        return self.__compression
+
+    def __is_due(self, n_bytes, now):
+        too_big = (self.__max_bytes is not None) and \
+            (self.__n_bytes + n_bytes > self.__max_bytes)
+        too_old = (self.__max_age is not None) and \
+            (now - self.__t_first >= self.__max_age)
+        return too_big or too_old
+
+    def __rotate_if_needed(self, line):
+        n_bytes = len(line) if line.isascii() else len(line.encode("utf-8"))
+        now = time.monotonic()
+        if (self.__n_bytes > 0) and self.__is_due(n_bytes, now):
+            # Copies made by pickling or forking count only what they wrote.
+            # The file is therefore checked before rotating it in case another
+            # copy wrote to or rotated it, in which case the present file is
+            # counted from now on.
+            self.__close_file()
+            try:
+                stat = os.stat(self.__filename)
+            except FileNotFoundError:
+                stat = None
+            if stat is None:
+                self.__n_bytes = 0
+            elif (stat.st_dev, stat.st_ino) != self.__file_id:
+                self.__n_bytes = stat.st_size
+                self.__t_first = now
+                self.__file_id = (stat.st_dev, stat.st_ino)
+            else:
+                self.__n_bytes = stat.st_size
+            if (self.__n_bytes > 0) and self.__is_due(n_bytes, now):
+                self.__rotate_file()
+
+        if self.__n_bytes == 0:
+            self.__t_first = now
+            self.__file_id = None
+        self.__n_bytes += n_bytes
+
+    def __rotate_file(self):
+        # The index follows that of the most recently rotated file rather than
+        # a count kept by this copy so that copies do not overwrite each
+        # other's rotated files
+        index = max(rotated_filenames(self.__filename), default=0) + 1
+        rotated = self.__filename.with_name(f"{self.__filename.name}.{index}")
+        os.replace(self.__filename, rotated)
+        self.__n_bytes = 0
+
+        if self.__compression is not None:
+            # Old files are removed after compression to avoid racing the
+            # compressor
+            _submit_compression(rotated, self.__compression,
+                                self.__filename, index, self.__keep)
+        elif self.__keep is not None:
+            _remove_old_rotated(self.__filename, index, self.__keep)
+
+    def _open(self, buffering):
+        # Derived classes can override this to change how the file is opened,
+        # such as in binary mode.  The argument is that of the built-in open.
+        return open(self.__filename, "a", buffering=buffering)
+
+    def _write(self, line):
+        # Derived classes can override this to change how each fully-formatted
+        # line is written.
+        if self.__rotate:
+            self.__rotate_if_needed(line)
+
+        if self.__buffer_size is None:
+            with self._open(-1) as fptr:
+                fptr.write(line)
+        else:
+            if self.__fptr is None:
+                self.__fptr = self._open(self.__buffer_size)
+                # Copies made by pickling cannot be closed by users and so the
+                # file is closed once the logger is no longer in use
+                self.__closer = weakref.finalize(self, self.__fptr.close)
+                _OPEN_LOGGERS.add(self)
+                _close_at_process_exit()
+            self.__fptr.write(line)
+
+        if self.__rotate and (self.__file_id is None):
+            stat = os.stat(self.__filename)
+            self.__file_id = (stat.st_dev, stat.st_ino)
+
+    def flush(self):
+        """
+        Write all buffered messages to file.  This has no effect if the logger
+        does not buffer messages.
+        """
+        if self.__fptr is not None:
+            self.__fptr.flush()
+
+    def close(self):
+        """
+        Flush all buffered messages, close the persistent file handle if open,
+        and wait for all rotated files to be compressed.  Messages logged after
+        closing the logger are still written to file, which is reopened as
+        needed.
+        """
+        self.__close_file()
+        if self.__compression is not None:
+            _wait_for_compression()
+
     def log(self, caller, msg, level):
         """
-        Write the given message to file if the logger's verbosity level is
+        Write the given message to file if the caller's verbosity level is
         greater than or equal to the given message's level.
 
         :param caller: Name of calling code for inclusion in actual logged
@@ -79,9 +481,8 @@ class FileLogger(AbstractLogger):
         # easily.
         assert level in self.__valid
 
-        if self.level >= level:
-            with open(self.__filename, "a") as fptr:
-                fptr.write(f"[{caller}] {msg}\n")
+        if self.level_of(caller) >= level:
+            self._write(f"[{caller}] {msg}\n")
 
     def warn(self, caller, msg):
         """
@@ -93,8 +494,7 @@ class FileLogger(AbstractLogger):
             warning
         :param msg: Warning message to log
         """
-        with open(self.__filename, "a") as fptr:
-            fptr.write(f"[{caller}] WARNING - {msg}\n")
+        self._write(f"[{caller}] WARNING - {msg}\n")
 
     def error(self, caller, msg):
         """
@@ -109,5 +509,8 @@ class FileLogger(AbstractLogger):
         sys.stderr.write(f"[{caller}] ERROR - {msg}\n")
         sys.stderr.flush()
 
-        with open(self.__filename, "a") as fptr:
-            fptr.write(f"[{caller}] ERROR - {msg}\n")
+        self._write_error(caller, msg)
+
+    def _write_error(self, caller, msg):
+        self._write(f"[{caller}] ERROR - {msg}\n")
+        self.flush()
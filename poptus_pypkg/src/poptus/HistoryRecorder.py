@@ -0,0 +1,352 @@
+import struct
+import weakref
+
+from pathlib import Path
+from numbers import Integral
+
+import numpy as np
+
+from ._constants import (
+    LOG_LEVEL_NONE,
+    POPTUS_LOG_TAG
+)
+from .StandardLogger import StandardLogger
+
+# Header of .npy files of format version 1.0 and the number of digits reserved
+# in the header for the number of records so that the header can be rewritten
+# in place as records are appended.
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_MAX_COUNT_DIGITS = 20
+
+
+def _npy_header(dtype, count):
+    header = repr({"descr": np.lib.format.dtype_to_descr(dtype),
+                   "fortran_order": False, "shape": (count,)})
+    n_pad = _MAX_COUNT_DIGITS - len(str(count))
+    n_pad += -(len(_NPY_MAGIC) + 2 + len(header) + n_pad + 1) % 64
+    header = (header + " " * n_pad + "\n").encode("latin1")
+    return _NPY_MAGIC + struct.pack("<H", len(header)) + header
+
+
+class _Storage:
+    # Records and the number appended, which are kept apart from the recorder
+    # so that file-backed recorders can be closed by a finalizer.  Views of the
+    # fields are cached since assigning through them is much faster than
+    # assigning to the fields of a record.
+    __slots__ = ("records", "columns", "x", "n")
+
+    def __init__(self):
+        self.records = self.columns = self.x = None
+        self.n = 0
+
+    def set_records(self, records):
+        self.records = records
+        self.columns = {name: records[name] for name in records.dtype.names}
+        self.x = self.columns["x"]
+
+
+def _commit(storage, filename):
+    storage.records.flush()
+    with open(filename, "r+b") as fptr:
+        fptr.write(_npy_header(storage.records.dtype, storage.n))
+
+
+def _close(storage, filename):
+    # Called when the recorder is closed, is no longer in use, or at exit,
+    # whichever comes first
+    _commit(storage, filename)
+    dtype = storage.records.dtype
+    storage.records = storage.columns = storage.x = None
+    size = len(_npy_header(dtype, 0)) + storage.n * dtype.itemsize
+    with open(filename, "r+b") as fptr:
+        fptr.truncate(size)
+
+
+class HistoryRecorder:
+    def __init__(self, n_dims, scalars=("f",), capacity=1024, filename=None,
+                 overwrite=False):
+        """
+        A recorder of the history of an optimization method that stores each
+        iterate along with scalar values such as its objective function value
+        and diagnostics as exact floating-point values in a NumPy structured
+        array rather than as text.  For example, ::
+
+            history = poptus.HistoryRecorder(len(x_0), ["f", "delta"])
+            ...
+            history.append(x_i, f=f_i, delta=delta)
+            ...
+            history.save("history.npz")
+
+        Records are appended in amortized constant time to a preallocated
+        array whose capacity is doubled when full.  Scalars not given when
+        appending a record are stored as NaN.  The recorded values are
+        available as arrays with :py:attr:`x` and :py:meth:`__getitem__` and
+        can be saved to ``.npy`` or ``.npz`` files with :py:meth:`save`.
+
+        If a filename is given, records are instead stored in a memory-mapped
+        ``.npy`` file whose header gives the number of records committed so
+        far.  Records are committed when the recorder is flushed or closed,
+        which happens automatically when the recorder is no longer in use or
+        at exit, and the file is truncated to the committed records when
+        closed.  The file can be read at any time with ``numpy.load`` and
+        remains readable after a crash up to the last committed record.
+        Records appended by a new recorder to an existing file follow the
+        records already in the file.
+
+        NumPy must be installed to use this class.
+
+        :param n_dims: Dimension of the iterates
+        :param scalars: Iterable of the names of scalar values recorded with
+            each iterate
+        :param capacity: Number of records for which memory is allocated
+            initially
+        :param filename: ``None`` to store records in memory or the name and
+            path of the ``.npy`` file in which records are stored
+        :param overwrite: If the file already exists, then it is overwritten if
+            ``True`` or records are appended to it if ``False``.  Records can
+            only be appended to files written by a recorder of the same
+            dimension and scalars.
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        for name, value in [("n_dims", n_dims), ("capacity", capacity)]:
+            if (not isinstance(value, Integral)) or isinstance(value, bool):
+                log_and_abort(TypeError, f"{name} is not an integer ({value})")
+            elif value <= 0:
+                log_and_abort(ValueError, f"{name} is not positive ({value})")
+
+        try:
+            scalars = tuple(scalars)
+        except TypeError:
+            log_and_abort(TypeError, f"scalars is not iterable ({scalars})")
+        for name in scalars:
+            if not isinstance(name, str):
+                msg = f"Scalar name is not a string ({name})"
+                log_and_abort(TypeError, msg)
+            elif name in ("", "x"):
+                log_and_abort(ValueError, f"Invalid scalar name ({name})")
+        if len(set(scalars)) != len(scalars):
+            log_and_abort(ValueError, f"Duplicate scalar names ({scalars})")
+
+        if filename is not None:
+            if not isinstance(filename, (str, Path)):
+                log_and_abort(TypeError, f"{filename} is not a string or Path")
+            elif isinstance(filename, str) and (filename == ""):
+                log_and_abort(ValueError, "Empty filename string given")
+            filename = Path(filename).resolve()
+        if not isinstance(overwrite, bool):
+            log_and_abort(TypeError, f"overwrite is not a bool ({overwrite})")
+
+        super().__init__()
+
+        self.__n_dims = n_dims
+        self.__scalars = scalars
+        self.__dtype = np.dtype(
+            [("x", np.float64, (n_dims,))]
+            + [(name, np.float64) for name in scalars]
+        )
+        self.__filename = filename
+
+        self.__storage = _Storage()
+        self.__closer = None
+        if filename is None:
+            self.__storage.set_records(self.__allocate(capacity))
+            return
+
+        self.__header = _npy_header(self.__dtype, 0)
+        if filename.exists() and (not overwrite):
+            try:
+                with open(filename, "rb") as fptr:
+                    version = np.lib.format.read_magic(fptr)
+                    shape, _, dtype = \
+                        np.lib.format.read_array_header_1_0(fptr)
+                    offset = fptr.tell()
+            except Exception as exc:
+                log_and_abort(ValueError, f"Invalid history file ({exc})")
+            if (version != (1, 0)) or (dtype != self.__dtype) or \
+                    (len(shape) != 1) or (offset != len(self.__header)):
+                msg = f"Cannot append to history file {filename}"
+                log_and_abort(ValueError, msg)
+            self.__storage.n = shape[0]
+        else:
+            with open(filename, "wb") as fptr:
+                fptr.write(self.__header)
+
+        self.__resize(max(capacity, self.__storage.n))
+        # Records are committed and the file truncated once the recorder is no
+        # longer in use so that recorders need not be closed explicitly
+        self.__closer = weakref.finalize(self, _close, self.__storage,
+                                         filename)
+
+    def __allocate(self, capacity):
+        records = np.empty(capacity, dtype=self.__dtype)
+        self.__fill(records)
+        return records
+
+    def __fill(self, records):
+        records["x"] = np.nan
+        for name in self.__scalars:
+            records[name] = np.nan
+
+    def __resize(self, capacity):
+        storage = self.__storage
+        if self.__filename is None:
+            records = self.__allocate(capacity)
+            records[:storage.n] = storage.records[:storage.n]
+            storage.set_records(records)
+            return
+
+        # Views of the old mapping held by users remain valid
+        if storage.records is not None:
+            storage.records.flush()
+        size = len(self.__header) + capacity * self.__dtype.itemsize
+        with open(self.__filename, "r+b") as fptr:
+            fptr.truncate(size)
+        storage.set_records(np.memmap(self.__filename, dtype=self.__dtype,
+                                      mode="r+", offset=len(self.__header),
+                                      shape=(capacity,)))
+        self.__fill(storage.records[storage.n:])
+
+    @property
+    def n_dims(self):
+        """
+        :return: Dimension of the iterates
+        """
+        return self.__n_dims
+
+    @property
+    def scalars(self):
+        """
+        :return: ``tuple`` of the names of the recorded scalar values
+        """
+        return self.__scalars
+
+    @property
+    def filename(self):
+        """
+        :return: ``None`` if records are stored in memory; otherwise, the name
+            including path of the file in which records are stored
+        """
+        return self.__filename
+
+    @property
+    def capacity(self):
+        """
+        :return: Number of records for which memory is presently allocated
+        """
+        return len(self.__storage.records)
+
+    @property
+    def records(self):
+        """
+        :return: View of the structured array of all records with field ``x``
+            and one field per scalar.  The view is valid until the next record
+            is appended.
+        """
+        storage = self.__storage
+        return storage.records[:storage.n]
+
+    @property
+    def x(self):
+        """
+        :return: View of the 2D array whose rows are the recorded iterates.
+            The view is valid until the next record is appended.
+        """
+        storage = self.__storage
+        return storage.x[:storage.n]
+
+    def __getitem__(self, name):
+        """
+        :param name: Name of a scalar or ``"x"``
+        :return: View of the array of the recorded values of the given scalar.
+            The view is valid until the next record is appended.
+        """
+        storage = self.__storage
+        return storage.records[name][:storage.n]
+
+    def __len__(self):
+        return self.__storage.n
+
+    def append(self, x, **scalars):
+        """
+        Record the given iterate and scalar values.
+
+        :param x: Iterate of length ``n_dims``
+        :param scalars: Values of the scalars indexed by name
+        """
+        storage = self.__storage
+        n = storage.n
+        if n == len(storage.records):
+            self.__resize(2 * n)
+
+        storage.x[n] = x
+        try:
+            for name, value in scalars.items():
+                storage.columns[name][n] = value
+        except KeyError:
+            # Do not leave a partial record behind
+            self.__fill(storage.records[n:n + 1])
+            raise ValueError(f"Unknown scalar name ({name})") from None
+        except Exception:
+            self.__fill(storage.records[n:n + 1])
+            raise
+        storage.n = n + 1
+
+    def clear(self):
+        """
+        Remove all records.  Records stored in a file are also removed from the
+        file immediately, before their storage is reused by new records, so
+        that the file never contains committed records overwritten by
+        uncommitted records.
+        """
+        self.__storage.n = 0
+        self.flush()
+        self.__fill(self.__storage.records)
+
+    def save(self, filename):
+        """
+        Save the recorded values to file.  Files with suffix ``.npz`` contain
+        one array per scalar and the 2D array ``x`` of iterates so that
+        ``numpy.load(filename)["f"]`` is the array of recorded ``f`` values.
+        All other files contain the structured array of records in ``.npy``
+        format.
+
+        :param filename: Name and path of the file to write
+        """
+        if not isinstance(filename, (str, Path)):
+            msg = f"{filename} is not a string or Path"
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise TypeError(msg)
+
+        filename = Path(filename)
+        if filename.suffix == ".npz":
+            arrays = {name: self[name] for name in ("x",) + self.__scalars}
+            np.savez(filename, **arrays)
+        else:
+            with open(filename, "wb") as fptr:
+                np.save(fptr, np.ascontiguousarray(self.records))
+
+    def flush(self):
+        """
+        Commit all records appended so far to file.  This has no effect if
+        records are stored in memory.
+        """
+        if (self.__closer is not None) and self.__closer.alive:
+            _commit(self.__storage, self.__filename)
+
+    def close(self):
+        """
+        Commit all records, truncate the file to the committed records, and
+        release the memory map.  Records cannot be appended after closing.
+        This has no effect if records are stored in memory.
+        """
+        if self.__closer is not None:
+            self.__closer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -0,0 +1,146 @@
+import sys
+import time
+
+from ._constants import (
+    LOG_LEVELS, LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT,
+    LOG_RECORD_LOG, LOG_RECORD_WARNING, LOG_RECORD_ERROR
+)
+from .FileLogger import FileLogger
+
+
+def _to_json(value):
+    # Fields are typically Python or NumPy numbers and arrays.  NumPy values
+    # are converted without importing NumPy.
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+class JsonLinesLogger(FileLogger):
+    def __init__(self, filename, overwrite, level=LOG_LEVEL_DEFAULT,
+                 buffer_size=None, max_bytes=None, max_age=None, keep=None,
+                 compression=None):
+        """
+        A concrete |poptus| logger class that writes all log, warning, and error
+        messages to the given file as structured records in the JSON Lines
+        format so that logged data can be recovered efficiently and exactly.
+        Error messages are also written to standard error as text.
+
+        Each line in the file is a JSON object with the keys
+
+        * ``time`` - Time at which the record was logged in seconds since the
+          epoch
+        * ``type`` - One of ``LOG_RECORD_LOG``, ``LOG_RECORD_WARNING``, or
+          ``LOG_RECORD_ERROR``
+        * ``level`` - Message level, which is ``LOG_LEVEL_NONE`` for warnings
+          and errors
+        * ``caller`` - Name of calling code
+        * ``msg`` - Message
+        * ``fields`` - Typed values indexed by field name, which is only
+          included if fields were logged with the message
+
+        Records can be read lazily with :py:func:`read_json_lines_log`.
+
+        :param level: Verbosity level of the logger
+        :param filename: Name and path of file to write to
+        :param overwrite: If a file with the given name already exists, then it
+            is overwritten if ``True`` or an error is raised if ``False``.
+        :param buffer_size: ``None`` or the size in bytes of the write buffer
+            of the persistent file handle.  See :py:class:`FileLogger`.
+        :param max_bytes: ``None`` or the maximum size in bytes of the log
+            file.  See :py:class:`FileLogger` for this and all other rotation
+            arguments.
+        :param max_age: ``None`` or the maximum age in seconds of the log file
+        :param keep: ``None`` or the number of most recently rotated files to
+            keep
+        :param compression: ``None`` or algorithm used to compress rotated
+            files
+        """
+        # This error checks all arguments
+        super().__init__(filename, overwrite, level, buffer_size,
+                         max_bytes, max_age, keep, compression)
+
+        # LOG_LEVEL_NONE is not an acceptable message level for general logging
+        # as per the documentation in AbstractLogger.
+        self.__valid = set(LOG_LEVELS).difference({LOG_LEVEL_NONE})
+
+        # json is imported only when needed so that importing poptus stays
+        # cheap.  Reusing one encoder also avoids building an encoder for each
+        # record as json.dumps does when given a default function.
+        import json
+        self.__encode = json.JSONEncoder(default=_to_json).encode
+
+    def __write_record(self, record_type, caller, msg, level, fields=None):
+        record = {
+            "time": time.time(),
+            "type": record_type,
+            "level": level,
+            "caller": caller,
+            "msg": msg
+        }
+        if fields:
+            record["fields"] = fields
+        self._write(self.__encode(record) + "\n")
+
+    def log(self, caller, msg, level):
+        """
+        Write the given message to file as a record if the caller's verbosity
+        level is greater than or equal to the given message's level.
+
+        :param caller: Name of calling code for inclusion in record
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        """
+        # Since the use of these functions is setup by developers rather than
+        # users, we can keep the error checking minimal and light.  If
+        # developers use a bad level, they should find out immediately and
+        # easily.
+        assert level in self.__valid
+
+        if self.level_of(caller) >= level:
+            self.__write_record(LOG_RECORD_LOG, caller, msg, level)
+
+    def log_fields(self, caller, msg, level, fields):
+        """
+        Write the given message and typed fields to file as a record if the
+        caller's verbosity level is greater than or equal to the given
+        message's level.
+
+        :param caller: Name of calling code for inclusion in record
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        :param fields: ``dict`` of typed values indexed by field name.  Values
+            that cannot be represented in JSON are converted to lists if
+            array-like or to strings otherwise.
+        """
+        assert level in self.__valid
+
+        if self.level_of(caller) >= level:
+            self.__write_record(LOG_RECORD_LOG, caller, msg, level, fields)
+
+    def warn(self, caller, msg):
+        """
+        Write the given message to file as a warning record regardless of the
+        logger's verbosity level.
+
+        :param caller: Name of calling code for inclusion in record
+        :param msg: Warning message to log
+        """
+        self.__write_record(LOG_RECORD_WARNING, caller, msg, LOG_LEVEL_NONE)
+
+    def error(self, caller, msg):
+        """
+        Print the given message to ``stderr`` and write to file as an error
+        record regardless of the logger's verbosity level.
+
+        :param caller: Name of calling code for inclusion in record
+        :param msg: Error message to log
+        """
+        sys.stderr.write(f"[{caller}] ERROR - {msg}\n")
+        sys.stderr.flush()
+
+        self._write_error(caller, msg)
+
+    def _write_error(self, caller, msg):
+        self.__write_record(LOG_RECORD_ERROR, caller, msg, LOG_LEVEL_NONE)
+        self.flush()
@@ -0,0 +1,177 @@
+import threading
+
+from pathlib import Path
+from numbers import Real
+
+from ._constants import (
+    LOG_LEVELS, LOG_LEVEL_NONE,
+    POPTUS_LOG_TAG
+)
+from .AbstractLogger import AbstractLogger, _LEVELS_LOCK
+from .StandardLogger import StandardLogger
+
+# Key in level files whose value is the verbosity level of the logger.  All
+# other keys are caller names.
+LEVEL_FILE_LEVEL_KEY = "Level"
+
+
+def _parse_level_file(text):
+    level = None
+    caller_levels = {}
+    for i, line in enumerate(text.splitlines(), 1):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        key, sep, value = line.partition("=")
+        key = key.strip()
+        value = value.strip()
+        if (not sep) or (not key) or (not value.isdigit()) or \
+                (int(value) not in LOG_LEVELS):
+            raise ValueError(f"Invalid line {i} ({line})")
+        if key == LEVEL_FILE_LEVEL_KEY:
+            level = int(value)
+        else:
+            caller_levels[key] = int(value)
+    return level, caller_levels
+
+
+class LevelFileWatcher:
+    def __init__(self, logger, filename, interval=1.0):
+        """
+        Change the verbosity levels of the given logger while it is in use by
+        polling a level file with a daemon thread.  This allows users to raise
+        the verbosity of a long-running job that has started misbehaving
+        without restarting it.  The file has one ``key = level`` entry per
+        line |eg| ::
+
+            # Raise verbosity of the line search only
+            Level = 1
+            Method.linesearch = 4
+
+        where ``Level`` sets the logger's level and all other keys are caller
+        names.  Blank lines and text following ``#`` are ignored.  If the file
+        contains caller entries, then they replace all caller levels set
+        in the logger; otherwise, caller levels are not altered.
+
+        The file is read when the watcher is created and then each time that
+        it is modified.  A missing file is not an error so that the file can
+        be created only when needed.  Invalid files are reported as warnings
+        and ignored.  Changes are seen immediately by all existing log
+        functions.
+
+        Watchers can be used as context managers, which stop the watcher on
+        exit.
+
+        :param logger: Concrete logger object derived from
+            :py:class:`AbstractLogger` whose levels are changed
+        :param filename: Name and path of level file
+        :param interval: Time in seconds between checks of the file
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        if not isinstance(logger, AbstractLogger):
+            log_and_abort(TypeError, "Invalid logger type")
+        elif not isinstance(filename, (str, Path)):
+            log_and_abort(TypeError, f"{filename} is not a string or Path")
+        elif isinstance(filename, str) and (filename == ""):
+            log_and_abort(ValueError, "Empty filename string given")
+        elif (not isinstance(interval, Real)) or isinstance(interval, bool):
+            log_and_abort(TypeError, f"interval is not a number ({interval})")
+        elif interval <= 0:
+            log_and_abort(ValueError, f"interval is not positive ({interval})")
+
+        super().__init__()
+
+        self.__logger = logger
+        self.__filename = Path(filename).resolve()
+        self.__interval = interval
+
+        # Modification time and size of the file when last read, which is
+        # protected by the lock since users can also check the file
+        self.__signature = None
+        self.__lock = threading.Lock()
+
+        self.check()
+
+        self.__stop = threading.Event()
+        self.__thread = threading.Thread(
+            target=self.__poll, name="poptus-LevelFileWatcher", daemon=True
+        )
+        self.__thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def logger(self):
+        """
+        :return: Logger whose levels are changed
+        """
+        return self.__logger
+
+    @property
+    def filename(self):
+        """
+        :return: Name including path of level file
+        """
+        return self.__filename
+
+    @property
+    def interval(self):
+        """
+        :return: Time in seconds between checks of the file
+        """
+        return self.__interval
+
+    def __poll(self):
+        while not self.__stop.wait(self.__interval):
+            self.check()
+
+    def check(self):
+        """
+        Read the level file and apply its levels to the logger if it has been
+        modified since it was last read.  This is called periodically by the
+        watcher's thread, but can also be called directly.
+
+        :return: ``True`` if levels were applied; ``False``, otherwise.
+        """
+        with self.__lock:
+            return self.__check()
+
+    def __check(self):
+        try:
+            stat = self.__filename.stat()
+        except OSError:
+            return False
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self.__signature:
+            return False
+        self.__signature = signature
+
+        try:
+            level, caller_levels = _parse_level_file(
+                self.__filename.read_text()
+            )
+            with _LEVELS_LOCK:
+                if caller_levels:
+                    self.__logger.set_caller_levels(caller_levels)
+                if level is not None:
+                    self.__logger.level = level
+        except (OSError, ValueError) as exc:
+            msg = f"Ignoring level file {self.__filename} ({exc})"
+            StandardLogger(LOG_LEVEL_NONE).warn(POPTUS_LOG_TAG, msg)
+            return False
+
+        return True
+
+    def stop(self):
+        """
+        Stop polling the level file.  Levels applied so far are not altered.
+        """
+        self.__stop.set()
+        self.__thread.join()
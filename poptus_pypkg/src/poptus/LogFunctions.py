@@ -0,0 +1,699 @@
+import os
+import math
+import time
+import random
+import weakref
+import functools
+import threading
+
+from array import array
+from numbers import Integral
+
+from ._constants import (
+    LOG_LEVELS, LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT,
+    LOG_LEVEL_MIN_DEBUG, LOG_LEVEL_MAX,
+    POPTUS_LOG_TAG
+)
+from .AbstractLogger import _LEVELS_LOCK
+from .StandardLogger import StandardLogger
+
+# Log functions that sample or rate limit messages, whose filters are reset in
+# processes created by forking
+_THROTTLED = weakref.WeakSet()
+
+
+def _write_summary(logger, caller, enabled, throttles):
+    # This does not reference the log functions so that it can be called when
+    # they are finalized
+    for level, throttle in enumerate(throttles):
+        if throttle is None:
+            continue
+        n_suppressed, n_total = throttle.counts(reset=True)
+        if n_suppressed and enabled[LOG_LEVEL_DEFAULT]:
+            msg = f"Suppressed {n_suppressed} of {n_total} level {level} " \
+                  + "messages"
+            fields = {"level": level, "suppressed": n_suppressed,
+                      "total": n_total}
+            logger.log_fields(caller, msg, LOG_LEVEL_DEFAULT, fields)
+
+
+def _write_final_summary(logger, caller, enabled, throttles):
+    try:
+        _write_summary(logger, caller, enabled, throttles)
+    except Exception as exc:
+        msg = f"Unable to write summary of suppressed messages ({exc})"
+        StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+
+
+# Log functions that have timed spans, whose timings are reset in processes
+# created by forking
+_TIMED = weakref.WeakSet()
+
+# Stack of the spans entered by each thread.  This is shared by all log
+# functions so that the spans of different callers nest.
+_SPAN_STACKS = threading.local()
+
+# Maximum number of durations kept for each span for estimating percentiles
+_MAX_SPAN_SAMPLES = 10000
+
+
+def _write_timings(logger, caller, enabled, table):
+    # This does not reference the log functions so that it can be called when
+    # they are finalized
+    timings = table.take()
+    if (not timings) or (not enabled[LOG_LEVEL_DEFAULT]):
+        return
+
+    columns = [("total", "Total"), ("mean", "Mean"), ("p50", "p50"),
+               ("p95", "p95"), ("p99", "p99"), ("cpu", "CPU")]
+    width = max(len("Span"), max(len(e) for e in timings))
+    lines = [f"{'Span':<{width}}  {'Count':>8}"
+             + "".join(f"  {e + ' [s]':>10}" for _, e in columns)]
+    for path in sorted(timings):
+        summary = timings[path].summary()
+        lines.append(f"{path:<{width}}  {summary['count']:>8d}"
+                     + "".join(f"  {summary[e]:>10.4g}" for e, _ in columns))
+    for line in lines:
+        logger.log(caller, line, LOG_LEVEL_DEFAULT)
+
+
+def _write_final_timings(logger, caller, enabled, table):
+    try:
+        _write_timings(logger, caller, enabled, table)
+    except Exception as exc:
+        msg = f"Unable to write table of span timings ({exc})"
+        StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+
+
+def _reset_after_fork():
+    for functions in set(_THROTTLED).union(_TIMED):
+        functions._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _build_message(msg, args):
+    # Messages can be given as a zero-argument callable or as a format string
+    # with deferred arguments so that potentially costly messages are built
+    # only once it is known that they will be logged.
+    if args:
+        return msg.format(*args)
+    elif callable(msg):
+        return msg()
+    return msg
+
+
+def _format_array(name, arr, precision, edge_items):
+    # Only the elements shown are formatted so that the cost of formatting
+    # does not grow with the size of the array.  Objects that support the
+    # NumPy array interface are flattened and reduced by NumPy if installed.
+    np = None
+    if hasattr(arr, "__array__"):
+        try:
+            import numpy as np
+        except ImportError:
+            pass
+
+    shape = None
+    if np is not None:
+        values = np.asarray(arr, dtype=float)
+        if values.ndim != 1:
+            shape = values.shape
+        values = values.ravel()
+        n = values.size
+        norm_2 = float(np.linalg.norm(values)) if n > 0 else 0.0
+        norm_inf = float(np.max(np.abs(values))) if n > 0 else 0.0
+    else:
+        values = [float(e) for e in arr]
+        n = len(values)
+        norm_2 = math.hypot(*values)
+        norm_inf = max(map(abs, values), default=0.0)
+
+    def format_all(elements):
+        return [f"{float(e):.{precision}g}" for e in elements]
+
+    if n > 2 * edge_items:
+        shown = format_all(values[:edge_items]) + ["..."] \
+            + format_all(values[n - edge_items:])
+    else:
+        shown = format_all(values)
+
+    size = f"n={n}" if shape is None else f"shape={shape}"
+    return f"{name} = [{', '.join(shown)}] ({size}, " \
+        + f"2-norm={norm_2:.{precision}g}, inf-norm={norm_inf:.{precision}g})"
+
+
+class _Throttle:
+    def __init__(self, sample, rate_limit):
+        # Admit every Nth message if sample is an integer or each message with
+        # the given probability otherwise.  Admitted messages are then subject
+        # to a token bucket filled at the given rate up to the given burst.
+        self.__every = None
+        self.__probability = None
+        if isinstance(sample, Integral):
+            self.__every = sample
+        elif sample is not None:
+            self.__probability = sample
+
+        self.__rate, self.__burst = (None, None) if rate_limit is None \
+            else rate_limit
+        self.__tokens = self.__burst
+        self.__last = time.monotonic()
+
+        self.__n_seen = 0
+        self.__n_suppressed = 0
+        self.__lock = threading.Lock()
+
+    def admit(self):
+        with self.__lock:
+            self.__n_seen += 1
+            if self.__every is not None:
+                admitted = ((self.__n_seen - 1) % self.__every == 0)
+            elif self.__probability is not None:
+                admitted = (random.random() < self.__probability)
+            else:
+                admitted = True
+
+            if admitted and (self.__rate is not None):
+                now = time.monotonic()
+                self.__tokens = min(
+                    self.__burst,
+                    self.__tokens + (now - self.__last) * self.__rate
+                )
+                self.__last = now
+                admitted = (self.__tokens >= 1.0)
+                if admitted:
+                    self.__tokens -= 1.0
+
+            if not admitted:
+                self.__n_suppressed += 1
+            return admitted
+
+    def counts(self, reset=False):
+        with self.__lock:
+            counts = (self.__n_suppressed, self.__n_seen)
+            if reset:
+                self.__n_suppressed = 0
+                self.__n_seen = 0
+            return counts
+
+
+class _SpanTimings:
+    def __init__(self):
+        # Totals are exact while percentiles are estimated from a uniform
+        # sample of the wall-clock durations
+        self.count = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.samples = array("d")
+
+    def add(self, wall, cpu):
+        self.count += 1
+        self.wall += wall
+        self.cpu += cpu
+        if len(self.samples) < _MAX_SPAN_SAMPLES:
+            self.samples.append(wall)
+        else:
+            index = random.randrange(self.count)
+            if index < _MAX_SPAN_SAMPLES:
+                self.samples[index] = wall
+
+    def summary(self):
+        ordered = sorted(self.samples)
+
+        def percentile(q):
+            return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+        return {"count": self.count, "total": self.wall,
+                "mean": self.wall / self.count,
+                "p50": percentile(0.50), "p95": percentile(0.95),
+                "p99": percentile(0.99), "cpu": self.cpu}
+
+
+class _SpanTable:
+    def __init__(self):
+        # Timings indexed by span path.  The table is reset in place so that
+        # the finalizer that writes it sees the timings of forked processes.
+        self.reset()
+
+    def reset(self):
+        self.__lock = threading.Lock()
+        self.__timings = {}
+
+    def add(self, path, wall, cpu):
+        with self.__lock:
+            timings = self.__timings.get(path)
+            if timings is None:
+                timings = self.__timings[path] = _SpanTimings()
+            timings.add(wall, cpu)
+
+    def summaries(self):
+        with self.__lock:
+            return {path: timings.summary()
+                    for path, timings in self.__timings.items()}
+
+    def take(self):
+        with self.__lock:
+            timings, self.__timings = self.__timings, {}
+            return timings
+
+
+class _NullSpan:
+    # Shared by all spans that are not timed so that these cost no more than
+    # checking the level
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    def __call__(self, func):
+        return func
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, functions, name, level):
+        # Spans hold no timing state so that the same span can be entered by
+        # many threads and recursively
+        self.__functions = functions
+        self.__name = name
+        self.__level = level
+
+    def __enter__(self):
+        try:
+            stack = _SPAN_STACKS.stack
+        except AttributeError:
+            stack = _SPAN_STACKS.stack = []
+        path = self.__name if not stack else f"{stack[-1][0]}/{self.__name}"
+        stack.append((path, time.thread_time(), time.perf_counter()))
+        return self
+
+    def __exit__(self, *_):
+        t_wall = time.perf_counter()
+        t_cpu = time.thread_time()
+        path, t_cpu_start, t_wall_start = _SPAN_STACKS.stack.pop()
+        self.__functions._end_span(path, self.__level,
+                                   t_wall - t_wall_start, t_cpu - t_cpu_start)
+        return False
+
+    def __call__(self, func):
+        return self.__functions._timed(self.__name, self.__level, func)
+
+
+class LogFunctions:
+    def __init__(self, logger, caller, sample=None, rate_limit=None):
+        """
+        The set of dedicated log functions that a method can use for logging
+        general information, debug information, warnings, and errors through
+        the given logger with the given caller name.  Objects of this class
+        are typically created with :py:func:`create_log_functions` and unpacked
+        as a tuple |via|::
+
+            log, log_debug, warn, log_and_abort = \\
+                poptus.create_log_functions(logger, caller)
+
+        The logger's verbosity level for the given caller, which accounts for
+        any caller levels set in the logger, is resolved when the object is
+        created and the result is stored as a per-level dispatch table so that
+        each call to a log function with a level incompatible with the caller's
+        level is skipped after a single table lookup.  The logger updates the
+        table in place whenever its levels change.
+
+        Messages of levels that are sampled or rate limited and that are
+        compatible with the caller's level are additionally passed through a
+        per-level filter whose counts of suppressed messages are written by
+        :py:meth:`write_summary`, which is called automatically once the log
+        functions are no longer in use or at exit.  Messages of other levels
+        are not slowed down.
+
+        Code can be timed with :py:meth:`span`, which records the wall-clock
+        and CPU time of each span and logs it at the given level.  The timings
+        of each span are also aggregated into a table written by
+        :py:meth:`write_timings`, which is called automatically once the log
+        functions are no longer in use or at exit.
+
+        Log functions can be passed to other processes (|eg| to the workers of
+        a ``concurrent.futures.ProcessPoolExecutor``) by pickling along with
+        their logger.  Filters and span timings of copies and of processes
+        created by forking start empty.
+
+        :param logger: Concrete logger object derived from
+            :py:class:`AbstractLogger` to be used for logging.  This is not
+            error checked.
+        :param caller: Name of element performing the logging.  This is not
+            error checked.
+        :param sample: ``None`` or ``dict`` indexed by message level of either
+            an integer ``N`` so that only every ``N``-th message is logged or
+            a probability with which each message is logged.  This is not
+            error checked.
+        :param rate_limit: ``None`` or ``dict`` indexed by message level of
+            ``(rate, burst)`` token bucket parameters so that at most ``burst``
+            messages are logged at once and at most ``rate`` messages per
+            second are logged on average.  This is not error checked.
+        """
+        super().__init__()
+
+        self.__logger = logger
+        self.__caller = caller
+
+        # Indexed by message level
+        self.__enabled = [False] * len(LOG_LEVELS)
+
+        self.__sample = {} if sample is None else sample
+        self.__rate_limit = {} if rate_limit is None else rate_limit
+        self.__start_throttles()
+        self.__start_spans()
+
+        with _LEVELS_LOCK:
+            self._levels_changed()
+            logger._add_dependent(self)
+
+    def __start_throttles(self):
+        # The summary is written when the log functions are no longer in use or
+        # at exit, whichever comes first, since log functions are typically
+        # created by methods and collected before exit.  The finalizer holds
+        # the filters, which are therefore rebuilt in place.
+        self.__throttles = [None] * len(LOG_LEVELS)
+        self.__build_throttles()
+        if any(self.__throttles):
+            _THROTTLED.add(self)
+            weakref.finalize(self, _write_final_summary, self.__logger,
+                             self.__caller, self.__enabled, self.__throttles)
+
+    def __build_throttles(self):
+        # Indexed by message level with None for levels that are not throttled
+        sample = self.__sample
+        rate_limit = self.__rate_limit
+        self.__throttles[:] = [
+            _Throttle(sample.get(level), rate_limit.get(level))
+            if (level in sample) or (level in rate_limit) else None
+            for level in LOG_LEVELS
+        ]
+
+    def __start_spans(self):
+        # Spans that are timed indexed by name and level.  Like the summary,
+        # the table of timings is written by a finalizer, which is registered
+        # when the first span is timed.
+        self.__spans = {}
+        self.__table = _SpanTable()
+        self.__table_writer = None
+
+    def __getstate__(self):
+        # Copies are built from the configuration and so have their own
+        # filters and timings
+        state = self.__dict__.copy()
+        for name in ["throttles", "spans", "table", "table_writer"]:
+            del state[f"_LogFunctions__{name}"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__start_throttles()
+        self.__start_spans()
+        with _LEVELS_LOCK:
+            self._levels_changed()
+            self.__logger._add_dependent(self)
+
+    def _after_fork_in_child(self):
+        # Messages counted and spans timed before forking are summarized by the
+        # parent and the locks might have been held by threads that do not
+        # exist in the child
+        self.__build_throttles()
+        self.__table.reset()
+
+    def _levels_changed(self):
+        # Called by the logger with its levels lock held.  The table is
+        # updated in place with a single slice assignment so that concurrent
+        # callers see either the old or the new table.
+        caller_level = self.__logger.level_of(self.__caller)
+        self.__enabled[:] = [
+            (level != LOG_LEVEL_NONE) and (level <= caller_level)
+            for level in LOG_LEVELS
+        ]
+
+    def __iter__(self):
+        return iter((self.log, self.log_debug, self.warn, self.log_and_abort))
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    @property
+    def logger(self):
+        """
+        :return: Logger used by the log functions
+        """
+        return self.__logger
+
+    @property
+    def caller(self):
+        """
+        :return: Name of element performing the logging
+        """
+        return self.__caller
+
+    def __admit(self, level):
+        throttle = self.__throttles[level]
+        return (throttle is None) or throttle.admit()
+
+    @property
+    def n_suppressed(self):
+        """
+        :return: ``dict`` of the number of messages suppressed by sampling or
+            rate limiting since the last summary indexed by message level
+        """
+        return {
+            level: throttle.counts()[0]
+            for level, throttle in enumerate(self.__throttles)
+            if throttle is not None
+        }
+
+    def write_summary(self):
+        """
+        Log at level ``LOG_LEVEL_DEFAULT``, if compatible with the caller's
+        level, one record for each sampled or rate limited level with the
+        number of messages suppressed and the total number of messages of that
+        level logged by the caller since the last summary.  Each record
+        includes the fields ``level``, ``suppressed``, and ``total``.  Levels
+        without suppressed messages are skipped.
+        """
+        _write_summary(self.__logger, self.__caller, self.__enabled,
+                       self.__throttles)
+
+    def span(self, name, level):
+        """
+        Time the code in a ``with`` block or each call of a decorated function
+        if messages with the given level are logged.  For example, ::
+
+            with functions.span("Model", poptus.LOG_LEVEL_MIN_DEBUG):
+                f_i = model(x_i)
+
+            @functions.span("Model", poptus.LOG_LEVEL_MIN_DEBUG)
+            def model(x):
+                ...
+
+        The wall-clock time and the CPU time of the calling thread are logged
+        at the given level with the fields ``span``, ``wall``, and ``cpu`` when
+        the span ends.  Spans entered while another span is running in the
+        same thread, including spans of other callers, are named
+        ``<outer>/<inner>``.  If messages with the given level are not logged
+        when the span is entered, the span is not timed and costs little more
+        than a table lookup.  Likewise, functions decorated while messages with
+        the given level are not logged are returned unchanged and so are never
+        timed, whereas the calls of functions decorated while such messages are
+        logged are timed only while they are logged.
+
+        :param name: Name of the span
+        :param level: Level at which the timing is logged, which must be
+            between ``LOG_LEVEL_DEFAULT`` and ``LOG_LEVEL_MAX`` inclusive
+        :return: Object that can be used as a context manager or decorator
+        """
+        assert LOG_LEVEL_DEFAULT <= level <= LOG_LEVEL_MAX
+        if not self.__enabled[level]:
+            return _NULL_SPAN
+        key = (name, level)
+        try:
+            return self.__spans[key]
+        except KeyError:
+            span = self.__spans[key] = _Span(self, name, level)
+            return span
+
+    def _timed(self, name, level, func):
+        # The level is checked with each call so that changes made after
+        # decorating are taken into account and so that calls that are not
+        # timed skip the span altogether
+        enabled = self.__enabled
+        span = _Span(self, name, level)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled[level]:
+                return func(*args, **kwargs)
+            with span:
+                return func(*args, **kwargs)
+        return wrapper
+
+    def _end_span(self, path, level, wall, cpu):
+        self.__table.add(path, wall, cpu)
+        if self.__table_writer is None:
+            _TIMED.add(self)
+            self.__table_writer = weakref.finalize(
+                self, _write_final_timings, self.__logger, self.__caller,
+                self.__enabled, self.__table
+            )
+
+        if self.__enabled[level] and self.__admit(level):
+            msg = f"{path} took {wall:.6g} s ({cpu:.6g} s CPU)"
+            fields = {"span": path, "wall": wall, "cpu": cpu}
+            self.__logger.log_fields(self.__caller, msg, level, fields)
+
+    @property
+    def timings(self):
+        """
+        :return: ``dict`` indexed by span path of ``dict`` with the number of
+            times that the span was timed since the last table (``count``), the
+            total, mean, and 50th, 95th, and 99th percentile wall-clock time in
+            seconds (``total``, ``mean``, ``p50``, ``p95``, ``p99``), and the
+            total CPU time in seconds (``cpu``).  Percentiles are estimated
+            from at most 10,000 durations sampled uniformly.
+        """
+        return self.__table.summaries()
+
+    def write_timings(self):
+        """
+        Log at level ``LOG_LEVEL_DEFAULT``, if compatible with the caller's
+        level, a table of the timings of all spans timed since the last table
+        (see :py:attr:`timings`) with one message per line.
+        """
+        _write_timings(self.__logger, self.__caller, self.__enabled,
+                       self.__table)
+
+    def is_enabled(self, level):
+        """
+        Callers can use this to avoid building costly data for debug messages
+        that would not be logged.
+
+        :param level: Message level between ``LOG_LEVEL_DEFAULT`` and
+            ``LOG_LEVEL_MAX`` inclusive
+        :return: ``True`` if messages with the given level are logged;
+            ``False``, otherwise.
+        """
+        assert LOG_LEVEL_DEFAULT <= level <= LOG_LEVEL_MAX
+        return self.__enabled[level]
+
+    def log(self, msg, *args):
+        """
+        Log the given general message at level ``LOG_LEVEL_DEFAULT``.
+
+        :param msg: Message, format string filled with ``args``, or
+            zero-argument callable that returns the message
+        """
+        if self.__enabled[LOG_LEVEL_DEFAULT] and \
+                self.__admit(LOG_LEVEL_DEFAULT):
+            self.__logger.log(self.__caller, _build_message(msg, args),
+                              LOG_LEVEL_DEFAULT)
+
+    def log_debug(self, msg, debug_level, *args):
+        """
+        Log the given debug message at the given debug level.
+
+        :param msg: Message, format string filled with ``args``, or
+            zero-argument callable that returns the message
+        :param debug_level: Message's level, which must be between
+            ``LOG_LEVEL_MIN_DEBUG`` and ``LOG_LEVEL_MAX`` inclusive
+        """
+        # Since these functions are used by method developers rather than users,
+        # we can keep the error checking minimal and light.  If method
+        # developers use a bad level, they should find out immediately and
+        # easily.
+        assert LOG_LEVEL_MIN_DEBUG <= debug_level <= LOG_LEVEL_MAX
+        if self.__enabled[debug_level] and self.__admit(debug_level):
+            self.__logger.log(self.__caller, _build_message(msg, args),
+                              debug_level)
+
+    def log_fields(self, msg, level, *args, **fields):
+        """
+        Log the given message at the given level along with the given typed
+        key/value fields.  Loggers that record structured data (|eg|
+        :py:class:`JsonLinesLogger`) store the fields with their types intact;
+        other loggers append them to the message as ``key=value``.  For
+        example, ::
+
+            log_fields("Iterate accepted", LOG_LEVEL_DEFAULT,
+                       iteration=i, f=f_i, step_size=delta)
+
+        :param msg: Message, format string filled with ``args``, or
+            zero-argument callable that returns the message
+        :param level: Message's level, which must be between
+            ``LOG_LEVEL_DEFAULT`` and ``LOG_LEVEL_MAX`` inclusive
+        :param fields: Typed values indexed by field name
+        """
+        assert LOG_LEVEL_DEFAULT <= level <= LOG_LEVEL_MAX
+        if self.__enabled[level] and self.__admit(level):
+            self.__logger.log_fields(self.__caller, _build_message(msg, args),
+                                     level, fields)
+
+    def log_array(self, name, arr, level, precision=6, edge_items=3):
+        """
+        Log the given array as a single message at the given level.  Large
+        arrays are truncated to their first and last few elements and all
+        arrays are logged with their 2- and infinity-norms so that the cost and
+        length of the message do not grow with the size of the array.  For
+        example, ::
+
+            log_array("x_0", x_0, LOG_LEVEL_DEFAULT)
+
+        logs ``x_0 = [1, 2, 3, ..., 98, 99, 100] (n=100, 2-norm=581.679,
+        inf-norm=100)``.  The array is not accessed if the message would not
+        be logged.
+
+        :param name: Name of the array
+        :param arr: Sequence of numbers or NumPy array.  Arrays with more than
+            one dimension are flattened and logged with their shape and the
+            norms of the flattened array.
+        :param level: Message's level, which must be between
+            ``LOG_LEVEL_DEFAULT`` and ``LOG_LEVEL_MAX`` inclusive
+        :param precision: Number of significant digits of each number
+        :param edge_items: Number of elements logged at each end of arrays
+            with more than twice this number of elements
+        """
+        assert LOG_LEVEL_DEFAULT <= level <= LOG_LEVEL_MAX
+        assert precision >= 1
+        assert edge_items >= 0
+        if self.__enabled[level] and self.__admit(level):
+            self.__logger.log(
+                self.__caller,
+                _format_array(name, arr, precision, edge_items), level
+            )
+
+    def warn(self, msg, *args):
+        """
+        Log the given warning message.
+
+        :param msg: Message, format string filled with ``args``, or
+            zero-argument callable that returns the message
+        """
+        self.__logger.warn(self.__caller, _build_message(msg, args))
+
+    def log_and_abort(self, my_exception, msg, *args):
+        """
+        Log the given error message and then raise an exception of the given
+        type.
+
+        :param my_exception: Exception type (|eg| ``ValueError``,
+            ``TypeError``)
+        :param msg: Message, format string filled with ``args``, or
+            zero-argument callable that returns the message
+        """
+        msg = _build_message(msg, args)
+        self.__logger.error(self.__caller, msg)
+        raise my_exception(msg)
@@ -0,0 +1,229 @@
+import os
+import weakref
+import threading
+
+from numbers import Integral
+
+from ._constants import (
+    LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT,
+    POPTUS_LOG_TAG
+)
+from .FileLogger import (
+    FileLogger, _OPEN_LOGGERS, _close_at_process_exit
+)
+from .StandardLogger import StandardLogger
+
+# Size of the blocks read backward from the end of a file when searching for
+# the end of its records
+_BLOCK_SIZE = 1024 * 1024
+
+
+def _end_of_last(fptr, end, find):
+    # Offset just past the last byte before the given offset found in its
+    # block by the given function, or zero if there is no such byte.  Blocks
+    # are searched by bytes methods rather than byte by byte.
+    while end > 0:
+        start = max(0, end - _BLOCK_SIZE)
+        fptr.seek(start)
+        n_bytes = find(fptr.read(end - start))
+        if n_bytes > 0:
+            return start + n_bytes
+        end = start
+    return 0
+
+
+def _end_of_records(fptr):
+    # Files are padded with zero bytes beyond the records written so far,
+    # which never contain zero bytes since these are escaped when written
+    size = fptr.seek(0, os.SEEK_END)
+    return _end_of_last(fptr, size, lambda e: len(e.rstrip(b"\0")))
+
+
+def _release(mapped, filename, base):
+    # Messages written by other threads between finding the position in the
+    # region and unmapping it are found by searching forward for the padding
+    offset = base + mapped.tell()
+    mapped.close()
+    with open(filename, "r+b") as fptr:
+        fptr.seek(offset)
+        while True:
+            block = fptr.read(_BLOCK_SIZE)
+            n_bytes = block.find(b"\0")
+            if n_bytes >= 0:
+                offset += n_bytes
+                break
+            offset += len(block)
+            if len(block) < _BLOCK_SIZE:
+                break
+        fptr.truncate(offset)
+
+
+class MappedFileLogger(FileLogger):
+    def __init__(self, filename, overwrite, level=LOG_LEVEL_DEFAULT,
+                 chunk_size=16 * 1024 * 1024):
+        """
+        A concrete |poptus| logger class that writes all log, warning, and error
+        messages to the given file as the same text that
+        :py:class:`FileLogger` would write, but by copying each encoded message
+        directly into a memory-mapped region of the file.  This bypasses
+        Python's file objects entirely and is intended for tracing at high
+        verbosity levels with very high message rates.  Error messages are
+        also written to standard error.
+
+        The file is mapped when the first message is logged and is grown and
+        remapped in chunks of the given size as needed.  Each message is
+        visible to other processes as soon as it is logged and is not lost if
+        the process crashes.  Flushing the logger, which happens automatically
+        for errors, additionally commits all messages to disk so that they
+        survive a crash of the system.  Closing the logger, which happens
+        automatically at exit and when the logger is no longer in use, unmaps
+        the file and truncates it to the size of the messages written.  Files
+        left untruncated by a crash end with zero bytes after the last complete
+        message and can be truncated with :py:func:`recover_mapped_log`.
+        Since zero bytes mark the end of the messages, null characters in
+        messages are written as the four characters ``\\x00``.  Backslashes
+        are not escaped so that all other messages are written exactly as
+        :py:class:`FileLogger` would write them.  Therefore, this substitution
+        is one way and ``\\x00`` read from a file might have been either a
+        null character or those four characters.
+
+        Copies of the logger made by pickling or forking append to the file
+        and map their own region of the file when they first log a message.
+        Therefore, different processes should not write to the same mapped
+        log file.
+
+        :param level: Verbosity level of the logger
+        :param filename: Name and path of file to write to
+        :param overwrite: If a file with the given name already exists, then it
+            is overwritten if ``True`` or an error is raised if ``False``.
+        :param chunk_size: Size in bytes by which the file is grown, which is
+            rounded up to a multiple of the system's memory allocation
+            granularity
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        # This error checks the remaining arguments
+        super().__init__(filename, overwrite, level)
+
+        if (not isinstance(chunk_size, Integral)) or \
+                isinstance(chunk_size, bool):
+            msg = f"chunk_size is not an integer ({chunk_size})"
+            log_and_abort(TypeError, msg)
+        elif chunk_size <= 0:
+            msg = f"chunk_size is not positive ({chunk_size})"
+            log_and_abort(ValueError, msg)
+
+        # mmap is imported only when needed so that importing poptus stays
+        # cheap
+        import mmap
+        granularity = mmap.ALLOCATIONGRANULARITY
+        self.__chunk_size = -(-chunk_size // granularity) * granularity
+
+        # The mapped region of the file and the finalizer that unmaps it and
+        # truncates the file.  Only mapping is locked.
+        self.__map = None
+        self.__closer = None
+        self.__lock = threading.Lock()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state["_MappedFileLogger__map"] = None
+        state["_MappedFileLogger__closer"] = None
+        del state["_MappedFileLogger__lock"]
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.__lock = threading.Lock()
+
+    def _after_fork_in_child(self):
+        # The parent still writes to the file and so it is not truncated.  The
+        # lock might have been held by another thread when forking.
+        super()._after_fork_in_child()
+        self.__lock = threading.Lock()
+        if self.__map is not None:
+            self.__closer.detach()
+            self.__map.close()
+            self.__map = None
+            self.__closer = None
+            _OPEN_LOGGERS.discard(self)
+
+    @property
+    def chunk_size(self):
+        """
+        :return: Size in bytes by which the file is grown
+        """
+        return self.__chunk_size
+
+    def __unmap(self):
+        if self.__map is not None:
+            self.__closer()
+            self.__map = None
+            self.__closer = None
+            _OPEN_LOGGERS.discard(self)
+
+    def __map_and_write(self, data):
+        import mmap
+
+        with self.__lock:
+            # Another thread might have remapped the file already
+            if self.__map is not None:
+                try:
+                    self.__map.write(data)
+                    return
+                except ValueError:
+                    self.__unmap()
+
+            # The end of the records is searched for so that copies of the
+            # logger append to files that other copies have padded
+            granularity = mmap.ALLOCATIONGRANULARITY
+            with open(self.filename, "a+b") as fptr:
+                offset = _end_of_records(fptr)
+                base = offset - offset % granularity
+                n_chunks = -(-(offset - base + len(data)) // self.__chunk_size)
+                end = base + n_chunks * self.__chunk_size
+                fptr.truncate(end)
+                mapped = mmap.mmap(fptr.fileno(), end - base, offset=base)
+            mapped.seek(offset - base)
+            mapped.write(data)
+
+            self.__map = mapped
+            # Copies made by pickling cannot be closed by users and so the
+            # file is closed once the logger is no longer in use
+            self.__closer = weakref.finalize(self, _release, mapped,
+                                             self.filename, base)
+            _OPEN_LOGGERS.add(self)
+            _close_at_process_exit()
+
+    def _write(self, line):
+        # Each write to the mapped region is a single call that holds the GIL
+        # and so is atomic with respect to other threads.  Writes fail if the
+        # file is not mapped or the region is full.
+        data = line.encode("utf-8")
+        # Null characters cannot be told apart from the padding and so are
+        # substituted, which cannot be undone
+        if b"\0" in data:
+            data = data.replace(b"\0", b"\\x00")
+        try:
+            self.__map.write(data)
+        except (AttributeError, ValueError):
+            self.__map_and_write(data)
+
+    def flush(self):
+        """
+        Commit all messages written to the mapped region of the file to disk.
+        """
+        with self.__lock:
+            if self.__map is not None:
+                self.__map.flush()
+
+    def close(self):
+        """
+        Unmap the file and truncate it to the size of the messages written.
+        Messages logged after closing the logger are still written to file,
+        which is mapped again as needed.
+        """
+        with self.__lock:
+            self.__unmap()
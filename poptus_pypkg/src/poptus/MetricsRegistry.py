@@ -0,0 +1,356 @@
+import math
+import bisect
+import weakref
+import threading
+
+from array import array
+from numbers import Real
+
+from ._constants import (
+    LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT,
+    POPTUS_LOG_TAG
+)
+from .AbstractLogger import AbstractLogger
+from .StandardLogger import StandardLogger
+
+_COUNTER = "counter"
+_GAUGE = "gauge"
+_HISTOGRAM = "histogram"
+
+
+def _snapshot(readers, lock):
+    with lock:
+        return {
+            caller: {name: reader.value for name, reader in by_name.items()}
+            for caller, by_name in readers.items()
+        }
+
+
+def _write_snapshot(logger, readers, lock):
+    for caller, values in _snapshot(readers, lock).items():
+        if values:
+            logger.log_fields(caller, "Metrics", LOG_LEVEL_DEFAULT, values)
+
+
+def _write_final_snapshot(logger, readers, lock):
+    # Called when the registry and all of its metrics are no longer in use or
+    # at exit, whichever comes first
+    try:
+        _write_snapshot(logger, readers, lock)
+    except Exception as exc:
+        msg = f"Unable to write metrics ({exc})"
+        StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+
+
+# Each metric handed out holds its registry, which is otherwise typically no
+# longer referenced by drivers while its metrics are still in use, so that the
+# final snapshot is not written before the last update.  Snapshots read values
+# through twins of the metrics that do not hold the registry so that the final
+# snapshot does not keep the registry alive.
+class _Counter:
+    __slots__ = ("__registry", "__values", "__index")
+
+    def __init__(self, registry, values, index):
+        self.__registry = registry
+        self.__values = values
+        self.__index = index
+
+    def increment(self, n=1):
+        self.__values[self.__index] += n
+
+    @property
+    def value(self):
+        return self.__values[self.__index]
+
+
+class _Gauge:
+    __slots__ = ("__registry", "__values", "__index")
+
+    def __init__(self, registry, values, index):
+        self.__registry = registry
+        self.__values = values
+        self.__index = index
+
+    def set(self, value):
+        self.__values[self.__index] = value
+
+    @property
+    def value(self):
+        return self.__values[self.__index]
+
+
+class _Histogram:
+    __slots__ = ("__registry", "__bounds", "__counts", "__offset", "__sums",
+                 "__index")
+
+    def __init__(self, registry, bounds, counts, offset, sums, index):
+        self.__registry = registry
+        self.__bounds = bounds
+        self.__counts = counts
+        self.__offset = offset
+        self.__sums = sums
+        self.__index = index
+
+    def observe(self, value):
+        self.__counts[self.__offset
+                      + bisect.bisect_left(self.__bounds, value)] += 1
+        self.__sums[self.__index] += value
+
+    @property
+    def value(self):
+        counts = self.__counts[self.__offset:
+                               self.__offset + len(self.__bounds) + 1]
+        return {"bounds": list(self.__bounds), "counts": counts.tolist(),
+                "count": sum(counts), "sum": self.__sums[self.__index]}
+
+
+class MetricsRegistry:
+    def __init__(self, logger, interval=None, at_exit=True):
+        """
+        A registry of counters, gauges, and fixed-bucket histograms indexed by
+        caller and metric name for recording quantities such as the number of
+        function evaluations spent by a method or the distribution of model
+        evaluation times.  For example, ::
+
+            metrics = poptus.MetricsRegistry(logger)
+            n_evals = metrics.counter("Method", "function_evaluations")
+            eval_time = metrics.histogram("Model", "evaluation_time",
+                                          [1.0e-3, 1.0e-2, 0.1, 1.0])
+            ...
+            n_evals.increment()
+            eval_time.observe(t)
+
+        The values of all metrics are stored in a few compact arrays shared by
+        all metrics.  Each update is a constant-time array update made through
+        the object returned when the metric was registered so that metrics can
+        be left on in production code.  Updates are not locked so that they
+        stay cheap.
+
+        A snapshot of all metrics is logged through the given logger when
+        :py:meth:`write` is called, periodically if an interval is given, and,
+        if requested, once the registry and all of its metrics are no longer
+        in use or at exit, whichever comes first.
+        Each caller's metrics are logged as typed fields of one message at
+        level ``LOG_LEVEL_DEFAULT`` so that structured loggers (|eg|
+        :py:class:`JsonLinesLogger`) record them in a machine-readable format
+        and other loggers record them as text.
+
+        Registries can be used as context managers, which stop the periodic
+        snapshots on exit.
+
+        :param logger: Concrete logger object derived from
+            :py:class:`AbstractLogger` through which snapshots are logged.
+            Periodic snapshots are logged by a daemon thread.
+        :param interval: ``None`` or the time in seconds between snapshots
+        :param at_exit: Log a final snapshot if ``True``
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        if not isinstance(logger, AbstractLogger):
+            log_and_abort(TypeError, "Invalid logger type")
+        elif interval is not None:
+            if (not isinstance(interval, Real)) or isinstance(interval, bool):
+                msg = f"interval is not a number ({interval})"
+                log_and_abort(TypeError, msg)
+            elif not (0.0 < interval < math.inf):
+                msg = f"interval is not positive and finite ({interval})"
+                log_and_abort(ValueError, msg)
+        if not isinstance(at_exit, bool):
+            log_and_abort(TypeError, f"at_exit is not a bool ({at_exit})")
+
+        super().__init__()
+
+        self.__logger = logger
+        self.__interval = interval
+
+        # Values of all counters and gauges, the bucket counts of all
+        # histograms stored contiguously, and the sum of values observed by
+        # each histogram.  Metrics and their readers are indexed by caller and
+        # then by name.
+        self.__counters = array("q")
+        self.__gauges = array("d")
+        self.__buckets = array("q")
+        self.__sums = array("d")
+        self.__metrics = {}
+        self.__readers = {}
+        self.__lock = threading.Lock()
+
+        if at_exit:
+            weakref.finalize(self, _write_final_snapshot, logger,
+                             self.__readers, self.__lock)
+
+        self.__stop = threading.Event()
+        self.__thread = None
+        if interval is not None:
+            self.__thread = threading.Thread(
+                target=self.__poll, name="poptus-MetricsRegistry", daemon=True
+            )
+            self.__thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def logger(self):
+        """
+        :return: Logger through which snapshots are logged
+        """
+        return self.__logger
+
+    @property
+    def interval(self):
+        """
+        :return: ``None`` or the time in seconds between snapshots
+        """
+        return self.__interval
+
+    def __poll(self):
+        while not self.__stop.wait(self.__interval):
+            try:
+                self.write()
+            except Exception as exc:
+                msg = f"Unable to write metrics ({exc})"
+                StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+
+    def stop(self):
+        """
+        Stop taking periodic snapshots.  Metrics can still be updated and
+        written.
+        """
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def __register(self, caller, name, kind, build):
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        for key, value in [("caller", caller), ("name", name)]:
+            if not isinstance(value, str):
+                log_and_abort(TypeError, f"Metric {key} is not a string")
+            elif value == "":
+                log_and_abort(ValueError, f"Metric {key} is an empty string")
+
+        with self.__lock:
+            metrics = self.__metrics.setdefault(caller, {})
+            if name in metrics:
+                existing_kind, metric = metrics[name]
+                if existing_kind != kind:
+                    msg = f"{caller} metric {name} is a {existing_kind}"
+                    log_and_abort(ValueError, msg)
+                return metric
+            metric, reader = build()
+            metrics[name] = (kind, metric)
+            self.__readers.setdefault(caller, {})[name] = reader
+            return metric
+
+    def counter(self, caller, name):
+        """
+        Register a counter or get the counter already registered with the
+        given caller and name.  Counters start at zero.
+
+        :param caller: Name of the code that owns the counter
+        :param name: Name of the counter
+        :return: Counter with method ``increment(n=1)``, which adds the given
+            integer to the counter, and property ``value``
+        """
+        def build():
+            self.__counters.append(0)
+            index = len(self.__counters) - 1
+            return (_Counter(self, self.__counters, index),
+                    _Counter(None, self.__counters, index))
+
+        return self.__register(caller, name, _COUNTER, build)
+
+    def gauge(self, caller, name):
+        """
+        Register a gauge or get the gauge already registered with the given
+        caller and name.  Gauges start at zero.
+
+        :param caller: Name of the code that owns the gauge
+        :param name: Name of the gauge
+        :return: Gauge with method ``set(value)``, which sets the gauge to the
+            given number, and property ``value``
+        """
+        def build():
+            self.__gauges.append(0.0)
+            index = len(self.__gauges) - 1
+            return (_Gauge(self, self.__gauges, index),
+                    _Gauge(None, self.__gauges, index))
+
+        return self.__register(caller, name, _GAUGE, build)
+
+    def histogram(self, caller, name, bounds):
+        """
+        Register a histogram or get the histogram already registered with the
+        given caller and name.  A histogram with ``N`` bounds has ``N + 1``
+        buckets so that bucket ``i`` counts the values ``v`` with
+        ``bounds[i - 1] < v <= bounds[i]`` and the last bucket counts the
+        values larger than all bounds.  Each value is placed in its bucket by
+        bisection.
+
+        :param caller: Name of the code that owns the histogram
+        :param name: Name of the histogram
+        :param bounds: Non-empty sequence of strictly increasing, finite upper
+            bounds of the buckets
+        :return: Histogram with method ``observe(value)``, which counts the
+            given number in its bucket, and property ``value``, which is a
+            ``dict`` with the ``bounds``, bucket ``counts``, total ``count``,
+            and ``sum`` of observed values
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        try:
+            bounds = tuple(bounds)
+        except TypeError:
+            log_and_abort(TypeError, f"bounds is not iterable ({bounds})")
+        if not bounds:
+            log_and_abort(ValueError, "No histogram bounds given")
+        for bound in bounds:
+            if (not isinstance(bound, Real)) or isinstance(bound, bool):
+                msg = f"Histogram bound is not a number ({bound})"
+                log_and_abort(TypeError, msg)
+            elif not math.isfinite(bound):
+                msg = f"Histogram bound is not finite ({bound})"
+                log_and_abort(ValueError, msg)
+        if any(a >= b for a, b in zip(bounds, bounds[1:])):
+            msg = f"Histogram bounds are not strictly increasing ({bounds})"
+            log_and_abort(ValueError, msg)
+
+        def build():
+            offset = len(self.__buckets)
+            self.__buckets.extend([0] * (len(bounds) + 1))
+            self.__sums.append(0.0)
+            args = (array("d", bounds), self.__buckets, offset, self.__sums,
+                    len(self.__sums) - 1)
+            return _Histogram(self, *args), _Histogram(None, *args)
+
+        histogram = self.__register(caller, name, _HISTOGRAM, build)
+        if tuple(histogram.value["bounds"]) != bounds:
+            msg = f"{caller} histogram {name} has different bounds"
+            log_and_abort(ValueError, msg)
+        return histogram
+
+    def snapshot(self):
+        """
+        :return: ``dict`` indexed by caller and then by metric name of the
+            present value of each metric.  See the ``value`` property of the
+            objects returned by :py:meth:`counter`, :py:meth:`gauge`, and
+            :py:meth:`histogram`.
+        """
+        return _snapshot(self.__readers, self.__lock)
+
+    def write(self):
+        """
+        Log the present value of all metrics as typed fields with one message
+        per caller at level ``LOG_LEVEL_DEFAULT``.
+        """
+        _write_snapshot(self.__logger, self.__readers, self.__lock)
@@ -0,0 +1,383 @@
+import os
+import atexit
+import weakref
+import threading
+
+from numbers import Integral
+from collections import deque
+
+from ._constants import (
+    LOG_LEVELS, LOG_LEVEL_NONE,
+    QUEUE_POLICY_BLOCK, QUEUE_POLICY_DROP_OLDEST, QUEUE_POLICY_DROP_NEW,
+    QUEUE_POLICIES,
+    POPTUS_LOG_TAG
+)
+from .AbstractLogger import AbstractLogger
+from .StandardLogger import StandardLogger
+
+# Queue loggers that have not been closed.  These are closed at exit so that
+# all queued messages are written.  Weak references are used so that this does
+# not keep alive loggers that are no longer in use, which are closed when
+# collected.
+_OPEN_LOGGERS = weakref.WeakSet()
+_OPEN_LOGGERS_LOCK = threading.Lock()
+
+
+def _close_open_loggers():
+    with _OPEN_LOGGERS_LOCK:
+        loggers = list(_OPEN_LOGGERS)
+    for logger in loggers:
+        logger.close()
+
+
+def _reset_open_loggers():
+    # The lock might have been held by a thread that does not exist in the
+    # child
+    global _OPEN_LOGGERS_LOCK
+
+    _OPEN_LOGGERS_LOCK = threading.Lock()
+    for logger in list(_OPEN_LOGGERS):
+        logger._after_fork_in_child()
+
+
+atexit.register(_close_open_loggers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_open_loggers)
+
+
+class _Queue:
+    # Queued messages and the state shared with the writer thread, which are
+    # kept apart from the logger so that the thread does not keep the logger
+    # alive.  All state is protected by a single lock.
+    def __init__(self, logger):
+        self.logger = logger
+        self.writer = None
+        self.records = deque()
+        self.n_in_flight = 0
+        self.closed = False
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+        self.drained = threading.Condition(self.lock)
+
+        # Serializes use of the wrapped logger by the writer thread and by
+        # callers logging errors
+        self.write_lock = threading.Lock()
+
+
+def _drain(queue):
+    while True:
+        with queue.lock:
+            while (not queue.records) and (not queue.closed):
+                queue.not_empty.wait()
+            if not queue.records:
+                return
+
+            batch = list(queue.records)
+            queue.records.clear()
+            queue.n_in_flight = len(batch)
+            queue.not_full.notify_all()
+
+        with queue.write_lock:
+            for write, args in batch:
+                try:
+                    write(*args)
+                except Exception as exc:
+                    msg = f"Unable to write queued message ({exc})"
+                    StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            queue.logger.flush()
+
+        with queue.lock:
+            queue.n_in_flight = 0
+            queue.drained.notify_all()
+
+
+def _start_writer(queue):
+    # Called with the lock held
+    queue.writer = threading.Thread(
+        target=_drain, args=(queue,), name="poptus-QueueLogger", daemon=True
+    )
+    queue.writer.start()
+
+
+def _stop(queue):
+    # Called when the logger is closed or is no longer in use, whichever comes
+    # first.  The writer thread, if started, writes all queued messages before
+    # stopping.  It is not joined if it happens to be the thread collecting
+    # the logger.
+    with queue.lock:
+        queue.closed = True
+        queue.not_empty.notify()
+        queue.not_full.notify_all()
+        writer = queue.writer
+    if (writer is not None) and (writer is not threading.current_thread()):
+        writer.join()
+
+
+class QueueLogger(AbstractLogger):
+    def __init__(self, logger, max_size=1024, policy=QUEUE_POLICY_BLOCK):
+        """
+        A concrete |poptus| logger class that takes the writing of log and
+        warning messages off of the caller's path.  Messages are pushed onto a
+        bounded queue and a dedicated writer thread drains the queue by passing
+        the messages on to the given logger.
+
+        Error messages are logged synchronously by the calling thread once all
+        previously queued messages have been written so that error messages
+        are written to ``stderr`` before the caller continues and so that they
+        appear after all earlier messages.
+
+        The writer thread is stopped and all queued messages written when the
+        logger is closed, which happens automatically at exit and when the
+        logger is no longer in use.  Messages
+        logged after closing the logger are passed on to the given logger
+        synchronously.
+
+        Copies of the logger made by pickling start with an empty queue and
+        their own writer thread.  Copies made by forking also start with an
+        empty queue, but start their own writer thread only when they first
+        queue a message so that child processes do not run a thread for each
+        queue logger that they never use.
+
+        :param logger: Concrete logger object derived from
+            :py:class:`AbstractLogger` that writes the queued messages.  The
+            verbosity level and caller levels of this logger are also those of
+            the queue logger.
+        :param max_size: Maximum number of messages that can be queued
+        :param policy: Action to take when a message is logged while the queue
+            is full.  ``QUEUE_POLICY_BLOCK`` blocks the caller until there is
+            room in the queue, ``QUEUE_POLICY_DROP_OLDEST`` drops the oldest
+            queued message, and ``QUEUE_POLICY_DROP_NEW`` drops the new message.
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        if not isinstance(logger, AbstractLogger):
+            log_and_abort(TypeError, "Invalid logger type")
+        elif (not isinstance(max_size, Integral)) or \
+                isinstance(max_size, bool):
+            log_and_abort(TypeError, f"max_size is not an integer ({max_size})")
+        elif max_size <= 0:
+            log_and_abort(ValueError, f"max_size is not positive ({max_size})")
+        elif policy not in QUEUE_POLICIES:
+            log_and_abort(ValueError, f"Invalid queue policy ({policy})")
+
+        super().__init__(logger.level)
+
+        # LOG_LEVEL_NONE is not an acceptable message level for general logging
+        # as per the documentation in AbstractLogger.
+        self.__valid = set(LOG_LEVELS).difference({LOG_LEVEL_NONE})
+
+        self.__logger = logger
+        self.__max_size = max_size
+        self.__policy = policy
+
+        self.__n_dropped = 0
+        self.__start()
+        with self.__queue.lock:
+            _start_writer(self.__queue)
+        with _OPEN_LOGGERS_LOCK:
+            _OPEN_LOGGERS.add(self)
+
+        logger._add_dependent(self)
+
+    def __start(self):
+        self.__queue = _Queue(self.__logger)
+        self.__stopper = weakref.finalize(self, _stop, self.__queue)
+
+    def __reduce__(self):
+        # Copies are built from the configuration with their own queue and
+        # writer thread.  Queued messages are written by this logger.
+        return (type(self), (self.__logger, self.__max_size, self.__policy))
+
+    def _after_fork_in_child(self):
+        # The writer thread does not exist in the child and the messages that
+        # it had yet to write are written by the parent.  A new writer thread
+        # is started when the first message is queued.
+        self.__stopper.detach()
+        self.__start()
+
+    @property
+    def logger(self):
+        """
+        :return: Logger that writes the queued messages
+        """
+        return self.__logger
+
+    @property
+    def level(self):
+        """
+        :return: Verbosity level of the wrapped logger
+        """
+        return self.__logger.level
+
+    @level.setter
+    def level(self, level):
+        """
+        Set the verbosity level of the wrapped logger.
+
+        :param level: New verbosity level
+        """
+        self.__logger.level = level
+
+    @property
+    def caller_levels(self):
+        """
+        :return: ``dict`` of verbosity levels set for callers in the wrapped
+            logger indexed by caller name
+        """
+        return self.__logger.caller_levels
+
+    def set_caller_levels(self, levels):
+        """
+        Set the verbosity levels of individual callers in the wrapped logger.
+        See :py:meth:`AbstractLogger.set_caller_levels`.
+
+        :param levels: ``dict`` of verbosity levels indexed by caller name
+        """
+        self.__logger.set_caller_levels(levels)
+
+    def level_of(self, caller):
+        """
+        :param caller: Name of calling code
+        :return: Verbosity level that the wrapped logger applies to messages of
+            the given caller
+        """
+        return self.__logger.level_of(caller)
+
+    @property
+    def max_size(self):
+        """
+        :return: Maximum number of messages that can be queued
+        """
+        return self.__max_size
+
+    @property
+    def policy(self):
+        """
+        :return: Action taken when a message is logged while the queue is full
+        """
+        return self.__policy
+
+    @property
+    def n_dropped(self):
+        """
+        :return: Number of messages dropped so far because the queue was full
+        """
+        with self.__queue.lock:
+            return self.__n_dropped
+
+    def __put(self, write, *args):
+        queue = self.__queue
+        with queue.lock:
+            if not queue.closed:
+                if len(queue.records) >= self.__max_size:
+                    if self.__policy == QUEUE_POLICY_DROP_NEW:
+                        self.__n_dropped += 1
+                        return
+                    elif self.__policy == QUEUE_POLICY_DROP_OLDEST:
+                        queue.records.popleft()
+                        self.__n_dropped += 1
+                    else:
+                        while (len(queue.records) >= self.__max_size) and \
+                                (not queue.closed):
+                            queue.not_full.wait()
+
+                if not queue.closed:
+                    if queue.writer is None:
+                        _start_writer(queue)
+                    queue.records.append((write, args))
+                    queue.not_empty.notify()
+                    return
+
+        with queue.write_lock:
+            write(*args)
+
+    def flush(self):
+        """
+        Block until all queued messages have been written and then flush the
+        wrapped logger.
+        """
+        queue = self.__queue
+        with queue.lock:
+            while queue.records or queue.n_in_flight:
+                queue.drained.wait()
+        with queue.write_lock:
+            self.__logger.flush()
+
+    def close(self):
+        """
+        Write all queued messages, stop the writer thread, and close the
+        wrapped logger.
+        """
+        self.__stopper()
+        with _OPEN_LOGGERS_LOCK:
+            _OPEN_LOGGERS.discard(self)
+        with self.__queue.write_lock:
+            self.__logger.close()
+
+    def log(self, caller, msg, level):
+        """
+        Queue the given message for logging if the caller's verbosity level is
+        greater than or equal to the given message's level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        """
+        # Since the use of these functions is setup by developers rather than
+        # users, we can keep the error checking minimal and light.  If
+        # developers use a bad level, they should find out immediately and
+        # easily.
+        assert level in self.__valid
+
+        if self.__logger.level_of(caller) >= level:
+            self.__put(self.__logger.log, caller, msg, level)
+
+    def log_fields(self, caller, msg, level, fields):
+        """
+        Queue the given message and fields for logging if the caller's
+        verbosity level is greater than or equal to the given message's level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        :param fields: ``dict`` of typed values indexed by field name
+        """
+        assert level in self.__valid
+
+        if self.__logger.level_of(caller) >= level:
+            self.__put(self.__logger.log_fields, caller, msg, level, fields)
+
+    def warn(self, caller, msg):
+        """
+        Queue the given warning message for logging regardless of the logger's
+        verbosity level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            warning
+        :param msg: Warning message to log
+        """
+        self.__put(self.__logger.warn, caller, msg)
+
+    def error(self, caller, msg):
+        """
+        Wait for all queued messages to be written and then log the given error
+        message synchronously with the wrapped logger regardless of the
+        logger's verbosity level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            error
+        :param msg: Error message to log
+        """
+        self.flush()
+        with self.__queue.write_lock:
+            self.__logger.error(caller, msg)
+
+    def _write_error(self, caller, msg):
+        self.flush()
+        with self.__queue.write_lock:
+            self.__logger._write_error(caller, msg)
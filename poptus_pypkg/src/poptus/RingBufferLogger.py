@@ -0,0 +1,237 @@
+from numbers import Integral
+
+from ._constants import (
+    LOG_LEVELS, LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT, LOG_LEVEL_MAX,
+    POPTUS_LOG_TAG
+)
+from .AbstractLogger import AbstractLogger
+from .StandardLogger import StandardLogger
+
+
+class RingBufferLogger(AbstractLogger):
+    def __init__(self, logger, capacity, level=LOG_LEVEL_MAX):
+        """
+        A concrete |poptus| logger class that makes full debug information
+        available when errors occur without writing it for healthy runs.
+
+        Messages compatible with the verbosity level of the given logger are
+        passed on to it immediately.  The most recent ``capacity`` messages
+        that are compatible with this logger's level, but not with the given
+        logger's level, are instead held in a preallocated ring buffer so that
+        memory use is bounded regardless of the length of the run.  When an
+        error is logged or when :py:meth:`dump` is called, the buffered
+        messages are written through the given logger between begin and end
+        lines and the buffer is emptied.  Each dumped message is prefixed with
+        the level at which it was logged and is written as a general message,
+        or as a warning if the given logger does not write general messages of
+        its caller, so that no dumped message is dropped.
+
+        Caller levels set for this logger with :py:meth:`set_caller_levels`
+        determine which messages of each caller are buffered while those of
+        the given logger determine which are written.
+
+        Messages are buffered fully formatted so that the dumped history shows
+        the values at the time of logging even for data such as NumPy arrays
+        that are later modified in place.  Copies of the logger made by
+        pickling start with an empty buffer.
+
+        :param logger: Concrete logger object derived from
+            :py:class:`AbstractLogger` that writes messages.  Its level must not
+            be ``LOG_LEVEL_NONE`` so that buffered messages can be written.
+        :param capacity: Maximum number of messages to buffer
+        :param level: Verbosity level of messages to capture, which must be at
+            least the level of the given logger
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        # This error checks level
+        super().__init__(level)
+
+        if not isinstance(logger, AbstractLogger):
+            log_and_abort(TypeError, "Invalid logger type")
+        elif logger.level == LOG_LEVEL_NONE:
+            msg = "Ring buffer logger cannot dump through logger with level "
+            msg += f"{LOG_LEVEL_NONE}"
+            log_and_abort(ValueError, msg)
+        elif level < logger.level:
+            msg = f"Level ({level}) less than that of given logger "
+            msg += f"({logger.level})"
+            log_and_abort(ValueError, msg)
+        elif (not isinstance(capacity, Integral)) or \
+                isinstance(capacity, bool):
+            log_and_abort(TypeError, f"capacity is not an integer ({capacity})")
+        elif capacity <= 0:
+            log_and_abort(ValueError, f"capacity is not positive ({capacity})")
+
+        # LOG_LEVEL_NONE is not an acceptable message level for general logging
+        # as per the documentation in AbstractLogger.
+        self.__valid = set(LOG_LEVELS).difference({LOG_LEVEL_NONE})
+
+        self.__logger = logger
+        self.__capacity = capacity
+
+        # Index of slot into which next message is written and total number of
+        # messages buffered since last dump
+        self.__records = [None] * capacity
+        self.__next = 0
+        self.__n_logged = 0
+
+        logger._add_dependent(self)
+
+    def __getstate__(self):
+        # Copies start with an empty buffer
+        state = super().__getstate__()
+        state["_RingBufferLogger__records"] = [None] * self.__capacity
+        state["_RingBufferLogger__next"] = 0
+        state["_RingBufferLogger__n_logged"] = 0
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.__logger._add_dependent(self)
+
+    @property
+    def logger(self):
+        """
+        :return: Logger that writes messages
+        """
+        return self.__logger
+
+    @property
+    def capacity(self):
+        """
+        :return: Maximum number of messages buffered
+        """
+        return self.__capacity
+
+    @property
+    def n_buffered(self):
+        """
+        :return: Number of messages presently buffered
+        """
+        return min(self.__n_logged, self.__capacity)
+
+    def level_of(self, caller):
+        """
+        :param caller: Name of calling code
+        :return: Largest verbosity level of this and the wrapped logger that
+            applies to messages of the given caller
+        """
+        return max(super().level_of(caller), self.__logger.level_of(caller))
+
+    def __buffer(self, caller, msg, level):
+        self.__records[self.__next] = (caller, msg, level)
+        self.__next += 1
+        if self.__next == self.__capacity:
+            self.__next = 0
+        self.__n_logged += 1
+
+    def __write(self, caller, msg):
+        # Dumps typically precede errors and so must not be dropped by caller
+        # levels of the wrapped logger
+        if self.__logger.level_of(caller) >= LOG_LEVEL_DEFAULT:
+            self.__logger.log(caller, msg, LOG_LEVEL_DEFAULT)
+        else:
+            self.__logger.warn(caller, msg)
+
+    def dump(self):
+        """
+        Write all buffered messages, oldest first, through the wrapped logger
+        and empty the buffer.  This has no effect if no messages are buffered.
+        """
+        n_buffered = self.n_buffered
+        if n_buffered == 0:
+            return
+
+        start = (self.__next - n_buffered) % self.__capacity
+        msg = f"Begin last {n_buffered} of {self.__n_logged} buffered messages"
+        self.__write(POPTUS_LOG_TAG, msg)
+        for i in range(n_buffered):
+            j = (start + i) % self.__capacity
+            caller, msg, level = self.__records[j]
+            self.__write(caller, f"(level {level}) {msg}")
+            self.__records[j] = None
+        self.__write(POPTUS_LOG_TAG, "End of buffered messages")
+
+        self.__next = 0
+        self.__n_logged = 0
+
+    def flush(self):
+        """
+        Flush the wrapped logger.  Buffered messages are not written.
+        """
+        self.__logger.flush()
+
+    def close(self):
+        """
+        Close the wrapped logger.  Buffered messages are discarded.
+        """
+        self.__logger.close()
+
+    def log(self, caller, msg, level):
+        """
+        Pass the given message on to the wrapped logger if compatible with its
+        verbosity level or buffer it if compatible with this logger's level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        """
+        # Since the use of these functions is setup by developers rather than
+        # users, we can keep the error checking minimal and light.  If
+        # developers use a bad level, they should find out immediately and
+        # easily.
+        assert level in self.__valid
+
+        if self.__logger.level_of(caller) >= level:
+            self.__logger.log(caller, msg, level)
+        elif super().level_of(caller) >= level:
+            self.__buffer(caller, msg, level)
+
+    def log_fields(self, caller, msg, level, fields):
+        """
+        Pass the given message and fields on to the wrapped logger if
+        compatible with its verbosity level or buffer them formatted as
+        ``key=value`` if compatible with this logger's level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        :param fields: ``dict`` of typed values indexed by field name
+        """
+        assert level in self.__valid
+
+        if self.__logger.level_of(caller) >= level:
+            self.__logger.log_fields(caller, msg, level, fields)
+        elif super().level_of(caller) >= level:
+            super().log_fields(caller, msg, level, fields)
+
+    def warn(self, caller, msg):
+        """
+        Pass the given warning message on to the wrapped logger.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            warning
+        :param msg: Warning message to log
+        """
+        self.__logger.warn(caller, msg)
+
+    def error(self, caller, msg):
+        """
+        Write all buffered messages through the wrapped logger and then pass
+        the given error message on to it.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            error
+        :param msg: Error message to log
+        """
+        self.dump()
+        self.__logger.error(caller, msg)
+
+    def _write_error(self, caller, msg):
+        self.dump()
+        self.__logger._write_error(caller, msg)
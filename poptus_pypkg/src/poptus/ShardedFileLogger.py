@@ -0,0 +1,210 @@
+import os
+import sys
+import time
+import atexit
+import itertools
+import threading
+
+from pathlib import Path
+
+from ._constants import (
+    LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT,
+    POPTUS_LOG_TAG
+)
+from .FileLogger import FileLogger
+from .StandardLogger import StandardLogger
+
+# Each process writes to its own shard named after the merged log file and the
+# process's ID
+SHARD_SUFFIX = ".shard"
+
+# Shards open in this process indexed by name of merged log file.  All sharded
+# loggers in a process that write to the same merged log file share a single
+# shard so that records are not interleaved and so that loggers passed to child
+# processes by pickling need not carry open file handles.
+_SHARDS = {}
+
+# ID of the process, if any, in which shards are closed on exit by
+# multiprocessing
+_FINALIZED_PID = None
+
+
+class _Shard:
+    def __init__(self, filename, buffer_size):
+        self.filename = Path(f"{filename}.{os.getpid()}{SHARD_SUFFIX}")
+        self.buffer_size = buffer_size
+        self.sequence = itertools.count()
+        self.fptr = None
+        self.lock = threading.Lock()
+
+    def write(self, text):
+        # The timestamp and sequence number are taken together with the lock
+        # held so that threads cannot get them in opposite orders
+        with self.lock:
+            record = f"{time.monotonic_ns()} {next(self.sequence)} {text}\n"
+            if self.buffer_size is None:
+                with open(self.filename, "a") as fptr:
+                    fptr.write(record)
+            else:
+                if self.fptr is None:
+                    self.fptr = open(self.filename, "a",
+                                     buffering=self.buffer_size)
+                self.fptr.write(record)
+
+    def flush(self):
+        with self.lock:
+            if self.fptr is not None:
+                self.fptr.flush()
+
+    def close(self):
+        with self.lock:
+            if self.fptr is not None:
+                self.fptr.close()
+                self.fptr = None
+
+
+def _flush_shards():
+    for shard in list(_SHARDS.values()):
+        shard.flush()
+
+
+def _close_shards():
+    for shard in list(_SHARDS.values()):
+        shard.close()
+
+
+def _reset_shards():
+    # Buffers were flushed before forking so that the child can close its
+    # copies of the parent's shards without duplicating buffered records.  The
+    # locks might have been held by threads that do not exist in the child.
+    for shard in list(_SHARDS.values()):
+        shard.lock = threading.Lock()
+    _close_shards()
+    _SHARDS.clear()
+
+
+def _close_at_process_exit():
+    # multiprocessing ends its child processes without running atexit
+    # handlers, but it does run its own finalizers.
+    global _FINALIZED_PID
+
+    mp_util = sys.modules.get("multiprocessing.util")
+    if (mp_util is not None) and (_FINALIZED_PID != os.getpid()):
+        mp_util.Finalize(None, _close_shards, exitpriority=0)
+        _FINALIZED_PID = os.getpid()
+
+
+atexit.register(_close_shards)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_flush_shards, after_in_child=_reset_shards)
+
+
+def shard_filenames(filename):
+    """
+    :param filename: Name and path of merged log file
+    :return: ``dict`` that maps the ID of each process that wrote a shard of
+        the given log file to the name and path of its shard
+    """
+    filename = Path(filename).resolve()
+
+    shards = {}
+    for path in filename.parent.glob(f"{filename.name}.*{SHARD_SUFFIX}"):
+        pid = path.name[len(filename.name) + 1:-len(SHARD_SUFFIX)]
+        if pid.isdigit():
+            shards[int(pid)] = path
+    return shards
+
+
+class ShardedFileLogger(FileLogger):
+    def __init__(self, filename, overwrite, level=LOG_LEVEL_DEFAULT,
+                 buffer_size=None):
+        """
+        A concrete |poptus| file logger class that can be used safely by
+        multiple processes at the same time.  Rather than writing to the given
+        file, each process writes to its own shard file named
+        ``<filename>.<pid>.shard``.  Each record in a shard is written with its
+        sequence number in the process and a monotonic timestamp so that the
+        shards can be merged into the given file in order with
+        :py:func:`merge_log_shards`.
+
+        Loggers can be passed to child processes by forking or by pickling.
+        Child processes open their own shard when they first log a message.
+        All sharded loggers in a process that write to the same file share the
+        same shard.  Note that the monotonic clock used for ordering is only
+        comparable across processes running on the same host.
+
+        :param level: Verbosity level of the logger
+        :param filename: Name and path of merged log file
+        :param overwrite: If the merged log file or any of its shards already
+            exist, then they are removed if ``True`` or an error is raised if
+            ``False``.
+        :param buffer_size: ``None`` or the size in bytes of the write buffer
+            of each process's persistent shard file handle.  See
+            :py:class:`FileLogger`.
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        # This error checks all arguments
+        super().__init__(filename, overwrite, level, buffer_size)
+
+        # Start a new shard in this process, which also applies the given
+        # buffer size
+        self.__key = str(self.filename)
+        shard = _SHARDS.pop(self.__key, None)
+        if shard is not None:
+            shard.close()
+
+        shards = shard_filenames(self.filename)
+        if shards:
+            if not overwrite:
+                log_and_abort(RuntimeError, f"{self.filename} shards exist")
+            StandardLogger(LOG_LEVEL_NONE).warn(
+                POPTUS_LOG_TAG, f"Overwriting {self.filename} shards"
+            )
+            for path in shards.values():
+                os.remove(path)
+
+    def __shard(self):
+        shard = _SHARDS.get(self.__key)
+        if shard is None:
+            # Threads that log their first message at the same time share the
+            # shard inserted first
+            shard = _SHARDS.setdefault(self.__key,
+                                       _Shard(self.__key, self.buffer_size))
+            _close_at_process_exit()
+        return shard
+
+    @property
+    def shard_filename(self):
+        """
+        :return: Name including path of the shard file to which the calling
+            process writes
+        """
+        return Path(f"{self.filename}.{os.getpid()}{SHARD_SUFFIX}")
+
+    def _write(self, line):
+        # Records are written on a single line with newlines and backslashes
+        # in the message escaped.
+        text = line[:-1].replace("\\", "\\\\").replace("\n", "\\n")
+        self.__shard().write(text)
+
+    def flush(self):
+        """
+        Write all of the calling process's buffered messages to its shard.
+        This has no effect if the logger does not buffer messages.
+        """
+        shard = _SHARDS.get(self.__key)
+        if shard is not None:
+            shard.flush()
+
+    def close(self):
+        """
+        Flush all buffered messages and close the calling process's persistent
+        shard file handle if open.  Messages logged after closing the logger
+        are still written, with the shard reopened as needed.
+        """
+        shard = _SHARDS.get(self.__key)
+        if shard is not None:
+            shard.close()
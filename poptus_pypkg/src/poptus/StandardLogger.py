@@ -1,30 +1,215 @@
+import os
 import sys
+import atexit
+import weakref
+import threading
+
+from numbers import Integral, Real
 
 from ._constants import (
-    LOG_LEVELS, LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT
+    LOG_LEVELS, LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT,
+    POPTUS_LOG_TAG
 )
 from .AbstractLogger import AbstractLogger
 
+# Buffered standard loggers, which are flushed at exit so that no buffered
+# messages are lost.  Weak references are used so that this does not keep alive
+# loggers that are no longer in use.
+_BUFFERED_LOGGERS = weakref.WeakSet()
+
+# ID of the process, if any, in which buffered loggers are flushed on exit by
+# multiprocessing
+_FINALIZED_PID = None
+
+
+def _flush_buffered_loggers():
+    for logger in list(_BUFFERED_LOGGERS):
+        logger.flush()
+
+
+def _reset_buffered_loggers():
+    for logger in list(_BUFFERED_LOGGERS):
+        logger._after_fork_in_child()
+
+
+def _flush_at_process_exit():
+    # multiprocessing ends its child processes without running atexit
+    # handlers, but it does run its own finalizers.
+    global _FINALIZED_PID
+
+    mp_util = sys.modules.get("multiprocessing.util")
+    if (mp_util is not None) and (_FINALIZED_PID != os.getpid()):
+        mp_util.Finalize(None, _flush_buffered_loggers, exitpriority=0)
+        _FINALIZED_PID = os.getpid()
+
+
+# Gathered messages are written before forking so that they are neither lost
+# nor written again by the child.
+atexit.register(_flush_buffered_loggers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_flush_buffered_loggers,
+                        after_in_child=_reset_buffered_loggers)
+
 
 class StandardLogger(AbstractLogger):
-    def __init__(self, level=LOG_LEVEL_DEFAULT):
+    def __init__(self, level=LOG_LEVEL_DEFAULT, buffer_size=None,
+                 flush_interval=None):
         """
         A concrete |poptus| logger class that is "standard" in the sense that
         many |poptus| applications and users might choose to use this directly
         and because logging is done using standard output and error.
 
+        By default, each message is written to ``stdout`` as soon as it is
+        logged.  If a buffer size is given, messages are instead gathered and
+        written to ``stdout`` with a single write, which is then flushed, once
+        the given number of characters have been gathered, once the oldest
+        gathered message is older than the given flush interval, or when a
+        warning or error is logged.  This can greatly decrease the cost of
+        logging many messages to Jupyter notebooks or to piped output.  The
+        flush interval is enforced by a daemon timer thread started when the
+        first message is gathered so that messages are written on time even if
+        no further messages are logged.
+        Gathered messages are also written when the logger is flushed or
+        closed, which happens automatically at exit, and before the process
+        forks.  Copies of the logger made by pickling do not include gathered
+        messages.
+
+        In all cases, ``stdout`` is flushed before writing an error message to
+        ``stderr`` so that error messages appear after all earlier messages.
+
         :param level: Verbosity level of the logger
+        :param buffer_size: ``None`` or the number of characters to gather
+            before writing
+        :param flush_interval: ``None`` or the maximum time in seconds between
+            logging a message and writing it.  This can only be given with a
+            buffer size.
         """
+        def log_and_abort(my_exception, msg):
+            # Do not assume that this logger can be used yet.  Mimic error
+            # logging of this class.
+            sys.stderr.write(f"[{POPTUS_LOG_TAG}] ERROR - {msg}\n")
+            sys.stderr.flush()
+            raise my_exception(msg)
+
         # This error checks level
         super().__init__(level)
 
+        if buffer_size is not None:
+            if (not isinstance(buffer_size, Integral)) or \
+                    isinstance(buffer_size, bool):
+                msg = f"buffer_size is not an integer ({buffer_size})"
+                log_and_abort(TypeError, msg)
+            elif buffer_size <= 0:
+                msg = f"buffer_size is not positive ({buffer_size})"
+                log_and_abort(ValueError, msg)
+        if flush_interval is not None:
+            if (not isinstance(flush_interval, Real)) or \
+                    isinstance(flush_interval, bool):
+                msg = f"flush_interval is not a number ({flush_interval})"
+                log_and_abort(TypeError, msg)
+            elif flush_interval <= 0:
+                msg = f"flush_interval is not positive ({flush_interval})"
+                log_and_abort(ValueError, msg)
+            elif buffer_size is None:
+                log_and_abort(ValueError, "flush_interval requires buffer_size")
+
         # LOG_LEVEL_NONE is not an acceptable message level for general logging
         # as per the documentation in AbstractLogger.
         self.__valid = set(LOG_LEVELS).difference({LOG_LEVEL_NONE})
 
+        self.__buffer_size = buffer_size
+        self.__flush_interval = flush_interval
+
+        # Gathered lines, their total length, and the timer, if any, that
+        # writes them once the flush interval has passed.  Gathering is only
+        # locked if there is a timer, which writes from its own thread, since
+        # locking is costly compared to gathering.
+        self.__lines = []
+        self.__n_chars = 0
+        self.__timer = None
+        self.__lock = threading.Lock()
+
+        if buffer_size is not None:
+            _BUFFERED_LOGGERS.add(self)
+
+    def __getstate__(self):
+        # Copies do not take the messages gathered by this logger
+        state = super().__getstate__()
+        state["_StandardLogger__lines"] = []
+        state["_StandardLogger__n_chars"] = 0
+        state["_StandardLogger__timer"] = None
+        del state["_StandardLogger__lock"]
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.__lock = threading.Lock()
+        if self.__buffer_size is not None:
+            _BUFFERED_LOGGERS.add(self)
+
+    def _after_fork_in_child(self):
+        # Messages gathered by other threads while forking belong to the
+        # parent.  Neither its timer nor a lock held by another thread carry
+        # over to the child.
+        self.__lines.clear()
+        self.__n_chars = 0
+        self.__timer = None
+        self.__lock = threading.Lock()
+
+    @property
+    def buffer_size(self):
+        """
+        :return: ``None`` if messages are written when logged; otherwise, the
+            number of characters gathered before writing
+        """
+        return self.__buffer_size
+
+    @property
+    def flush_interval(self):
+        """
+        :return: ``None`` or the maximum time in seconds between logging a
+            message and writing it
+        """
+        return self.__flush_interval
+
+    def __gather(self, line):
+        if not self.__lines:
+            _flush_at_process_exit()
+            if self.__flush_interval is not None:
+                self.__timer = threading.Timer(self.__flush_interval,
+                                               self.flush)
+                self.__timer.name = "poptus-StandardLogger"
+                self.__timer.daemon = True
+                self.__timer.start()
+        self.__lines.append(line)
+        self.__n_chars += len(line)
+
+        if self.__n_chars >= self.__buffer_size:
+            self.__write()
+            sys.stdout.flush()
+
+    def __write(self):
+        # Must be called with the lock held if there is a flush interval
+        if self.__lines:
+            sys.stdout.write("".join(self.__lines))
+            self.__lines.clear()
+            self.__n_chars = 0
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+
+    def flush(self):
+        """
+        Write all gathered messages to ``stdout`` with a single write and flush
+        ``stdout``.
+        """
+        with self.__lock:
+            self.__write()
+        sys.stdout.flush()
+
     def log(self, caller, msg, level):
         """
-        Print the given message to ``stdout`` if the logger's verbosity level
+        Print the given message to ``stdout`` if the caller's verbosity level
         is greater than or equal to the given message's level.
 
         :param caller: Name of calling code for inclusion in actual logged
@@ -38,30 +223,50 @@ class StandardLogger(AbstractLogger):
         # easily.
         assert level in self.__valid
 
-        if self.level >= level:
-            sys.stdout.write(f"[{caller}] {msg}\n")
+        if self.level_of(caller) >= level:
+            if self.__buffer_size is None:
+                sys.stdout.write(f"[{caller}] {msg}\n")
+            elif self.__flush_interval is None:
+                self.__gather(f"[{caller}] {msg}\n")
+            else:
+                with self.__lock:
+                    self.__gather(f"[{caller}] {msg}\n")
 
     def warn(self, caller, msg):
         """
         Print the given message to ``stdout`` in such a way that it is clear
         that it is transmitting a warning message to users.  This is printed
-        regardless of the logger's verbosity level.
+        regardless of the logger's verbosity level.  If messages are gathered,
+        the warning is written with all gathered messages immediately.
 
         :param caller: Name of calling code for inclusion in actual logged
             warning
         :param msg: Warning message to log
         """
-        sys.stdout.write(f"[{caller}] WARNING - {msg}\n")
+        if self.__buffer_size is None:
+            sys.stdout.write(f"[{caller}] WARNING - {msg}\n")
+        else:
+            with self.__lock:
+                self.__lines.append(f"[{caller}] WARNING - {msg}\n")
+                self.__write()
+            sys.stdout.flush()
 
     def error(self, caller, msg):
         """
         Print the given message to ``stderr`` in such a way that it is clear
         that it is transmitting an error message to users.  This is printed
-        regardless of the logger's verbosity level.
+        regardless of the logger's verbosity level.  All earlier messages are
+        written to ``stdout`` first.
 
         :param caller: Name of calling code for inclusion in actual logged
             error
         :param msg: Error message to log
         """
+        self.flush()
         sys.stderr.write(f"[{caller}] ERROR - {msg}\n")
         sys.stderr.flush()
+
+    def _write_error(self, caller, msg):
+        # Errors are only printed to stderr and so only earlier messages are
+        # written
+        self.flush()
@@ -0,0 +1,302 @@
+import os
+import heapq
+import atexit
+import weakref
+import itertools
+import threading
+
+from numbers import Integral
+
+from ._constants import (
+    LOG_LEVELS, LOG_LEVEL_NONE,
+    POPTUS_LOG_TAG
+)
+from .AbstractLogger import AbstractLogger
+from .StandardLogger import StandardLogger
+
+# Thread-buffered loggers whose buffered records are written at exit
+_OPEN_LOGGERS = weakref.WeakSet()
+
+
+def _flush_open_loggers():
+    for logger in list(_OPEN_LOGGERS):
+        logger.flush()
+
+
+def _reset_open_loggers():
+    for logger in list(_OPEN_LOGGERS):
+        logger._after_fork_in_child()
+
+
+atexit.register(_flush_open_loggers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_open_loggers)
+
+
+class _ThreadBuffer:
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.records = []
+        self.lock = threading.Lock()
+
+
+class ThreadBufferedLogger(AbstractLogger):
+    def __init__(self, logger, max_records=1024):
+        """
+        A concrete |poptus| logger class that can be shared safely by many
+        threads (|eg| threads evaluating models in a
+        ``concurrent.futures.ThreadPoolExecutor``) without serializing them.
+
+        Each thread appends its log and warning messages to its own buffer
+        along with a sequence number that orders all messages logged by all
+        threads.  Each buffer is protected by its own lock, which is only
+        contended while buffers are merged.  When a thread's buffer holds
+        ``max_records`` messages or when the logger is flushed, the buffers of
+        all threads are emptied at once and their messages written to the
+        given logger by a single thread in sequence order so that messages are
+        neither interleaved nor torn.
+
+        Error messages are logged synchronously by the calling thread once all
+        buffered messages have been written.  Buffered messages are written
+        when the logger is flushed or closed and at exit.  Copies of the logger
+        made by pickling or forking start with empty buffers.
+
+        :param logger: Concrete logger object derived from
+            :py:class:`AbstractLogger` that writes the buffered messages.  The
+            verbosity level and caller levels of this logger are also those of
+            the thread-buffered logger.
+        :param max_records: Maximum number of messages buffered by each thread
+        """
+        def log_and_abort(my_exception, msg):
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+            raise my_exception(msg)
+
+        if not isinstance(logger, AbstractLogger):
+            log_and_abort(TypeError, "Invalid logger type")
+        elif (not isinstance(max_records, Integral)) or \
+                isinstance(max_records, bool):
+            msg = f"max_records is not an integer ({max_records})"
+            log_and_abort(TypeError, msg)
+        elif max_records <= 0:
+            msg = f"max_records is not positive ({max_records})"
+            log_and_abort(ValueError, msg)
+
+        super().__init__(logger.level)
+
+        # LOG_LEVEL_NONE is not an acceptable message level for general logging
+        # as per the documentation in AbstractLogger.
+        self.__valid = set(LOG_LEVELS).difference({LOG_LEVEL_NONE})
+
+        self.__logger = logger
+        self.__max_records = max_records
+
+        # The sequence counter is shared by all threads.  The buffers of all
+        # threads that have logged are kept so that they can be merged.  The
+        # write lock serializes merging and the use of the wrapped logger.
+        self.__sequence = itertools.count()
+        self.__reset()
+
+        logger._add_dependent(self)
+        _OPEN_LOGGERS.add(self)
+
+    def __reset(self):
+        self.__local = threading.local()
+        self.__buffers = []
+        self.__buffers_lock = threading.Lock()
+        self.__write_lock = threading.RLock()
+
+    def __reduce__(self):
+        return (type(self), (self.__logger, self.__max_records))
+
+    def _after_fork_in_child(self):
+        # Buffered messages are written by the parent and the locks might have
+        # been held by threads that do not exist in the child
+        self.__reset()
+
+    @property
+    def logger(self):
+        """
+        :return: Logger that writes the buffered messages
+        """
+        return self.__logger
+
+    @property
+    def max_records(self):
+        """
+        :return: Maximum number of messages buffered by each thread
+        """
+        return self.__max_records
+
+    @property
+    def level(self):
+        """
+        :return: Verbosity level of the wrapped logger
+        """
+        return self.__logger.level
+
+    @level.setter
+    def level(self, level):
+        """
+        Set the verbosity level of the wrapped logger.
+
+        :param level: New verbosity level
+        """
+        self.__logger.level = level
+
+    @property
+    def caller_levels(self):
+        """
+        :return: ``dict`` of verbosity levels set for callers in the wrapped
+            logger indexed by caller name
+        """
+        return self.__logger.caller_levels
+
+    def set_caller_levels(self, levels):
+        """
+        Set the verbosity levels of individual callers in the wrapped logger.
+        See :py:meth:`AbstractLogger.set_caller_levels`.
+
+        :param levels: ``dict`` of verbosity levels indexed by caller name
+        """
+        self.__logger.set_caller_levels(levels)
+
+    def level_of(self, caller):
+        """
+        :param caller: Name of calling code
+        :return: Verbosity level that the wrapped logger applies to messages of
+            the given caller
+        """
+        return self.__logger.level_of(caller)
+
+    def __buffer(self):
+        try:
+            return self.__local.buffer
+        except AttributeError:
+            buffer = _ThreadBuffer()
+            self.__local.buffer = buffer
+            with self.__buffers_lock:
+                self.__buffers.append(buffer)
+            return buffer
+
+    def __put(self, write, *args):
+        buffer = self.__buffer()
+        with buffer.lock:
+            # Numbering and appending under the thread's lock ensures that each
+            # merge takes all messages numbered before it starts.
+            buffer.records.append((next(self.__sequence), write, args))
+            is_full = (len(buffer.records) >= self.__max_records)
+        if is_full:
+            self.__merge()
+
+    def __merge(self):
+        with self.__write_lock:
+            with self.__buffers_lock:
+                buffers = list(self.__buffers)
+
+            # Hold the locks of all buffers at once so that no thread can add a
+            # message numbered before one already taken.
+            for buffer in buffers:
+                buffer.lock.acquire()
+            try:
+                batches = []
+                for buffer in buffers:
+                    if buffer.records:
+                        batches.append(buffer.records)
+                        buffer.records = []
+            finally:
+                for buffer in buffers:
+                    buffer.lock.release()
+
+            # Forget buffers of threads that have ended
+            with self.__buffers_lock:
+                self.__buffers = [
+                    e for e in self.__buffers
+                    if e.records or e.thread.is_alive()
+                ]
+
+            for _, write, args in heapq.merge(*batches,
+                                              key=lambda e: e[0]):
+                write(*args)
+
+    def flush(self):
+        """
+        Write the messages buffered by all threads and then flush the wrapped
+        logger.
+        """
+        with self.__write_lock:
+            self.__merge()
+            self.__logger.flush()
+
+    def close(self):
+        """
+        Write the messages buffered by all threads and then close the wrapped
+        logger.  Messages logged after closing the logger are still buffered.
+        """
+        with self.__write_lock:
+            self.__merge()
+            self.__logger.close()
+
+    def log(self, caller, msg, level):
+        """
+        Buffer the given message for logging if the caller's verbosity level is
+        greater than or equal to the given message's level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        """
+        # Since the use of these functions is setup by developers rather than
+        # users, we can keep the error checking minimal and light.  If
+        # developers use a bad level, they should find out immediately and
+        # easily.
+        assert level in self.__valid
+
+        if self.__logger.level_of(caller) >= level:
+            self.__put(self.__logger.log, caller, msg, level)
+
+    def log_fields(self, caller, msg, level, fields):
+        """
+        Buffer the given message and fields for logging if the caller's
+        verbosity level is greater than or equal to the given message's level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            message
+        :param msg: Message to potentially log
+        :param level: Message's log level
+        :param fields: ``dict`` of typed values indexed by field name
+        """
+        assert level in self.__valid
+
+        if self.__logger.level_of(caller) >= level:
+            self.__put(self.__logger.log_fields, caller, msg, level, fields)
+
+    def warn(self, caller, msg):
+        """
+        Buffer the given warning message for logging regardless of the
+        logger's verbosity level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            warning
+        :param msg: Warning message to log
+        """
+        self.__put(self.__logger.warn, caller, msg)
+
+    def error(self, caller, msg):
+        """
+        Write the messages buffered by all threads and then log the given error
+        message synchronously with the wrapped logger regardless of the
+        logger's verbosity level.
+
+        :param caller: Name of calling code for inclusion in actual logged
+            error
+        :param msg: Error message to log
+        """
+        with self.__write_lock:
+            self.__merge()
+            self.__logger.error(caller, msg)
+
+    def _write_error(self, caller, msg):
+        with self.__write_lock:
+            self.__merge()
+            self.__logger._write_error(caller, msg)
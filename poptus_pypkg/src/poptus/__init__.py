@@ -3,26 +3,90 @@ POptUS --- a Python package that collects infrastructure and common code that
 could be used by other Python packages within the POptUS universe.
 """
 
-from importlib.metadata import version
-
-__version__ = version("poptus")
+import sys
+import types
+import importlib
 
 # Constant module data attributes
 from ._constants import (
     LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT,
     LOG_LEVEL_MIN_DEBUG, LOG_LEVEL_MAX,
-    LOG_LEVELS
+    LOG_LEVELS,
+    LOG_RECORD_LOG, LOG_RECORD_WARNING, LOG_RECORD_ERROR,
+    LOG_FORMAT_TEXT, LOG_FORMAT_JSON_LINES, LOG_FORMAT_BINARY, LOG_FORMATS,
+    LOG_COMPRESSION_GZIP, LOG_COMPRESSION_LZMA, LOG_COMPRESSIONS,
+    QUEUE_POLICY_BLOCK, QUEUE_POLICY_DROP_OLDEST, QUEUE_POLICY_DROP_NEW,
+    QUEUE_POLICIES
 )
 
 from .AbstractLogger import AbstractLogger
 from .StandardLogger import StandardLogger
 from .FileLogger import FileLogger
+from .ShardedFileLogger import ShardedFileLogger
+from .JsonLinesLogger import JsonLinesLogger
+from .BinaryLogger import BinaryLogger
+from .MappedFileLogger import MappedFileLogger
+from .FanOutLogger import FanOutLogger
+from .QueueLogger import QueueLogger
+from .RingBufferLogger import RingBufferLogger
+from .DeduplicatingLogger import DeduplicatingLogger
+from .ThreadBufferedLogger import ThreadBufferedLogger
+from .LogFunctions import LogFunctions
+from .LevelFileWatcher import LevelFileWatcher
+from .MetricsRegistry import MetricsRegistry
 from .create_logger import create_logger
 from .create_log_functions import create_log_functions
+from .merge_log_shards import merge_log_shards
+from .read_json_lines_log import read_json_lines_log
+from .decode_binary_log import decode_binary_log
+from .recover_mapped_log import recover_mapped_log
+from .install_level_signal_handlers import install_level_signal_handlers
+
+# Attributes whose modules are imported only when first accessed so that
+# importing the package for logging alone is fast, indexed by attribute name.
+# In particular, processes that only log should not pay for importing unittest,
+# importlib.metadata, asyncio, or the optional NumPy dependence.
+_LAZY_ATTRIBUTES = {
+    "AsyncLogger": ".AsyncLogger",
+    "HistoryRecorder": ".HistoryRecorder",
+    # ----- Python unittest-based test framework
+    # Used for automatic test discovery
+    "load_tests": ".load_tests",
+    # Allow users to run full test suite as poptus.test()
+    "test": ".test",
+    # Allow users and developers to measure the cost of logging
+    "benchmark": ".benchmark",
+    "compare_benchmarks": ".compare_benchmarks"
+}
+
+
+def __getattr__(name):
+    if name == "__version__":
+        from importlib.metadata import version
+        value = version("poptus")
+    elif name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Cache so that this is not called again for the attribute
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()).union(_LAZY_ATTRIBUTES, {"__version__"}))
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a lazily loaded submodule (e.g., poptus.benchmark) binds
+        # the submodule to the package under the name of its function, which
+        # would hide the function.
+        if (name in _LAZY_ATTRIBUTES) and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
 
-# ----- Python unittest-based test framework
-# Used for automatic test discovery
-from .load_tests import load_tests
 
-# Allow users to run full test suite as poptus.test()
-from .test import test
+sys.modules[__name__].__class__ = _Package
@@ -0,0 +1,52 @@
+"""
+Command line interface for running and comparing the POptUS benchmarks via
+
+        python -m poptus benchmark [-o results.json]
+        python -m poptus compare baseline.json current.json [--tolerance 0.1]
+
+Comparisons exit with status one if any case regressed.
+"""
+
+import sys
+import argparse
+
+from .benchmark import benchmark
+from .compare_benchmarks import compare_benchmarks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m poptus",
+        description="Run and compare POptUS logging benchmarks"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("benchmark", help="Run the benchmarks")
+    run.add_argument("-o", "--output", default=None,
+                     help="JSON file to which results are written")
+    run.add_argument("--number", type=int, default=10000,
+                     help="Number of calls per thread per measurement")
+    run.add_argument("--repeat", type=int, default=5,
+                     help="Number of measurements per case")
+    run.add_argument("--threads", type=int, default=4,
+                     help="Number of threads for multithreaded cases")
+
+    compare = commands.add_parser("compare",
+                                  help="Flag regressions between two runs")
+    compare.add_argument("baseline", help="JSON file of baseline results")
+    compare.add_argument("current", help="JSON file of current results")
+    compare.add_argument("--tolerance", type=float, default=0.1,
+                         help="Relative cost increase flagged as regression")
+
+    args = parser.parse_args(argv)
+    if args.command == "benchmark":
+        benchmark(args.output, args.number, args.repeat, args.threads)
+        return 0
+
+    regressions = compare_benchmarks(args.baseline, args.current,
+                                     args.tolerance)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,11 +8,60 @@ LOG_LEVEL_MAX = 4
 
 LOG_LEVELS = list(range(LOG_LEVEL_NONE, LOG_LEVEL_MAX+1))
 
+# Types of records written by structured loggers
+LOG_RECORD_LOG = "LOG"
+LOG_RECORD_WARNING = "WARNING"
+LOG_RECORD_ERROR = "ERROR"
+
+# Formats in which file loggers can write records
+LOG_FORMAT_TEXT = "Text"
+LOG_FORMAT_JSON_LINES = "JSONLines"
+LOG_FORMAT_BINARY = "Binary"
+
+LOG_FORMATS = [LOG_FORMAT_TEXT, LOG_FORMAT_JSON_LINES, LOG_FORMAT_BINARY]
+
+# Algorithms with which file loggers can compress rotated log files
+LOG_COMPRESSION_GZIP = "gzip"
+LOG_COMPRESSION_LZMA = "lzma"
+
+LOG_COMPRESSIONS = [LOG_COMPRESSION_GZIP, LOG_COMPRESSION_LZMA]
+
+# Actions taken by QueueLogger when a message is logged with a full queue
+QUEUE_POLICY_BLOCK = "Block"
+QUEUE_POLICY_DROP_OLDEST = "DropOldest"
+QUEUE_POLICY_DROP_NEW = "DropNew"
+
+QUEUE_POLICIES = [
+    QUEUE_POLICY_BLOCK, QUEUE_POLICY_DROP_OLDEST, QUEUE_POLICY_DROP_NEW
+]
+
 # -- private interface
 # Logger log tag to use for logging errors detected while constructing loggers
 POPTUS_LOG_TAG = "POptUS"
 
 # Keys associated with logger configuration dict
 LOG_LEVEL_KEY = "Level"
+LOG_SINKS_KEY = "Sinks"
+LOG_CALLER_LEVELS_KEY = "CallerLevels"
 LOG_FILENAME_KEY = "Filename"
 LOG_OVERWRITE_KEY = "Overwrite"
+LOG_BUFFER_SIZE_KEY = "BufferSize"
+LOG_FLUSH_INTERVAL_KEY = "FlushInterval"
+LOG_SHARDED_KEY = "Sharded"
+LOG_FORMAT_KEY = "Format"
+LOG_MAX_BYTES_KEY = "MaxBytes"
+LOG_MAX_AGE_KEY = "MaxAge"
+LOG_KEEP_KEY = "Keep"
+LOG_COMPRESSION_KEY = "Compression"
+
+# Binary log file layout.  Files start with the magic bytes followed by
+# records, each of which is a fixed-layout little-endian header
+#     (level/type byte, caller ID, time in ns since epoch, payload length)
+# followed by the UTF-8 encoded payload.  Records with the LOG_LEVEL_NONE
+# type byte define the name, given as payload, of the caller with the given
+# ID.  Warnings and errors use dedicated type bytes.
+BINARY_LOG_MAGIC = b"POPTUSB1"
+BINARY_LOG_HEADER = "<BHQI"
+BINARY_LOG_CALLER = LOG_LEVEL_NONE
+BINARY_LOG_WARNING = 0xFE
+BINARY_LOG_ERROR = 0xFF
@@ -0,0 +1,256 @@
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import threading
+import subprocess
+
+from pathlib import Path
+from numbers import Integral
+from contextlib import redirect_stdout
+
+from ._constants import (
+    LOG_LEVEL_NONE, LOG_LEVEL_DEFAULT, LOG_LEVEL_MIN_DEBUG,
+    POPTUS_LOG_TAG
+)
+from .StandardLogger import StandardLogger
+from .FileLogger import FileLogger
+from .BinaryLogger import BinaryLogger
+from .MappedFileLogger import MappedFileLogger
+from .MetricsRegistry import MetricsRegistry
+from .create_log_functions import create_log_functions
+
+_SHORT_MSG = "Iteration 42 accepted"
+_LONG_MSG = 40 * "Long message with many characters. "
+_CALLER = "Benchmark"
+
+
+def _enter_span(functions, level):
+    with functions.span(_CALLER, level):
+        pass
+
+
+def _log_debug_eager(functions, level, value, x):
+    # Messages built with f-strings are formatted even if suppressed, which is
+    # the cost that deferred arguments and callables avoid
+    functions.log_debug(f"Value = {value} at {x}", level)
+
+
+def _log_debug_callable(functions, level, value, x):
+    functions.log_debug(lambda: f"Value = {value} at {x}", level)
+
+
+def _cases(tmp_dir):
+    # Each case is (name, callable, arguments).  Standard loggers write to
+    # stdout, which is redirected to the null device while benchmarking.  The
+    # file loggers include those suited to tracing at high verbosity levels,
+    # of which only the unbuffered, line-buffered, and memory-mapped loggers
+    # lose no messages if the process crashes.
+    DEFAULT = LOG_LEVEL_DEFAULT
+    DEBUG = LOG_LEVEL_MIN_DEBUG
+    BUFFER_SIZE = 64 * 1024
+
+    loggers = {
+        "StandardLogger": StandardLogger(DEFAULT),
+        "FileLogger": FileLogger(tmp_dir.joinpath("unbuffered.log"), False,
+                                 DEFAULT),
+        "FileLogger(line buffered)": FileLogger(
+            tmp_dir.joinpath("line_buffered.log"), False, DEFAULT,
+            buffer_size=1
+        ),
+        "FileLogger(buffered)": FileLogger(tmp_dir.joinpath("buffered.log"),
+                                           False, DEFAULT,
+                                           buffer_size=BUFFER_SIZE),
+        "BinaryLogger(buffered)": BinaryLogger(
+            tmp_dir.joinpath("binary.log"), False, DEFAULT,
+            buffer_size=BUFFER_SIZE
+        ),
+        "MappedFileLogger": MappedFileLogger(tmp_dir.joinpath("mapped.log"),
+                                             False, DEFAULT)
+    }
+
+    cases = []
+    for name, logger in loggers.items():
+        cases += [
+            (f"{name}.log enabled short", logger.log,
+             (_CALLER, _SHORT_MSG, DEFAULT)),
+            (f"{name}.log enabled long", logger.log,
+             (_CALLER, _LONG_MSG, DEFAULT)),
+            (f"{name}.log suppressed short", logger.log,
+             (_CALLER, _SHORT_MSG, DEBUG))
+        ]
+
+    functions = create_log_functions(loggers["StandardLogger"], _CALLER)
+    value = 1.2345
+    x = [float(i) for i in range(100)]
+    cases += [
+        ("log enabled short", functions.log, (_SHORT_MSG,)),
+        ("log enabled long", functions.log, (_LONG_MSG,)),
+        ("log enabled deferred", functions.log,
+         ("Value = {} at {}", value, x)),
+        ("log_debug suppressed short", functions.log_debug,
+         (_SHORT_MSG, DEBUG)),
+        ("log_debug suppressed long", functions.log_debug,
+         (_LONG_MSG, DEBUG)),
+        ("log_debug suppressed deferred", functions.log_debug,
+         ("Value = {} at {}", DEBUG, value, x)),
+        ("log_debug suppressed eager", _log_debug_eager,
+         (functions, DEBUG, value, x)),
+        ("log_debug suppressed callable", _log_debug_callable,
+         (functions, DEBUG, value, x)),
+        ("span suppressed", _enter_span, (functions, DEBUG)),
+        ("log_array enabled", functions.log_array, ("x", x, DEFAULT)),
+        ("log_array suppressed", functions.log_array, ("x", x, DEBUG))
+    ]
+
+    metrics = MetricsRegistry(loggers["StandardLogger"], at_exit=False)
+    counter = metrics.counter(_CALLER, "n_evals")
+    histogram = metrics.histogram(_CALLER, "time", [1.0e-3, 1.0e-2, 0.1, 1.0])
+    cases += [
+        ("counter increment", counter.increment, ()),
+        ("histogram observe", histogram.observe, (value,))
+    ]
+
+    return loggers, cases
+
+
+def _time_ns_per_call(call, args, number, n_threads):
+    # The cost of the timing loop is included in the results
+    if n_threads == 1:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            call(*args)
+        return (time.perf_counter_ns() - start) / number
+
+    barrier = threading.Barrier(n_threads + 1)
+
+    def work():
+        barrier.wait()
+        for _ in range(number):
+            call(*args)
+
+    threads = [threading.Thread(target=work) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter_ns()
+    for thread in threads:
+        thread.join()
+    return (time.perf_counter_ns() - start) / (number * n_threads)
+
+
+def _time_ns_per_import(repeat):
+    # Each import is timed in a fresh interpreter by the interpreter itself so
+    # that the cost of starting the interpreter is excluded.
+    code = "import time; start = time.perf_counter_ns(); import poptus; " \
+        + "print(time.perf_counter_ns() - start)"
+    env = dict(os.environ)
+    path = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [path] + ([env["PYTHONPATH"]] if "PYTHONPATH" in env else [])
+    )
+    return min(
+        int(subprocess.run([sys.executable, "-c", code], env=env,
+                           capture_output=True, check=True, text=True).stdout)
+        for _ in range(repeat)
+    )
+
+
+def benchmark(filename=None, number=10000, repeat=5, n_threads=4,
+              verbosity=1):
+    """
+    Measure the per-call cost in nanoseconds of logging with the
+    :py:class:`StandardLogger`, :py:class:`FileLogger`,
+    :py:class:`BinaryLogger`, and :py:class:`MappedFileLogger` classes and with
+    the functions created by :py:func:`create_log_functions` for enabled and
+    suppressed messages, for short and long messages, and for use by one
+    thread and by multiple threads.  The cost of importing the package in a
+    new interpreter is reported as the case ``import poptus x1``.  The results
+    can be saved in JSON format and compared with previous results using
+    :py:func:`compare_benchmarks`.
+
+    This is included so that developers can detect performance regressions
+    and users can measure the cost of logging on their systems |via|::
+
+                       poptus.benchmark("results.json")
+
+    or equivalently |via| ``python -m poptus benchmark -o results.json``.
+
+    :param filename: ``None`` or name and path of JSON file to which results
+        are written
+    :param number: Number of calls made by each thread per measurement
+    :param repeat: Number of measurements of each case with the fastest
+        reported
+    :param n_threads: Number of threads used for the multithreaded cases
+    :param verbosity: Results are printed if greater than zero
+    :return: ``dict`` of results including system information and the
+        nanoseconds per call of each case
+    """
+    def log_and_abort(my_exception, msg):
+        StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+        raise my_exception(msg)
+
+    for name, value in [("number", number), ("repeat", repeat),
+                        ("n_threads", n_threads)]:
+        if (not isinstance(value, Integral)) or isinstance(value, bool):
+            log_and_abort(TypeError, f"{name} is not an integer ({value})")
+        elif value <= 0:
+            log_and_abort(ValueError, f"{name} is not positive ({value})")
+    if (filename is not None) and (not isinstance(filename, (str, Path))):
+        log_and_abort(TypeError, f"{filename} is not a string or Path")
+
+    thread_counts = [1] if n_threads == 1 else [1, n_threads]
+
+    results = {}
+    loggers = {}
+    tmp_dir = Path(tempfile.mkdtemp(prefix="poptus_benchmark_"))
+    try:
+        with open(os.devnull, "w") as devnull:
+            with redirect_stdout(devnull):
+                loggers, cases = _cases(tmp_dir)
+                for name, call, args in cases:
+                    for threads in thread_counts:
+                        key = f"{name} x{threads}"
+                        results[key] = min(
+                            _time_ns_per_call(call, args, number, threads)
+                            for _ in range(repeat)
+                        )
+    finally:
+        # Files are closed and unmapped before they are removed
+        for logger in loggers.values():
+            logger.close()
+        shutil.rmtree(tmp_dir)
+    results["import poptus x1"] = _time_ns_per_import(repeat)
+
+    # Source trees used through PYTHONPATH have no installed version
+    try:
+        from . import __version__ as poptus_version
+    except ImportError:
+        poptus_version = None
+
+    report = {
+        "poptus": poptus_version,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "time": time.time(),
+        "number": number,
+        "repeat": repeat,
+        "ns_per_call": results
+    }
+
+    if verbosity > 0:
+        width = max(len(key) for key in results)
+        for key, ns in results.items():
+            sys.stdout.write(f"{key:<{width}}  {ns:12.1f} ns/call\n")
+        sys.stdout.flush()
+
+    if filename is not None:
+        with open(filename, "w") as fptr:
+            json.dump(report, fptr, indent=4)
+
+    return report
@@ -0,0 +1,71 @@
+import sys
+import json
+
+from pathlib import Path
+
+from ._constants import (
+    LOG_LEVEL_NONE,
+    POPTUS_LOG_TAG
+)
+from .StandardLogger import StandardLogger
+
+
+def compare_benchmarks(baseline, current, tolerance=0.1, verbosity=1):
+    """
+    Compare two sets of results obtained with :py:func:`benchmark` and flag
+    every case whose per-call cost increased by more than the given relative
+    tolerance.  Cases present in only one set are ignored.  For example, ::
+
+        regressions = poptus.compare_benchmarks("main.json", "branch.json")
+
+    or equivalently |via| ``python -m poptus compare main.json branch.json``,
+    which exits with a nonzero status if there are regressions.
+
+    :param baseline: Results returned by :py:func:`benchmark` or name and path
+        of JSON file to which these were written
+    :param current: Results to compare against the baseline results
+        specified in the same way
+    :param tolerance: Relative increase in cost beyond which a case is
+        flagged as a regression
+    :param verbosity: Comparison of all cases is printed if greater than zero
+    :return: ``dict`` that maps the name of each regressed case to the ratio
+        of its current to baseline cost
+    """
+    def log_and_abort(my_exception, msg):
+        StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+        raise my_exception(msg)
+
+    def load(results):
+        if isinstance(results, (str, Path)):
+            with open(results, "r") as fptr:
+                results = json.load(fptr)
+        if (not isinstance(results, dict)) or ("ns_per_call" not in results):
+            log_and_abort(ValueError, "Invalid benchmark results")
+        return results["ns_per_call"]
+
+    if isinstance(tolerance, bool) or \
+            (not isinstance(tolerance, (int, float))):
+        log_and_abort(TypeError, f"tolerance is not a number ({tolerance})")
+    elif tolerance < 0.0:
+        log_and_abort(ValueError, f"tolerance is negative ({tolerance})")
+
+    baseline = load(baseline)
+    current = load(current)
+
+    cases = [key for key in baseline if key in current]
+    ratios = {key: current[key] / baseline[key] for key in cases}
+    regressions = {
+        key: ratio for key, ratio in ratios.items() if ratio > 1.0 + tolerance
+    }
+
+    if verbosity > 0:
+        width = max([len(key) for key in cases], default=0)
+        for key in cases:
+            flag = "  REGRESSION" if key in regressions else ""
+            sys.stdout.write(
+                f"{key:<{width}}  {baseline[key]:12.1f} -> "
+                f"{current[key]:12.1f} ns/call  ({ratios[key]:5.2f}x){flag}\n"
+            )
+        sys.stdout.flush()
+
+    return regressions
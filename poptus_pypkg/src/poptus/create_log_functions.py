@@ -1,62 +1,84 @@
-import functools
+from numbers import Integral, Real
+from collections.abc import Mapping
 
 from ._constants import (
-    LOG_LEVEL_DEFAULT,
-    LOG_LEVEL_MIN_DEBUG,
-    LOG_LEVEL_MAX,
+    LOG_LEVEL_DEFAULT, LOG_LEVEL_MAX,
     POPTUS_LOG_TAG
 )
 from .AbstractLogger import AbstractLogger
 from .StandardLogger import StandardLogger
+from .LogFunctions import LogFunctions
 
 
-# ----- CREATE DEDICATED LOG FUNCTIONS
-# Boiler plate log function helpers that are used as the building blocks for
-# constructing dedicated log functions.  There should be no need to use these
-# directly.
-def _log(msg, logger, caller):
-    logger.log(caller, msg, LOG_LEVEL_DEFAULT)
+def _is_number(value):
+    return isinstance(value, Real) and (not isinstance(value, bool))
 
 
-def _log_debug(msg, debug_level, logger, caller):
-    # Since these functions are used by method developers rather than users, we
-    # can keep the error checking minimal and light.  If method developers use a
-    # bad level, they should find out immediately and easily.
-    assert LOG_LEVEL_MIN_DEBUG <= debug_level <= LOG_LEVEL_MAX
-    logger.log(caller, msg, debug_level)
-
-
-def _warn(msg, logger, caller):
-    logger.warn(caller, msg)
-
-
-def _log_and_abort(my_exception, msg, logger, caller):
-    logger.error(caller, msg)
-    raise my_exception(msg)
-
-
-def create_log_functions(logger, caller):
+def create_log_functions(logger, caller, sample=None, rate_limit=None):
     """
     Create a set of simple functions that a method can use for logging general
     information, debug information, warnings, and errors.
 
+    Codes that log in hot loops (|eg| with each model evaluation) can limit
+    the number of messages logged at each level by sampling the messages or by
+    rate limiting them.  For example, ::
+
+        log, log_debug, _, _ = poptus.create_log_functions(
+            logger, "Model",
+            sample={poptus.LOG_LEVEL_MIN_DEBUG: 1000},
+            rate_limit={poptus.LOG_LEVEL_MAX: (10.0, 100)}
+        )
+
+    logs every 1000th message of level ``LOG_LEVEL_MIN_DEBUG`` and at most ten
+    messages per second on average of level ``LOG_LEVEL_MAX``.  A summary of
+    the number of messages suppressed at each level is logged once the log
+    functions are no longer in use, at exit, or when requested with
+    ``write_summary()``.  Messages suppressed by the logger's verbosity level
+    are not counted.
+
     :param logger: Concrete logger object derived from
         :py:class:`AbstractLogger` to be used for logging.  Typically this will
         be created with :py:func:`create_logger`.
     :param caller: Name of element performing the logging.  Depending on the
         logger, this name could appear in each log entry to identify the source
         of the message
+    :param sample: ``None`` or ``dict`` indexed by message level of either a
+        positive integer ``N`` so that only the first and every ``N``-th
+        message thereafter are logged or a probability in (0, 1] with which
+        each message is logged
+    :param rate_limit: ``None`` or ``dict`` indexed by message level of
+        ``(rate, burst)`` token bucket parameters so that at most ``burst``
+        messages are logged at once and at most ``rate`` messages per second
+        are logged on average.  Rate limits are applied to the messages that
+        pass sampling.
     :return: (log, log_debug, warn, log_and_abort) logging functions where
 
-        * ``log(msg)`` logs the given general message at level
+        * ``log(msg, *args)`` logs the given general message at level
           ``LOG_LEVEL_DEFAULT``
-        * ``log_debug(msg, level)`` logs the given debug message at the given
-          debug level, which must be between ``LOG_LEVEL_MIN_DEBUG`` and
+        * ``log_debug(msg, level, *args)`` logs the given debug message at the
+          given debug level, which must be between ``LOG_LEVEL_MIN_DEBUG`` and
           ``LOG_LEVEL_MAX`` inclusive
-        * ``warn(msg)`` logs the given warning message
-        * ``log_and_abort(*Error, msg)`` logs the given error message and then
-          raises an exception of the given type (|eg| ``ValueError``,
+        * ``warn(msg, *args)`` logs the given warning message
+        * ``log_and_abort(*Error, msg, *args)`` logs the given error message and
+          then raises an exception of the given type (|eg| ``ValueError``,
           ``TypeError``)
+
+        Each message can be a string, a format string whose replacement fields
+        are filled with the given ``args`` |via| ``str.format``, or a
+        zero-argument callable that returns the message.  In the latter two
+        cases, the message is only built if the logger's verbosity level
+        indicates that it will be logged so that debug messages that are
+        costly to build (|eg| those that include large arrays) cost nearly
+        nothing when suppressed.
+
+        The returned :py:class:`LogFunctions` object unpacks as the above
+        tuple and additionally offers ``is_enabled(level)`` so that callers can
+        skip building costly debug data that would not be logged and
+        ``span(name, level)`` for timing blocks of code and functions and
+        ``log_array(name, arr, level)`` for logging arrays concisely.  The
+        logger's verbosity level is stored in the functions and updated when
+        the level changes so that messages suppressed by the level cost a
+        single table lookup.
     """
     if not isinstance(logger, AbstractLogger):
         msg = "Invalid logger type"
@@ -71,9 +93,44 @@ def create_log_functions(logger, caller):
         StandardLogger().error(POPTUS_LOG_TAG, msg)
         raise ValueError(msg)
 
-    log_fcn = functools.partial(_log, logger=logger, caller=caller)
-    debug_fcn = functools.partial(_log_debug, logger=logger, caller=caller)
-    warn_fcn = functools.partial(_warn, logger=logger, caller=caller)
-    error_fcn = functools.partial(_log_and_abort, logger=logger, caller=caller)
+    for name, throttles in [("sample", sample), ("rate_limit", rate_limit)]:
+        if throttles is None:
+            continue
+        elif not isinstance(throttles, Mapping):
+            msg = f"{name} is not a dict ({throttles})"
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise TypeError(msg)
+        for level in throttles:
+            if (not isinstance(level, Integral)) or \
+                    (not (LOG_LEVEL_DEFAULT <= level <= LOG_LEVEL_MAX)):
+                msg = f"Invalid {name} message level ({level})"
+                StandardLogger().error(POPTUS_LOG_TAG, msg)
+                raise ValueError(msg)
+
+    for level, value in ({} if sample is None else sample).items():
+        if not _is_number(value):
+            msg = f"Level {level} sample is not a number ({value})"
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise TypeError(msg)
+        elif isinstance(value, Integral) and (value < 1):
+            msg = f"Level {level} sample is not positive ({value})"
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise ValueError(msg)
+        elif (not isinstance(value, Integral)) and \
+                (not (0.0 < value <= 1.0)):
+            msg = f"Level {level} sample is not a probability ({value})"
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise ValueError(msg)
+
+    for level, value in ({} if rate_limit is None else rate_limit).items():
+        if (not isinstance(value, tuple)) or (len(value) != 2) or \
+                (not all(_is_number(e) for e in value)):
+            msg = f"Level {level} rate limit is not (rate, burst) ({value})"
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise TypeError(msg)
+        elif (value[0] <= 0) or (value[1] < 1):
+            msg = f"Invalid level {level} rate limit ({value})"
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise ValueError(msg)
 
-    return log_fcn, debug_fcn, warn_fcn, error_fcn
+    return LogFunctions(logger, caller, sample, rate_limit)
@@ -1,10 +1,19 @@
 from ._constants import (
     LOG_LEVEL_DEFAULT,
-    LOG_LEVEL_KEY, LOG_FILENAME_KEY, LOG_OVERWRITE_KEY,
+    LOG_LEVEL_KEY, LOG_SINKS_KEY, LOG_CALLER_LEVELS_KEY,
+    LOG_FILENAME_KEY, LOG_OVERWRITE_KEY,
+    LOG_BUFFER_SIZE_KEY, LOG_FLUSH_INTERVAL_KEY,
+    LOG_SHARDED_KEY, LOG_FORMAT_KEY,
+    LOG_MAX_BYTES_KEY, LOG_MAX_AGE_KEY, LOG_KEEP_KEY, LOG_COMPRESSION_KEY,
+    LOG_FORMAT_TEXT, LOG_FORMAT_JSON_LINES, LOG_FORMAT_BINARY, LOG_FORMATS,
     POPTUS_LOG_TAG
 )
 from .StandardLogger import StandardLogger
 from .FileLogger import FileLogger
+from .ShardedFileLogger import ShardedFileLogger
+from .JsonLinesLogger import JsonLinesLogger
+from .BinaryLogger import BinaryLogger
+from .FanOutLogger import FanOutLogger
 
 
 def create_logger(configuration=None):
@@ -16,15 +25,34 @@ def create_logger(configuration=None):
         a ``dict``.
     :return: If ``configuration`` is ``None``, then a standard ouput/standard
         error logger with the ``LOG_LEVEL_DEFAULT`` verbosity level is
-        returned.  Otherwise, a logger built with the provided configuration is
-        returned.
+        returned.  If the configuration contains only a list of sink
+        configurations, then a :py:class:`FanOutLogger` that sends messages to
+        the loggers built with each of these is returned.  Otherwise, a logger
+        built with the provided configuration is returned.
     """
     STD_CFG_KEYS = {LOG_LEVEL_KEY}
+    STD_OPTIONAL_CFG_KEYS = {
+        LOG_CALLER_LEVELS_KEY,
+        LOG_BUFFER_SIZE_KEY,
+        LOG_FLUSH_INTERVAL_KEY
+    }
     FILE_CFG_KEYS = {
         LOG_LEVEL_KEY,
         LOG_FILENAME_KEY,
         LOG_OVERWRITE_KEY
     }
+    FILE_OPTIONAL_CFG_KEYS = {
+        LOG_CALLER_LEVELS_KEY,
+        LOG_BUFFER_SIZE_KEY,
+        LOG_SHARDED_KEY,
+        LOG_FORMAT_KEY
+    }
+    ROTATION_CFG_KEYS = {
+        LOG_MAX_BYTES_KEY,
+        LOG_MAX_AGE_KEY,
+        LOG_KEEP_KEY,
+        LOG_COMPRESSION_KEY
+    }
 
     if configuration is None:
         return StandardLogger(LOG_LEVEL_DEFAULT)
@@ -32,6 +60,22 @@ def create_logger(configuration=None):
         msg = "Given logger configuration is not a dict"
         StandardLogger().error(POPTUS_LOG_TAG, msg)
         raise TypeError(msg)
+    elif LOG_SINKS_KEY in configuration:
+        sinks = configuration[LOG_SINKS_KEY]
+        if set(configuration) != {LOG_SINKS_KEY}:
+            msg = "Extra logger configuration values for fan-out logger ({})"
+            msg = msg.format(set(configuration).difference({LOG_SINKS_KEY}))
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise ValueError(msg)
+        elif not isinstance(sinks, list):
+            msg = f"{LOG_SINKS_KEY} logger configuration is not a list"
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise TypeError(msg)
+        elif not sinks:
+            msg = f"{LOG_SINKS_KEY} logger configuration is empty"
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise ValueError(msg)
+        return FanOutLogger([create_logger(sink) for sink in sinks])
     elif LOG_LEVEL_KEY not in configuration:
         msg = f"{LOG_LEVEL_KEY} logger configuration not provided"
         StandardLogger().error(POPTUS_LOG_TAG, msg)
@@ -45,21 +89,76 @@ def create_logger(configuration=None):
             msg = f"{LOG_OVERWRITE_KEY} logger configuration not provided"
             StandardLogger().error(POPTUS_LOG_TAG, msg)
             raise ValueError(msg)
-        elif set(configuration) != FILE_CFG_KEYS:
+        extra = set(configuration).difference(
+            FILE_CFG_KEYS | FILE_OPTIONAL_CFG_KEYS | ROTATION_CFG_KEYS
+        )
+        if extra:
             msg = "Extra logger configuration values for file logger ({})"
-            msg = msg.format(set(configuration).difference(FILE_CFG_KEYS))
+            msg = msg.format(extra)
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise ValueError(msg)
+
+        sharded = configuration.get(LOG_SHARDED_KEY, False)
+        if not isinstance(sharded, bool):
+            msg = f"{LOG_SHARDED_KEY} logger configuration is not a bool"
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise TypeError(msg)
+
+        log_format = configuration.get(LOG_FORMAT_KEY, LOG_FORMAT_TEXT)
+        if log_format not in LOG_FORMATS:
+            msg = "Invalid {} logger configuration ({})"
+            msg = msg.format(LOG_FORMAT_KEY, log_format)
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise ValueError(msg)
+        elif sharded and (log_format != LOG_FORMAT_TEXT):
+            msg = f"Sharded file loggers must use {LOG_FORMAT_TEXT} format"
             StandardLogger().error(POPTUS_LOG_TAG, msg)
             raise ValueError(msg)
 
-        return FileLogger(
-            configuration[LOG_FILENAME_KEY],
-            configuration[LOG_OVERWRITE_KEY],
-            level
+        filename = configuration[LOG_FILENAME_KEY]
+        overwrite = configuration[LOG_OVERWRITE_KEY]
+        buffer_size = configuration.get(LOG_BUFFER_SIZE_KEY, None)
+        rotation = ROTATION_CFG_KEYS.intersection(configuration)
+        if rotation and (sharded or (log_format == LOG_FORMAT_BINARY)):
+            msg = f"Rotation not available for sharded or {LOG_FORMAT_BINARY} "
+            msg += f"file loggers ({rotation})"
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise ValueError(msg)
+
+        if sharded:
+            logger = ShardedFileLogger(filename, overwrite, level, buffer_size)
+        elif log_format == LOG_FORMAT_BINARY:
+            logger = BinaryLogger(filename, overwrite, level, buffer_size)
+        else:
+            if log_format == LOG_FORMAT_JSON_LINES:
+                logger_class = JsonLinesLogger
+            else:
+                logger_class = FileLogger
+            logger = logger_class(
+                filename, overwrite, level,
+                buffer_size=buffer_size,
+                max_bytes=configuration.get(LOG_MAX_BYTES_KEY, None),
+                max_age=configuration.get(LOG_MAX_AGE_KEY, None),
+                keep=configuration.get(LOG_KEEP_KEY, None),
+                compression=configuration.get(LOG_COMPRESSION_KEY, None)
+            )
+    else:
+        extra = set(configuration).difference(
+            STD_CFG_KEYS | STD_OPTIONAL_CFG_KEYS
         )
-    elif set(configuration) != STD_CFG_KEYS:
-        msg = "Extra logger configuration values for std out/err logger ({})"
-        msg = msg.format(set(configuration).difference(STD_CFG_KEYS))
-        StandardLogger().error(POPTUS_LOG_TAG, msg)
-        raise ValueError(msg)
+        if extra:
+            msg = "Extra logger configuration values for std out/err logger "
+            msg += f"({extra})"
+            StandardLogger().error(POPTUS_LOG_TAG, msg)
+            raise ValueError(msg)
+
+        logger = StandardLogger(
+            level,
+            buffer_size=configuration.get(LOG_BUFFER_SIZE_KEY, None),
+            flush_interval=configuration.get(LOG_FLUSH_INTERVAL_KEY, None)
+        )
+
+    if LOG_CALLER_LEVELS_KEY in configuration:
+        logger.set_caller_levels(configuration[LOG_CALLER_LEVELS_KEY])
 
-    return StandardLogger(level)
+    return logger
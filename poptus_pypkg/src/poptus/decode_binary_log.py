@@ -0,0 +1,94 @@
+import os
+import struct
+
+from pathlib import Path
+
+from ._constants import (
+    LOG_LEVEL_NONE, LOG_LEVEL_MAX, LOG_LEVELS,
+    BINARY_LOG_MAGIC, BINARY_LOG_HEADER,
+    BINARY_LOG_CALLER, BINARY_LOG_WARNING, BINARY_LOG_ERROR,
+    POPTUS_LOG_TAG
+)
+from .StandardLogger import StandardLogger
+
+_HEADER = struct.Struct(BINARY_LOG_HEADER)
+
+
+def decode_binary_log(filename, callers=None, level=None):
+    """
+    Decode lazily the messages written to file by a :py:class:`BinaryLogger`
+    into exactly the text that a :py:class:`FileLogger` would have written.
+    For example, ::
+
+        with open("study.log", "w") as fptr:
+            fptr.writelines(decode_binary_log("study.bin"))
+
+    Messages that are filtered out are skipped without decoding them.  A
+    partially-written final record, as might be left by a crash, is ignored.
+
+    :param filename: Name and path of file to decode
+    :param callers: ``None`` to decode messages of all callers or an iterable
+        of the names of callers whose messages should be decoded
+    :param level: ``None`` to decode all messages or a verbosity level so that
+        only those messages that a logger with this level would log are
+        decoded.  Warnings and errors are decoded regardless of level.
+    :return: Generator that yields each message as a line of text
+    """
+    def log_and_abort(my_exception, msg):
+        StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+        raise my_exception(msg)
+
+    if not isinstance(filename, (str, Path)):
+        log_and_abort(TypeError, f"{filename} is not a string or Path")
+    elif not Path(filename).is_file():
+        log_and_abort(ValueError, f"{filename} is not a file")
+    elif (level is not None) and (level not in LOG_LEVELS):
+        log_and_abort(ValueError, f"Invalid logging verbosity level ({level})")
+
+    with open(filename, "rb") as fptr:
+        if fptr.read(len(BINARY_LOG_MAGIC)) != BINARY_LOG_MAGIC:
+            log_and_abort(ValueError, f"{filename} is not a binary log")
+
+    if callers is not None:
+        callers = set(callers)
+    max_type = LOG_LEVEL_MAX if level is None else level
+
+    def lines():
+        names = {}
+        # Indexed by caller ID
+        keep = {}
+        with open(filename, "rb") as fptr:
+            fptr.seek(len(BINARY_LOG_MAGIC))
+            while True:
+                header = fptr.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                record_type, caller_id, _, length = _HEADER.unpack(header)
+
+                if record_type == BINARY_LOG_CALLER:
+                    payload = fptr.read(length)
+                    if len(payload) < length:
+                        return
+                    names[caller_id] = payload.decode("utf-8")
+                    keep[caller_id] = (callers is None) or \
+                        (names[caller_id] in callers)
+                    continue
+                elif (not keep[caller_id]) or \
+                        (max_type < record_type <= LOG_LEVEL_MAX):
+                    fptr.seek(length, os.SEEK_CUR)
+                    continue
+
+                payload = fptr.read(length)
+                if len(payload) < length:
+                    return
+                msg = payload.decode("utf-8")
+                caller = names[caller_id]
+
+                if record_type == BINARY_LOG_WARNING:
+                    yield f"[{caller}] WARNING - {msg}\n"
+                elif record_type == BINARY_LOG_ERROR:
+                    yield f"[{caller}] ERROR - {msg}\n"
+                else:
+                    yield f"[{caller}] {msg}\n"
+
+    return lines()
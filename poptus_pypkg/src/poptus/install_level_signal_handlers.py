@@ -0,0 +1,96 @@
+import queue
+import threading
+
+from ._constants import (
+    LOG_LEVEL_NONE, LOG_LEVEL_MAX,
+    POPTUS_LOG_TAG
+)
+from .AbstractLogger import AbstractLogger
+from .StandardLogger import StandardLogger
+
+# Level steps requested by signal handlers as (logger, step) pairs and the
+# single daemon thread that applies them for all installed handlers.  Putting
+# to a SimpleQueue is safe in signal handlers.
+_STEPS = queue.SimpleQueue()
+_WORKER = None
+
+
+def _apply_steps():
+    while True:
+        logger, step = _STEPS.get()
+        try:
+            logger.level = min(max(logger.level + step, LOG_LEVEL_NONE),
+                               LOG_LEVEL_MAX)
+        except Exception as exc:
+            msg = f"Unable to change level on signal ({exc})"
+            StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+
+
+def install_level_signal_handlers(logger, up=None, down=None):
+    """
+    Install POSIX signal handlers that step the verbosity level of the given
+    logger up or down by one each time that the associated signal is received
+    so that the verbosity of a long-running job can be changed from outside
+    the process |via| ``kill -USR1 <pid>``.  Levels are kept between
+    ``LOG_LEVEL_NONE`` and ``LOG_LEVEL_MAX`` inclusive and changes are seen
+    immediately by all existing log functions.  Caller levels set in the logger
+    are not altered.
+
+    The handlers only queue the requested steps, which are applied by a daemon
+    thread shortly after each signal is received.  Therefore, a signal received
+    while the main thread is changing or resolving levels cannot interrupt the
+    change and leave stale levels cached.
+
+    Python only allows signal handlers to be installed by the main thread.
+
+    :param logger: Concrete logger object derived from
+        :py:class:`AbstractLogger` whose level is changed
+    :param up: Signal that raises the level or ``None`` to use ``SIGUSR1``
+    :param down: Signal that lowers the level or ``None`` to use ``SIGUSR2``
+    :return: ``dict`` of the handlers previously installed indexed by signal
+    """
+    # signal is imported only when needed so that importing poptus stays
+    # cheap
+    import signal
+
+    def log_and_abort(my_exception, msg):
+        StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+        raise my_exception(msg)
+
+    if not isinstance(logger, AbstractLogger):
+        log_and_abort(TypeError, "Invalid logger type")
+    elif threading.current_thread() is not threading.main_thread():
+        log_and_abort(RuntimeError,
+                      "Signal handlers can only be installed by main thread")
+
+    if (up is None) or (down is None):
+        if not (hasattr(signal, "SIGUSR1") and hasattr(signal, "SIGUSR2")):
+            log_and_abort(RuntimeError,
+                          "SIGUSR1 and SIGUSR2 are not available")
+        up = signal.SIGUSR1 if up is None else up
+        down = signal.SIGUSR2 if down is None else down
+
+    valid = signal.valid_signals()
+    if (up not in valid) or (down not in valid):
+        log_and_abort(ValueError, f"Invalid signals ({up}, {down})")
+    elif up == down:
+        log_and_abort(ValueError, f"Same signal given for up and down ({up})")
+
+    # Handlers are only installed by the main thread and so starting the
+    # worker need not be locked.  Threads do not survive forking.
+    global _WORKER
+    if (_WORKER is None) or (not _WORKER.is_alive()):
+        _WORKER = threading.Thread(target=_apply_steps,
+                                   name="poptus-LevelSignals", daemon=True)
+        _WORKER.start()
+
+    def step_up(*_):
+        _STEPS.put((logger, 1))
+
+    def step_down(*_):
+        _STEPS.put((logger, -1))
+
+    return {
+        up: signal.signal(up, step_up),
+        down: signal.signal(down, step_down)
+    }
@@ -0,0 +1,85 @@
+import os
+import re
+import heapq
+
+from pathlib import Path
+
+from ._constants import (
+    LOG_LEVEL_NONE,
+    POPTUS_LOG_TAG
+)
+from .StandardLogger import StandardLogger
+from .ShardedFileLogger import shard_filenames
+
+_ESCAPED = re.compile(r"\\(.)")
+
+
+def _unescape(match):
+    return "\n" if match.group(1) == "n" else match.group(1)
+
+
+def _read_shard(path, pid):
+    # Stream records in the order written so that heapq.merge need only hold
+    # one record per shard in memory.  A final line without a newline was
+    # only partially written and is therefore ignored.
+    with open(path, "r") as fptr:
+        for line in fptr:
+            if not line.endswith("\n"):
+                break
+            timestamp, sequence, text = line[:-1].split(" ", 2)
+            if "\\" in text:
+                text = _ESCAPED.sub(_unescape, text)
+            yield int(timestamp), pid, int(sequence), text
+
+
+def merge_log_shards(filename, overwrite=False, remove_shards=False):
+    """
+    Merge into a single log file all shards written by processes that logged
+    with a :py:class:`ShardedFileLogger`.  Records are written in order of
+    their timestamps with ties broken by process ID and sequence number.  The
+    shards are streamed so that merging requires memory proportional only to
+    the number of shards.
+
+    :param filename: Name and path of merged log file that was given to the
+        sharded logger
+    :param overwrite: If the merged log file already exists, then it is
+        overwritten if ``True`` or an error is raised if ``False``.
+    :param remove_shards: Shards are removed after merging if ``True``
+    :return: Number of records written to the merged log file
+    """
+    def log_and_abort(my_exception, msg):
+        StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+        raise my_exception(msg)
+
+    if not isinstance(filename, (str, Path)):
+        log_and_abort(TypeError, f"{filename} is not a string or Path")
+    elif isinstance(filename, str) and (filename == ""):
+        log_and_abort(ValueError, "Empty filename string given")
+    elif not isinstance(overwrite, bool):
+        log_and_abort(TypeError, f"overwrite is not a bool ({overwrite})")
+    elif not isinstance(remove_shards, bool):
+        msg = f"remove_shards is not a bool ({remove_shards})"
+        log_and_abort(TypeError, msg)
+
+    filename = Path(filename).resolve()
+    if filename.exists() and (not overwrite):
+        log_and_abort(RuntimeError, f"{filename} already exists")
+
+    shards = shard_filenames(filename)
+    if not shards:
+        log_and_abort(RuntimeError, f"No shards of {filename} found")
+
+    n_records = 0
+    records = heapq.merge(
+        *[_read_shard(path, pid) for pid, path in shards.items()]
+    )
+    with open(filename, "w", buffering=1024 * 1024) as fptr:
+        for _, _, _, text in records:
+            fptr.write(f"{text}\n")
+            n_records += 1
+
+    if remove_shards:
+        for path in shards.values():
+            os.remove(path)
+
+    return n_records
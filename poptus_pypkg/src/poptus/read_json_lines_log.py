@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from ._constants import (
+    LOG_LEVEL_NONE,
+    POPTUS_LOG_TAG
+)
+from .StandardLogger import StandardLogger
+
+
+def read_json_lines_log(filename, callers=None, record_types=None):
+    """
+    Read lazily the records written to file by a :py:class:`JsonLinesLogger`
+    so that arbitrarily large logs can be post-processed with constant memory.
+    For example, ::
+
+        f_values = [
+            record["fields"]["f"]
+            for record in read_json_lines_log("study.jsonl", callers=["Method"])
+            if "fields" in record
+        ]
+
+    :param filename: Name and path of file to read
+    :param callers: ``None`` to read records of all callers or an iterable of
+        the names of callers whose records should be read.  Lines of other
+        callers are skipped without being fully parsed where possible.
+    :param record_types: ``None`` to read all records or an iterable of record
+        types (|eg| ``LOG_RECORD_WARNING``) to read
+    :return: Generator that yields each record as a ``dict``
+    """
+    # json is imported only when needed so that importing poptus stays cheap
+    import json
+
+    def log_and_abort(my_exception, msg):
+        StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+        raise my_exception(msg)
+
+    if not isinstance(filename, (str, Path)):
+        log_and_abort(TypeError, f"{filename} is not a string or Path")
+    elif not Path(filename).is_file():
+        log_and_abort(ValueError, f"{filename} is not a file")
+
+    if callers is not None:
+        callers = set(callers)
+        # Records of a caller must contain this text, which allows for
+        # skipping most other lines without parsing
+        tags = [json.dumps({"caller": e})[1:-1] for e in callers]
+    if record_types is not None:
+        record_types = set(record_types)
+
+    def records():
+        with open(filename, "r") as fptr:
+            for line in fptr:
+                if (callers is not None) and \
+                        (not any(tag in line for tag in tags)):
+                    continue
+
+                record = json.loads(line)
+                if (callers is not None) and (record["caller"] not in callers):
+                    continue
+                elif (record_types is not None) and \
+                        (record["type"] not in record_types):
+                    continue
+                yield record
+
+    return records()
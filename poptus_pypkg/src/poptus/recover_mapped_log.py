@@ -0,0 +1,41 @@
+import os
+
+from pathlib import Path
+
+from ._constants import (
+    LOG_LEVEL_NONE,
+    POPTUS_LOG_TAG
+)
+from .StandardLogger import StandardLogger
+from .MappedFileLogger import (
+    _end_of_last, _end_of_records
+)
+
+
+def recover_mapped_log(filename):
+    """
+    Truncate a log file written by a :py:class:`MappedFileLogger` that was not
+    closed, as might be left by a crash, to its last complete message.  The
+    zero bytes with which the logger pads the file as well as a
+    partially-written final message are removed.  Files that were closed
+    properly are not changed.
+
+    :param filename: Name and path of log file
+    :return: Size in bytes of the recovered log file
+    """
+    def log_and_abort(my_exception, msg):
+        StandardLogger(LOG_LEVEL_NONE).error(POPTUS_LOG_TAG, msg)
+        raise my_exception(msg)
+
+    if not isinstance(filename, (str, Path)):
+        log_and_abort(TypeError, f"{filename} is not a string or Path")
+    elif not Path(filename).is_file():
+        log_and_abort(ValueError, f"{filename} is not a file")
+
+    with open(filename, "r+b") as fptr:
+        size = fptr.seek(0, os.SEEK_END)
+        end = _end_of_last(fptr, _end_of_records(fptr),
+                           lambda e: e.rfind(b"\n") + 1)
+        if end < size:
+            fptr.truncate(end)
+    return end
@@ -2,13 +2,108 @@
 Automatic unittest of the AbstractLogger class
 """
 
+import io
 import unittest
 
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
 import poptus
 
 
 class TestAbstractLogger(unittest.TestCase):
+    def setUp(self):
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+
     def testAbstract(self):
         # Confirm that class is abstract and cannot be instantiated
         with self.assertRaises(TypeError):
             poptus.AbstractLogger(poptus.LOG_LEVEL_DEFAULT)
+
+    def testBadCallerLevels(self):
+        # Use a concrete logger to test the functionality of the base class
+        logger = poptus.StandardLogger()
+        for bad in [None, 1, "Method", [("Method", 1)]]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(TypeError):
+                    logger.set_caller_levels(bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for bad in [{1: 1}, {"": 1}, {None: 1}]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(TypeError):
+                    logger.set_caller_levels(bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for bad in [None, 1.0, "1", -1, poptus.LOG_LEVEL_MAX + 1]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    logger.set_caller_levels({"Method": bad})
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+        self.assertEqual({}, logger.caller_levels)
+
+    def testCallerLevels(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+        DEBUG = poptus.LOG_LEVEL_MIN_DEBUG
+
+        logger = poptus.StandardLogger(DEFAULT)
+        self.assertEqual({}, logger.caller_levels)
+        self.assertEqual(DEFAULT, logger.level_of("Method"))
+
+        levels = {"Method": DEBUG + 1,
+                  "Method.linesearch": poptus.LOG_LEVEL_MAX,
+                  "Model": poptus.LOG_LEVEL_NONE}
+        logger.set_caller_levels(levels)
+        self.assertEqual(levels, logger.caller_levels)
+        self.assertEqual(DEFAULT, logger.level)
+        self.assertEqual(DEBUG + 1, logger.level_of("Method"))
+        self.assertEqual(DEBUG + 1, logger.level_of("Method.trust_region"))
+        self.assertEqual(poptus.LOG_LEVEL_MAX,
+                         logger.level_of("Method.linesearch"))
+        self.assertEqual(poptus.LOG_LEVEL_MAX,
+                         logger.level_of("Method.linesearch.wolfe"))
+        self.assertEqual(poptus.LOG_LEVEL_NONE, logger.level_of("Model"))
+        self.assertEqual(DEFAULT, logger.level_of("Methods"))
+        self.assertEqual(DEFAULT, logger.level_of("Other"))
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            logger.log("Method", "Logged", DEBUG)
+            logger.log("Other", "Not logged", DEBUG)
+            logger.log("Model", "Not logged", DEFAULT)
+            logger.log_fields("Method.linesearch", "Logged",
+                              poptus.LOG_LEVEL_MAX, {"step": 1})
+        self.assertEqual("[Method] Logged\n"
+                         + "[Method.linesearch] Logged step=1\n",
+                         buffer.getvalue())
+
+        # Replaces all levels and resolved levels
+        logger.set_caller_levels({"Model": DEBUG})
+        self.assertEqual(DEFAULT, logger.level_of("Method.linesearch"))
+        self.assertEqual(DEBUG, logger.level_of("Model"))
+
+    def testSetLevel(self):
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        for bad in [None, 1.0, "1", -1, poptus.LOG_LEVEL_MAX + 1]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    logger.level = bad
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+        self.assertEqual(poptus.LOG_LEVEL_DEFAULT, logger.level)
+
+        # Changes are applied to resolved levels of callers without their own
+        # level
+        logger.set_caller_levels({"Model": poptus.LOG_LEVEL_NONE})
+        self.assertEqual(poptus.LOG_LEVEL_DEFAULT, logger.level_of("Method"))
+        logger.level = poptus.LOG_LEVEL_MAX
+        self.assertEqual(poptus.LOG_LEVEL_MAX, logger.level)
+        self.assertEqual(poptus.LOG_LEVEL_MAX, logger.level_of("Method"))
+        self.assertEqual(poptus.LOG_LEVEL_NONE, logger.level_of("Model"))
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            logger.log("Method", "Logged", poptus.LOG_LEVEL_MAX)
+        self.assertEqual("[Method] Logged\n", buffer.getvalue())
@@ -0,0 +1,206 @@
+"""
+Automatic unittest of the AsyncLogger class
+"""
+
+import os
+import io
+import time
+import shutil
+import asyncio
+import threading
+import unittest
+
+from pathlib import Path
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
+import poptus
+
+
+class _SlowLogger(poptus.StandardLogger):
+    # Simulate slow I/O
+    def log(self, caller, msg, level):
+        time.sleep(0.01)
+        super().log(caller, msg, level)
+
+
+class _GatedLogger(poptus.StandardLogger):
+    # Block the writing of messages until released
+    def __init__(self, level):
+        super().__init__(level)
+        self.started = threading.Event()
+        self.released = threading.Event()
+
+    def log(self, caller, msg, level):
+        self.started.set()
+        self.released.wait()
+        super().log(caller, msg, level)
+
+
+class TestAsyncLogger(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_async")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.log")
+
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+        self.__sink = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def testBadArguments(self):
+        bad_args = [
+            (TypeError, (None,)),
+            (TypeError, ("logger",)),
+            (TypeError, (self.__sink, None)),
+            (TypeError, (self.__sink, True)),
+            (TypeError, (self.__sink, 1.0)),
+            (ValueError, (self.__sink, 0)),
+            (ValueError, (self.__sink, 10, poptus.QUEUE_POLICY_BLOCK)),
+            (ValueError, (self.__sink, 10, "policy"))
+        ]
+        for exception, args in bad_args:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.AsyncLogger(*args)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testProperties(self):
+        with poptus.AsyncLogger(self.__sink, 10,
+                                poptus.QUEUE_POLICY_DROP_NEW) as logger:
+            self.assertTrue(isinstance(logger, poptus.AbstractLogger))
+            self.assertIs(self.__sink, logger.logger)
+            self.assertEqual(10, logger.max_size)
+            self.assertEqual(poptus.QUEUE_POLICY_DROP_NEW, logger.policy)
+            self.assertEqual(0, logger.n_dropped)
+
+            functions = poptus.create_log_functions(logger, "Model")
+            logger.level = poptus.LOG_LEVEL_MAX
+            self.assertEqual(poptus.LOG_LEVEL_MAX, self.__sink.level)
+            self.assertTrue(functions.is_enabled(poptus.LOG_LEVEL_MAX))
+            logger.set_caller_levels({"Model": poptus.LOG_LEVEL_NONE})
+            self.assertEqual({"Model": poptus.LOG_LEVEL_NONE},
+                             logger.caller_levels)
+            self.assertFalse(functions.is_enabled(poptus.LOG_LEVEL_DEFAULT))
+
+    def testCoroutines(self):
+        logger = poptus.AsyncLogger(
+            poptus.FileLogger(self.__filename, True, poptus.LOG_LEVEL_DEFAULT)
+        )
+
+        async def simulate(i):
+            log, log_debug, warn, log_and_abort = \
+                poptus.create_log_functions(logger, f"Simulation{i}")
+            log("Start")
+            await asyncio.sleep(0.001)
+            log_debug("Not logged", poptus.LOG_LEVEL_MAX)
+            warn("Careful {}", i)
+            if i == 3:
+                log_and_abort(RuntimeError, "Failed")
+            log("End")
+
+        async def drive():
+            results = await asyncio.gather(*[simulate(i) for i in range(8)],
+                                           return_exceptions=True)
+            await logger.aflush()
+            with open(self.__filename, "r") as fptr:
+                n_lines = len(fptr.read().splitlines())
+            await logger.aclose()
+            return results, n_lines
+
+        with redirect_stderr(io.StringIO()) as buffer:
+            results, n_lines = asyncio.run(drive())
+        self.assertEqual(1, sum(isinstance(e, RuntimeError) for e in results))
+        self.assertEqual("[Simulation3] ERROR - Failed\n", buffer.getvalue())
+
+        with open(self.__filename, "r") as fptr:
+            lines = fptr.read().splitlines()
+        self.assertEqual(3 * 8, n_lines)
+        self.assertEqual(3 * 8, len(lines))
+        for i in range(8):
+            mine = [e for e in lines if e.startswith(f"[Simulation{i}]")]
+            end = "ERROR - Failed" if i == 3 else "End"
+            self.assertEqual([f"[Simulation{i}] Start",
+                              f"[Simulation{i}] WARNING - Careful {i}",
+                              f"[Simulation{i}] {end}"],
+                             mine)
+
+    def testNonBlocking(self):
+        N_MESSAGES = 20
+
+        logger = poptus.AsyncLogger(_SlowLogger(poptus.LOG_LEVEL_DEFAULT))
+
+        async def log_all():
+            start = time.monotonic()
+            for i in range(N_MESSAGES):
+                logger.log("Driver", f"{i}", poptus.LOG_LEVEL_DEFAULT)
+            elapsed = time.monotonic() - start
+            await logger.aclose()
+            return elapsed
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            elapsed = asyncio.run(log_all())
+        self.assertTrue(elapsed < 0.01 * N_MESSAGES / 2)
+        self.assertEqual([f"[Driver] {i}" for i in range(N_MESSAGES)],
+                         buffer.getvalue().splitlines())
+
+        # Messages logged after closing are written synchronously
+        with redirect_stdout(io.StringIO()) as buffer:
+            logger.log("Driver", "Late", poptus.LOG_LEVEL_DEFAULT)
+            self.assertEqual("[Driver] Late\n", buffer.getvalue())
+            logger.flush()
+
+    def testDropped(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+
+        for policy, expected in [(poptus.QUEUE_POLICY_DROP_OLDEST, [8, 9]),
+                                 (poptus.QUEUE_POLICY_DROP_NEW, [1, 2])]:
+            sink = _GatedLogger(DEFAULT)
+            logger = poptus.AsyncLogger(sink, 2, policy)
+            with redirect_stdout(io.StringIO()) as buffer:
+                # Occupy the worker with the first message
+                logger.log("Driver", "0", DEFAULT)
+                sink.started.wait()
+                for i in range(1, 10):
+                    logger.log("Driver", f"{i}", DEFAULT)
+                sink.released.set()
+                logger.close()
+            self.assertEqual([f"[Driver] {i}" for i in [0] + expected],
+                             buffer.getvalue().splitlines())
+            self.assertEqual(7, logger.n_dropped)
+
+    def testErrorsNeverDropped(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+
+        for policy in [poptus.QUEUE_POLICY_DROP_OLDEST,
+                       poptus.QUEUE_POLICY_DROP_NEW]:
+            sink = _GatedLogger(DEFAULT)
+            logger = poptus.AsyncLogger(sink, 2, policy)
+            with redirect_stdout(io.StringIO()) as buffer:
+                with redirect_stderr(io.StringIO()) as err_buffer:
+                    # Occupy the worker with the first message and fill queue
+                    logger.log("Driver", "0", DEFAULT)
+                    sink.started.wait()
+                    logger.log("Driver", "1", DEFAULT)
+                    logger.log("Driver", "2", DEFAULT)
+                    logger.error("Driver", "First")
+                    logger.error("Driver", "Second")
+                    logger.error("Driver", "Third")
+                    logger.log("Driver", "3", DEFAULT)
+                    sink.released.set()
+                    logger.close()
+            self.assertEqual(["[Driver] 0"], buffer.getvalue().splitlines())
+            self.assertEqual(["[Driver] ERROR - First",
+                              "[Driver] ERROR - Second",
+                              "[Driver] ERROR - Third"],
+                             err_buffer.getvalue().splitlines())
+            self.assertEqual(3, logger.n_dropped)
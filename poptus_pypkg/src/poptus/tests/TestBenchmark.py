@@ -0,0 +1,86 @@
+"""
+Automatic unittest of the benchmark function
+"""
+
+import os
+import io
+import json
+import shutil
+import unittest
+
+from pathlib import Path
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
+import poptus
+
+
+class TestBenchmark(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_benchmark")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("results.json")
+
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def testBadArguments(self):
+        for kwarg in ["number", "repeat", "n_threads"]:
+            for bad, exception in [(None, TypeError), (True, TypeError),
+                                   (1.0, TypeError), (0, ValueError),
+                                   (-1, ValueError)]:
+                with redirect_stderr(io.StringIO()) as buffer:
+                    with self.assertRaises(exception):
+                        poptus.benchmark(**{kwarg: bad})
+                # print(buffer.getvalue())
+                self.assertTrue(
+                    buffer.getvalue().startswith(self.__error_start)
+                )
+
+    def testBenchmark(self):
+        with redirect_stdout(io.StringIO()) as buffer:
+            report = poptus.benchmark(self.__filename, number=10, repeat=2,
+                                      n_threads=2)
+        self.assertEqual(poptus.__version__, report["poptus"])
+        self.assertEqual(10, report["number"])
+        self.assertEqual(2, report["repeat"])
+
+        results = report["ns_per_call"]
+        self.assertTrue("log_debug suppressed short x1" in results)
+        self.assertTrue("log_debug suppressed eager x1" in results)
+        self.assertTrue("log_debug suppressed callable x1" in results)
+        self.assertTrue("log_debug suppressed short x2" in results)
+        self.assertTrue("FileLogger.log enabled long x2" in results)
+        self.assertTrue("MappedFileLogger.log enabled long x2" in results)
+        self.assertTrue("FileLogger(line buffered).log enabled long x2"
+                        in results)
+        self.assertTrue("BinaryLogger(buffered).log enabled long x2"
+                        in results)
+        self.assertTrue("import poptus x1" in results)
+        for ns in results.values():
+            self.assertTrue(ns > 0.0)
+
+        lines = buffer.getvalue().splitlines()
+        self.assertEqual(len(results), len(lines))
+
+        with open(self.__filename, "r") as fptr:
+            self.assertEqual(report, json.load(fptr))
+
+        # No loggers leave files behind and nothing is logged to stdout
+        self.assertEqual([self.__filename], list(self.__dir.iterdir()))
+        with redirect_stdout(io.StringIO()) as buffer:
+            poptus.benchmark(number=1, repeat=1, n_threads=1, verbosity=0)
+        self.assertEqual("", buffer.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
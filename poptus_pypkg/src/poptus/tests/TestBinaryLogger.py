@@ -0,0 +1,127 @@
+"""
+Automatic unittest of the BinaryLogger class
+"""
+
+import os
+import io
+import shutil
+import struct
+import unittest
+
+from pathlib import Path
+from contextlib import redirect_stderr
+
+import poptus
+
+from poptus._constants import BINARY_LOG_MAGIC, BINARY_LOG_HEADER
+
+
+class TestBinaryLogger(unittest.TestCase):
+    # All tests should suppress writing to stderr, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_binary")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.bin")
+        self.__text_fname = self.__dir.joinpath("test.log")
+
+        self.__valid_levels = set(poptus.LOG_LEVELS).difference(
+            {poptus.LOG_LEVEL_NONE}
+        )
+        self.__tag = "Unittest"
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def _log_all(self, logger):
+        for msg_level in self.__valid_levels:
+            logger.log(self.__tag, f"Level {msg_level}", msg_level)
+            logger.log("Other", f"Other level {msg_level}", msg_level)
+        logger.log(self.__tag, "Ünïcödé\nover two lines", 1)
+        logger.warn("Other", "Be careful")
+        with redirect_stderr(io.StringIO()) as buffer:
+            logger.error(self.__tag, "Bad thing")
+        self.assertEqual(f"[{self.__tag}] ERROR - Bad thing\n",
+                         buffer.getvalue())
+
+    def testLevel(self):
+        for level in poptus.LOG_LEVELS:
+            logger = poptus.BinaryLogger(self.__filename, False, level)
+            self.assertTrue(isinstance(logger, poptus.FileLogger))
+            self.assertEqual(level, logger.level)
+            with self.assertRaises(AssertionError):
+                logger.log(self.__tag, "Bad", poptus.LOG_LEVEL_NONE)
+
+    def testNoFileIfNothingLogged(self):
+        for buffer_size in [None, 1, 8192]:
+            with poptus.BinaryLogger(self.__filename, False,
+                                     buffer_size=buffer_size) as logger:
+                logger.log(self.__tag, "Suppressed", poptus.LOG_LEVEL_MAX)
+            self.assertFalse(self.__filename.exists())
+
+    def testDecodesToFileLoggerText(self):
+        for buffer_size in [None, 1, 64, 8192]:
+            for level in poptus.LOG_LEVELS:
+                for fname in [self.__filename, self.__text_fname]:
+                    if fname.exists():
+                        os.remove(fname)
+
+                text_logger = poptus.FileLogger(self.__text_fname, False,
+                                                level, buffer_size)
+                self._log_all(text_logger)
+                text_logger.close()
+
+                logger = poptus.BinaryLogger(self.__filename, False, level,
+                                             buffer_size)
+                self._log_all(logger)
+                logger.close()
+
+                with open(self.__text_fname, "r") as fptr:
+                    expected = fptr.read()
+                decoded = "".join(poptus.decode_binary_log(self.__filename))
+                self.assertEqual(expected, decoded)
+
+    def testFormat(self):
+        logger = poptus.BinaryLogger(self.__filename, False)
+        logger.log(self.__tag, "First", poptus.LOG_LEVEL_DEFAULT)
+        logger.log(self.__tag, "Second", poptus.LOG_LEVEL_DEFAULT)
+
+        header = struct.Struct(BINARY_LOG_HEADER)
+        name = self.__tag.encode("utf-8")
+        with open(self.__filename, "rb") as fptr:
+            contents = fptr.read()
+
+        # Caller name is written only once
+        self.assertTrue(contents.startswith(BINARY_LOG_MAGIC))
+        self.assertEqual(1, contents.count(name))
+        expected_size = len(BINARY_LOG_MAGIC) \
+            + header.size + len(name) \
+            + 2 * header.size + len(b"First") + len(b"Second")
+        self.assertEqual(expected_size, len(contents))
+
+    def testBuffered(self):
+        logger = poptus.BinaryLogger(self.__filename, False,
+                                     buffer_size=1024 * 1024)
+        self.assertEqual(1024 * 1024, logger.buffer_size)
+        logger.log(self.__tag, "Buffered", poptus.LOG_LEVEL_DEFAULT)
+        self.assertEqual(0, self.__filename.stat().st_size)
+
+        logger.flush()
+        self.assertEqual([f"[{self.__tag}] Buffered\n"],
+                         list(poptus.decode_binary_log(self.__filename)))
+
+        # Logging after closing reopens and appends
+        logger.close()
+        logger.warn(self.__tag, "Reopened")
+        logger.close()
+        self.assertEqual([f"[{self.__tag}] Buffered\n",
+                          f"[{self.__tag}] WARNING - Reopened\n"],
+                         list(poptus.decode_binary_log(self.__filename)))
+
+
+if __name__ == "__main__":
+    unittest.main()
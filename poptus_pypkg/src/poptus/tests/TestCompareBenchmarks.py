@@ -0,0 +1,103 @@
+"""
+Automatic unittest of the compare_benchmarks function and the benchmark command
+line interface
+"""
+
+import os
+import io
+import json
+import shutil
+import unittest
+
+from pathlib import Path
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
+import poptus
+
+from poptus.__main__ import main
+
+
+class TestCompareBenchmarks(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_compare")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+
+        self.__baseline = {"ns_per_call": {"a": 100.0, "b": 100.0,
+                                           "c": 100.0, "old": 1.0}}
+        self.__current = {"ns_per_call": {"a": 105.0, "b": 150.0,
+                                          "c": 50.0, "new": 1.0}}
+        self.__files = []
+        for name, results in [("baseline", self.__baseline),
+                              ("current", self.__current)]:
+            filename = self.__dir.joinpath(f"{name}.json")
+            with open(filename, "w") as fptr:
+                json.dump(results, fptr)
+            self.__files.append(filename)
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def testBadArguments(self):
+        for bad, exception in [(None, TypeError), ("0.1", TypeError),
+                               (True, TypeError), (-0.1, ValueError)]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.compare_benchmarks(self.__baseline, self.__current,
+                                              tolerance=bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for bad in [None, [], {}, {"a": 1.0}]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.compare_benchmarks(bad, self.__current)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testCompare(self):
+        for baseline, current in [(self.__baseline, self.__current),
+                                  self.__files]:
+            with redirect_stdout(io.StringIO()) as buffer:
+                regressions = poptus.compare_benchmarks(baseline, current)
+            self.assertEqual({"b": 1.5}, regressions)
+
+            lines = buffer.getvalue().splitlines()
+            self.assertEqual(3, len(lines))
+            self.assertTrue(lines[1].startswith("b "))
+            self.assertTrue(lines[1].endswith("REGRESSION"))
+            self.assertFalse(lines[0].endswith("REGRESSION"))
+
+        regressions = poptus.compare_benchmarks(self.__baseline,
+                                                self.__current,
+                                                tolerance=0.01, verbosity=0)
+        self.assertEqual({"a": 1.05, "b": 1.5}, regressions)
+
+    def testCommandLine(self):
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(1, main(["compare"] +
+                                     [str(e) for e in self.__files]))
+            self.assertEqual(0, main(["compare"] +
+                                     [str(e) for e in self.__files] +
+                                     ["--tolerance", "1.0"]))
+
+        filename = self.__dir.joinpath("results.json")
+        with redirect_stdout(io.StringIO()) as buffer:
+            self.assertEqual(0, main(["benchmark", "-o", str(filename),
+                                      "--number", "1", "--repeat", "1",
+                                      "--threads", "1"]))
+        self.assertTrue(filename.is_file())
+        self.assertTrue(buffer.getvalue() != "")
+
+
+if __name__ == "__main__":
+    unittest.main()
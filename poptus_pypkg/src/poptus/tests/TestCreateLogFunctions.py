@@ -2,8 +2,13 @@
 Automatic unittest of the create_log_functions function
 """
 
+import os
 import io
+import gc
 import unittest
+import threading
+
+from pathlib import Path
 
 from contextlib import (
     redirect_stdout, redirect_stderr
@@ -184,3 +189,599 @@ class TestCreateLogFunctions(unittest.TestCase):
                         log_and_abort(my_exception, MSG)
                 # print(level, buffer.getvalue())
                 self.assertEqual(EXPECTED_MSG, buffer.getvalue())
+
+    def testLazyMessages(self):
+        DEBUG_LEVELS = range(poptus.LOG_LEVEL_MIN_DEBUG, poptus.LOG_LEVEL_MAX+1)
+
+        class CountFormats:
+            def __init__(self):
+                self.n_formats = 0
+
+            def __format__(self, spec):
+                self.n_formats += 1
+                return "formatted"
+
+        value = CountFormats()
+        n_calls = 0
+
+        def build_message():
+            nonlocal n_calls
+            n_calls += 1
+            return "built"
+
+        # Messages never built if they will not be logged
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_NONE)
+        log, log_debug, _, _ = poptus.create_log_functions(logger, self.__tag)
+        with redirect_stdout(io.StringIO()) as buffer:
+            log(build_message)
+            log("Value = {}", value)
+            for level in DEBUG_LEVELS:
+                log_debug(build_message, level)
+                log_debug("Value = {} at {}", level, value, value)
+        self.assertEqual("", buffer.getvalue())
+        self.assertEqual(0, n_calls)
+        self.assertEqual(0, value.n_formats)
+
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_MIN_DEBUG)
+        log, log_debug, warn, log_and_abort = \
+            poptus.create_log_functions(logger, self.__tag)
+
+        expected = [
+            f"[{self.__tag}] built\n",
+            f"[{self.__tag}] Value = formatted\n",
+            f"[{self.__tag}] built\n",
+            f"[{self.__tag}] Value = formatted at formatted\n",
+            f"[{self.__tag}] WARNING - Value = formatted\n",
+        ]
+        with redirect_stdout(io.StringIO()) as buffer:
+            log(build_message)
+            log("Value = {}", value)
+            for level in DEBUG_LEVELS:
+                log_debug(build_message, level)
+                log_debug("Value = {} at {}", level, value, value)
+            warn("Value = {}", value)
+        self.assertEqual("".join(expected), buffer.getvalue())
+        self.assertEqual(2, n_calls)
+        self.assertEqual(4, value.n_formats)
+
+        EXPECTED_MSG = f"[{self.__tag}] ERROR - Value = formatted\n"
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(RuntimeError):
+                log_and_abort(RuntimeError, "Value = {}", value)
+        self.assertEqual(EXPECTED_MSG, buffer.getvalue())
+
+        # Messages with braces but without arguments are logged as given
+        with redirect_stdout(io.StringIO()) as buffer:
+            log("Empty set {}")
+        self.assertEqual(f"[{self.__tag}] Empty set {{}}\n", buffer.getvalue())
+
+    def testIsEnabled(self):
+        MSG_LEVELS = range(poptus.LOG_LEVEL_DEFAULT, poptus.LOG_LEVEL_MAX+1)
+
+        for level in poptus.LOG_LEVELS:
+            logger = poptus.StandardLogger(level)
+            functions = poptus.create_log_functions(logger, self.__tag)
+            self.assertTrue(isinstance(functions, poptus.LogFunctions))
+            self.assertTrue(logger is functions.logger)
+            self.assertEqual(self.__tag, functions.caller)
+
+            for msg_level in MSG_LEVELS:
+                self.assertEqual(msg_level <= level,
+                                 functions.is_enabled(msg_level))
+            with self.assertRaises(AssertionError):
+                functions.is_enabled(poptus.LOG_LEVEL_NONE)
+            with self.assertRaises(AssertionError):
+                functions.is_enabled(poptus.LOG_LEVEL_MAX + 1)
+
+    def testTupleInterface(self):
+        functions = poptus.create_log_functions(self.__good_logger, self.__tag)
+        self.assertEqual(4, len(functions))
+        self.assertEqual(4, len(tuple(functions)))
+        self.assertEqual(functions.log, functions[0])
+        self.assertEqual(functions.log_debug, functions[1])
+        self.assertEqual(functions.warn, functions[2])
+        self.assertEqual(functions.log_and_abort, functions[-1])
+
+    def testLogFieldsFunction(self):
+        EXPECTED_MSG = f"[{self.__tag}] Iteration 2 iteration=2 f=0.5\n"
+
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        functions = poptus.create_log_functions(logger, self.__tag)
+        with self.assertRaises(AssertionError):
+            functions.log_fields("Bad", poptus.LOG_LEVEL_NONE, iteration=1)
+        with self.assertRaises(AssertionError):
+            functions.log_fields("Bad", poptus.LOG_LEVEL_MAX + 1, iteration=1)
+
+        # Fields appended to message by text loggers
+        with redirect_stdout(io.StringIO()) as buffer:
+            functions.log_fields("Iteration {}", poptus.LOG_LEVEL_DEFAULT, 2,
+                                 iteration=2, f=0.5)
+            functions.log_fields("Skipped", poptus.LOG_LEVEL_MIN_DEBUG,
+                                 iteration=3)
+        self.assertEqual(EXPECTED_MSG, buffer.getvalue())
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            functions.log_fields("", poptus.LOG_LEVEL_DEFAULT, iteration=4)
+        self.assertEqual(f"[{self.__tag}] iteration=4\n", buffer.getvalue())
+
+    def testLogArrayFunction(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+        MIN_DEBUG = poptus.LOG_LEVEL_MIN_DEBUG
+
+        class CountAccesses:
+            def __init__(self):
+                self.n_accesses = 0
+
+            def __iter__(self):
+                self.n_accesses += 1
+                return iter([1.0, 2.0])
+
+        logger = poptus.StandardLogger(DEFAULT)
+        functions = poptus.create_log_functions(logger, self.__tag)
+        with self.assertRaises(AssertionError):
+            functions.log_array("x", [1.0], poptus.LOG_LEVEL_NONE)
+        with self.assertRaises(AssertionError):
+            functions.log_array("x", [1.0], poptus.LOG_LEVEL_MAX + 1)
+
+        # Arrays not accessed if they will not be logged
+        arr = CountAccesses()
+        with redirect_stdout(io.StringIO()) as buffer:
+            functions.log_array("x", arr, MIN_DEBUG)
+        self.assertEqual("", buffer.getvalue())
+        self.assertEqual(0, arr.n_accesses)
+
+        expected = [
+            "x = [1, 2] (n=2, 2-norm=2.23607, inf-norm=2)",
+            "x_0 = [0.333, 0.667, ..., 33, 33.3] (n=100, 2-norm=194, "
+            + "inf-norm=33.3)",
+            "x_0 = [...] (n=100, 2-norm=194, inf-norm=33.3)",
+            "empty = [] (n=0, 2-norm=0, inf-norm=0)",
+            "e_1 = [-1, ..., 0] (n=3, 2-norm=1, inf-norm=1)"
+        ]
+        with redirect_stdout(io.StringIO()) as buffer:
+            functions.log_array("x", arr, DEFAULT)
+            x_0 = [(i + 1) / 3.0 for i in range(100)]
+            functions.log_array("x_0", x_0, DEFAULT, 3, 2)
+            functions.log_array("x_0", tuple(x_0), DEFAULT, 3, 0)
+            functions.log_array("empty", [], DEFAULT)
+            functions.log_array("e_1", [-1, 0, 0], DEFAULT, edge_items=1)
+        self.assertEqual("".join(f"[{self.__tag}] {e}\n" for e in expected),
+                         buffer.getvalue())
+        self.assertEqual(1, arr.n_accesses)
+
+        try:
+            import numpy as np
+        except ImportError:
+            return
+
+        expected = [
+            "x_0 = [0.333, 0.667, ..., 33, 33.3] (n=100, 2-norm=194, "
+            + "inf-norm=33.3)",
+            "A = [1, 0, 0, ..., 0, 0, -1] (shape=(3, 3), 2-norm=1.73205, "
+            + "inf-norm=1)"
+        ]
+        with redirect_stdout(io.StringIO()) as buffer:
+            functions.log_array("x_0", np.array(x_0), DEFAULT, 3, 2)
+            functions.log_array("A", np.diag([1.0, 1.0, -1.0]), DEFAULT)
+        self.assertEqual("".join(f"[{self.__tag}] {e}\n" for e in expected),
+                         buffer.getvalue())
+
+    def testCallerLevels(self):
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        logger.set_caller_levels({"Method": poptus.LOG_LEVEL_MAX,
+                                  "Model": poptus.LOG_LEVEL_NONE})
+
+        method = poptus.create_log_functions(logger, "Method.linesearch")
+        model = poptus.create_log_functions(logger, "Model")
+        other = poptus.create_log_functions(logger, "Other")
+        self.assertTrue(method.is_enabled(poptus.LOG_LEVEL_MAX))
+        self.assertFalse(model.is_enabled(poptus.LOG_LEVEL_DEFAULT))
+        self.assertTrue(other.is_enabled(poptus.LOG_LEVEL_DEFAULT))
+        self.assertFalse(other.is_enabled(poptus.LOG_LEVEL_MIN_DEBUG))
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            method.log_debug("Debug", poptus.LOG_LEVEL_MAX)
+            model.log("General")
+            model.warn("Careful")
+            other.log_debug("Debug", poptus.LOG_LEVEL_MIN_DEBUG)
+        self.assertEqual("[Method.linesearch] Debug\n"
+                         + "[Model] WARNING - Careful\n",
+                         buffer.getvalue())
+
+    def testRuntimeLevels(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+        MAX = poptus.LOG_LEVEL_MAX
+
+        logger = poptus.StandardLogger(DEFAULT)
+        method = poptus.create_log_functions(logger, "Method.linesearch")
+        other = poptus.create_log_functions(logger, "Other")
+        self.assertFalse(method.is_enabled(MAX))
+
+        # Existing log functions see all changes
+        logger.level = MAX
+        self.assertTrue(method.is_enabled(MAX))
+        self.assertTrue(other.is_enabled(MAX))
+
+        logger.set_caller_levels({"Method": poptus.LOG_LEVEL_NONE})
+        self.assertFalse(method.is_enabled(DEFAULT))
+        self.assertTrue(other.is_enabled(MAX))
+
+        logger.set_caller_levels({})
+        logger.level = poptus.LOG_LEVEL_NONE
+        self.assertFalse(method.is_enabled(DEFAULT))
+        self.assertFalse(other.is_enabled(DEFAULT))
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            method.log("Not logged")
+            logger.level = DEFAULT
+            method.log("Logged")
+            method.log_debug("Not logged", poptus.LOG_LEVEL_MIN_DEBUG)
+        self.assertEqual("[Method.linesearch] Logged\n", buffer.getvalue())
+
+        # Changes made to the loggers wrapped by other loggers are seen by log
+        # functions of the wrapping loggers
+        sinks = [poptus.StandardLogger(DEFAULT),
+                 poptus.StandardLogger(DEFAULT)]
+        fan_out = poptus.FanOutLogger(sinks)
+        queue = poptus.QueueLogger(fan_out)
+        ring = poptus.RingBufferLogger(sinks[1], 8, DEFAULT)
+        through_fan_out = poptus.create_log_functions(fan_out, "Method")
+        through_queue = poptus.create_log_functions(queue, "Method")
+        through_ring = poptus.create_log_functions(ring, "Method")
+        for functions in [through_fan_out, through_queue, through_ring]:
+            self.assertFalse(functions.is_enabled(MAX))
+
+        sinks[1].level = MAX
+        self.assertEqual(MAX, fan_out.level)
+        self.assertEqual(MAX, queue.level)
+        for functions in [through_fan_out, through_queue, through_ring]:
+            self.assertTrue(functions.is_enabled(MAX))
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            through_queue.log_debug("Logged once", MAX)
+            queue.flush()
+        self.assertEqual("[Method] Logged once\n", buffer.getvalue())
+
+        # Changing the level of wrapping loggers changes wrapped loggers
+        queue.level = DEFAULT
+        self.assertEqual([DEFAULT, DEFAULT],
+                         [sink.level for sink in sinks])
+        self.assertFalse(through_queue.is_enabled(MAX))
+        queue.close()
+
+    def testConcurrentLevelChanges(self):
+        N_THREADS = 4
+        N_CALLS = 2000
+
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_NONE)
+        functions = [poptus.create_log_functions(logger, f"Thread{i}")
+                     for i in range(N_THREADS)]
+
+        def run(log_functions):
+            for _ in range(N_CALLS):
+                log_functions.log_debug("Debug", poptus.LOG_LEVEL_MAX)
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            threads = [threading.Thread(target=run, args=(e,))
+                       for e in functions]
+            for thread in threads:
+                thread.start()
+            for level in list(poptus.LOG_LEVELS) * 50:
+                logger.level = level
+            logger.level = poptus.LOG_LEVEL_NONE
+            for thread in threads:
+                thread.join()
+
+        # All messages are either logged whole or not at all
+        lines = buffer.getvalue().splitlines()
+        self.assertTrue(len(lines) <= N_THREADS * N_CALLS)
+        for line in lines:
+            self.assertRegex(line, r"^\[Thread\d\] Debug$")
+        for log_functions in functions:
+            self.assertFalse(log_functions.is_enabled(poptus.LOG_LEVEL_DEFAULT))
+
+    def testBadThrottles(self):
+        DEBUG = poptus.LOG_LEVEL_MIN_DEBUG
+        bad_args = [
+            (TypeError, {"sample": 1}),
+            (TypeError, {"rate_limit": [(DEBUG, (1.0, 1))]}),
+            (ValueError, {"sample": {poptus.LOG_LEVEL_NONE: 2}}),
+            (ValueError, {"sample": {poptus.LOG_LEVEL_MAX + 1: 2}}),
+            (ValueError, {"rate_limit": {None: (1.0, 1)}}),
+            (TypeError, {"sample": {DEBUG: None}}),
+            (TypeError, {"sample": {DEBUG: "2"}}),
+            (TypeError, {"sample": {DEBUG: True}}),
+            (ValueError, {"sample": {DEBUG: 0}}),
+            (ValueError, {"sample": {DEBUG: 0.0}}),
+            (ValueError, {"sample": {DEBUG: 1.5}}),
+            (TypeError, {"rate_limit": {DEBUG: 1.0}}),
+            (TypeError, {"rate_limit": {DEBUG: [1.0, 1]}}),
+            (TypeError, {"rate_limit": {DEBUG: (1.0,)}}),
+            (TypeError, {"rate_limit": {DEBUG: (1.0, "1")}}),
+            (ValueError, {"rate_limit": {DEBUG: (0.0, 1)}}),
+            (ValueError, {"rate_limit": {DEBUG: (1.0, 0.5)}})
+        ]
+        for exception, kwargs in bad_args:
+            with redirect_stdout(io.StringIO()), \
+                    redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.create_log_functions(self.__good_logger,
+                                                self.__good_tag, **kwargs)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testSampling(self):
+        DEBUG = poptus.LOG_LEVEL_MIN_DEBUG
+
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_MAX)
+        functions = poptus.create_log_functions(
+            logger, "Model",
+            sample={poptus.LOG_LEVEL_DEFAULT: 1.0, DEBUG: 3, DEBUG + 1: 0.5}
+        )
+        self.assertEqual({poptus.LOG_LEVEL_DEFAULT: 0, DEBUG: 0, DEBUG + 1: 0},
+                         functions.n_suppressed)
+
+        built = []
+
+        def message():
+            built.append(1)
+            return "Sampled"
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            for i in range(7):
+                functions.log_debug("Debug {}", DEBUG, i)
+                functions.log_debug(message, DEBUG + 1)
+                functions.log("General")
+            for i in range(1000):
+                functions.log_debug(message, DEBUG + 1)
+            # Levels that are not throttled are not affected
+            functions.log_debug("Max", poptus.LOG_LEVEL_MAX)
+        lines = buffer.getvalue().splitlines()
+        self.assertEqual(["[Model] Debug 0", "[Model] Debug 3",
+                          "[Model] Debug 6"],
+                         [e for e in lines if "Debug" in e])
+        self.assertEqual(7, lines.count("[Model] General"))
+        self.assertEqual(1, lines.count("[Model] Max"))
+
+        # Suppressed messages are not built
+        n_sampled = lines.count("[Model] Sampled")
+        self.assertEqual(n_sampled, len(built))
+        self.assertTrue(400 < n_sampled < 600)
+        self.assertEqual({poptus.LOG_LEVEL_DEFAULT: 0, DEBUG: 4,
+                          DEBUG + 1: 1007 - n_sampled},
+                         functions.n_suppressed)
+        with redirect_stdout(io.StringIO()):
+            functions.write_summary()
+
+    def testRateLimit(self):
+        DEBUG = poptus.LOG_LEVEL_MIN_DEBUG
+
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_MAX)
+        functions = poptus.create_log_functions(
+            logger, "Model",
+            sample={DEBUG: 2}, rate_limit={DEBUG: (1.0e-6, 3),
+                                           poptus.LOG_LEVEL_MAX: (1.0e9, 2)}
+        )
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            for i in range(20):
+                functions.log_debug("Debug {}", DEBUG, i)
+                functions.log_fields("Fields", poptus.LOG_LEVEL_MAX, i=i)
+        lines = buffer.getvalue().splitlines()
+
+        # The rate limit is applied to sampled messages
+        self.assertEqual(["[Model] Debug 0", "[Model] Debug 2",
+                          "[Model] Debug 4"],
+                         [e for e in lines if "Debug" in e])
+        self.assertEqual(17, functions.n_suppressed[DEBUG])
+
+        # The bucket is refilled quickly enough for the high rate
+        self.assertTrue(lines.count("[Model] Fields i=0"))
+        self.assertTrue(len([e for e in lines if "Fields" in e]) > 2)
+        with redirect_stdout(io.StringIO()):
+            functions.write_summary()
+
+    def testSummary(self):
+        DEBUG = poptus.LOG_LEVEL_MIN_DEBUG
+
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_MAX)
+        functions = poptus.create_log_functions(
+            logger, "Model", sample={DEBUG: 10, poptus.LOG_LEVEL_MAX: 5}
+        )
+
+        # Messages suppressed by the verbosity level are not counted
+        with redirect_stdout(io.StringIO()) as buffer:
+            for i in range(25):
+                functions.log_debug("Debug", DEBUG)
+            logger.level = DEBUG
+            for i in range(25):
+                functions.log_debug("Max", poptus.LOG_LEVEL_MAX)
+            functions.write_summary()
+        self.assertEqual(["[Model] Suppressed 22 of 25 level 2 messages "
+                          + "level=2 suppressed=22 total=25"],
+                         buffer.getvalue().splitlines()[3:])
+
+        # Counts are reset by the summary
+        self.assertEqual({DEBUG: 0, poptus.LOG_LEVEL_MAX: 0},
+                         functions.n_suppressed)
+        with redirect_stdout(io.StringIO()) as buffer:
+            functions.write_summary()
+        self.assertEqual("", buffer.getvalue())
+
+        # Summaries are structured records in structured logs
+        filename = Path.cwd().joinpath("delete_me_summary.jsonl")
+        try:
+            logger = poptus.JsonLinesLogger(filename, True)
+            functions = poptus.create_log_functions(
+                logger, "Model", rate_limit={poptus.LOG_LEVEL_DEFAULT: (1, 1)}
+            )
+            for _ in range(3):
+                functions.log("General")
+            functions.write_summary()
+            logger.close()
+            records = list(poptus.read_json_lines_log(filename))
+        finally:
+            if filename.exists():
+                os.remove(filename)
+        self.assertEqual(2, len(records))
+        self.assertEqual({"level": poptus.LOG_LEVEL_DEFAULT,
+                          "suppressed": 2, "total": 3},
+                         records[1]["fields"])
+
+    def testSummaryOfUnusedFunctions(self):
+        DEBUG = poptus.LOG_LEVEL_MIN_DEBUG
+
+        logger = poptus.StandardLogger(DEBUG)
+
+        # Methods typically create log functions that are no longer in use
+        # once the method returns, which can be long before exit
+        def run_method():
+            _, log_debug, _, _ = poptus.create_log_functions(
+                logger, "Model", sample={DEBUG: 10}
+            )
+            for i in range(25):
+                log_debug("Debug {}", DEBUG, i)
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            run_method()
+            gc.collect()
+        self.assertEqual(["[Model] Suppressed 22 of 25 level 2 messages "
+                          + "level=2 suppressed=22 total=25"],
+                         buffer.getvalue().splitlines()[3:])
+
+        # Summaries written on request are not written again
+        with redirect_stdout(io.StringIO()) as buffer:
+            functions = poptus.create_log_functions(
+                logger, "Model", rate_limit={DEBUG: (1.0e-6, 1)}
+            )
+            for _ in range(3):
+                functions.log_debug("Debug", DEBUG)
+            functions.write_summary()
+            del functions
+            gc.collect()
+        self.assertEqual(2, len(buffer.getvalue().splitlines()))
+
+    def testSpans(self):
+        DEBUG = poptus.LOG_LEVEL_MIN_DEBUG
+
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        method = poptus.create_log_functions(logger, "Method")
+        model = poptus.create_log_functions(logger, "Model")
+
+        def evaluate(x):
+            if x < 0:
+                raise ValueError("Negative")
+            return 2 * x
+
+        # Spans of disabled levels are not timed and all share one object
+        self.assertTrue(model.span("Evaluate", DEBUG) is
+                        method.span("Run", poptus.LOG_LEVEL_MAX))
+        self.assertTrue(model.span("Evaluate", DEBUG)(evaluate) is evaluate)
+        with redirect_stdout(io.StringIO()) as buffer:
+            with method.span("Run", DEBUG):
+                self.assertEqual(2, evaluate(1))
+        self.assertEqual("", buffer.getvalue())
+        self.assertEqual({}, method.timings)
+        self.assertEqual({}, model.timings)
+
+        # Spans nest across callers and decorated functions see level changes
+        logger.level = DEBUG
+        evaluate = model.span("Evaluate", DEBUG)(evaluate)
+        self.assertEqual("evaluate", evaluate.__name__)
+        logger.level = poptus.LOG_LEVEL_DEFAULT
+        with redirect_stdout(io.StringIO()) as buffer:
+            self.assertEqual(2, evaluate(1))
+        self.assertEqual("", buffer.getvalue())
+        self.assertEqual({}, model.timings)
+
+        logger.level = DEBUG
+        with redirect_stdout(io.StringIO()) as buffer:
+            with method.span("Run", DEBUG):
+                for i in range(4):
+                    self.assertEqual(2 * i, evaluate(i))
+                with self.assertRaises(ValueError):
+                    evaluate(-1)
+            with method.span("Quiet", poptus.LOG_LEVEL_MAX):
+                evaluate(1)
+        lines = buffer.getvalue().splitlines()
+        self.assertEqual(7, len(lines))
+        for line in lines[:5]:
+            self.assertTrue(line.startswith("[Model] Run/Evaluate took "))
+            self.assertTrue(" span=Run/Evaluate wall=" in line)
+        self.assertTrue(lines[5].startswith("[Method] Run took "))
+        self.assertTrue(lines[6].startswith("[Model] Evaluate took "))
+
+        self.assertEqual({"Run"}, set(method.timings))
+        timings = model.timings
+        self.assertEqual({"Run/Evaluate", "Evaluate"}, set(timings))
+        summary = timings["Run/Evaluate"]
+        self.assertEqual(5, summary["count"])
+        self.assertAlmostEqual(summary["total"] / 5, summary["mean"])
+        self.assertTrue(0.0 <= summary["p50"] <= summary["p95"]
+                        <= summary["p99"] <= summary["total"])
+        self.assertTrue(summary["cpu"] >= 0.0)
+        self.assertTrue(method.timings["Run"]["total"] >= summary["total"])
+
+        # Tables are written once per caller with one line per span
+        with redirect_stdout(io.StringIO()) as buffer:
+            model.write_timings()
+            model.write_timings()
+        lines = buffer.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertEqual(["[Model]", "Span", "Count", "Total", "[s]"],
+                         lines[0].split()[:5])
+        self.assertEqual(["[Model]", "Evaluate", "1"], lines[1].split()[:3])
+        self.assertEqual(["[Model]", "Run/Evaluate", "5"],
+                         lines[2].split()[:3])
+        self.assertEqual({}, model.timings)
+
+        # Tables are not written if the caller's level is NONE
+        logger.level = poptus.LOG_LEVEL_NONE
+        with redirect_stdout(io.StringIO()) as buffer:
+            method.write_timings()
+        self.assertEqual("", buffer.getvalue())
+        self.assertEqual({}, method.timings)
+
+    def testTimingsOfUnusedFunctions(self):
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+
+        def run_method():
+            functions = poptus.create_log_functions(logger, "Method")
+            with functions.span("Run", poptus.LOG_LEVEL_DEFAULT):
+                pass
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            run_method()
+            gc.collect()
+        lines = buffer.getvalue().splitlines()
+        self.assertEqual(3, len(lines))
+        self.assertTrue(lines[0].startswith("[Method] Run took "))
+        self.assertEqual(["[Method]", "Span", "Count"], lines[1].split()[:3])
+        self.assertEqual(["[Method]", "Run", "1"], lines[2].split()[:3])
+
+    def testConcurrentSpans(self):
+        N_THREADS = 4
+        N_SPANS = 200
+
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        functions = poptus.create_log_functions(logger, "Model")
+
+        def work():
+            for _ in range(N_SPANS):
+                with functions.span("Outer", poptus.LOG_LEVEL_DEFAULT):
+                    with functions.span("Inner", poptus.LOG_LEVEL_DEFAULT):
+                        pass
+
+        threads = [threading.Thread(target=work) for _ in range(N_THREADS)]
+        with redirect_stdout(io.StringIO()):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        timings = functions.timings
+        self.assertEqual({"Outer", "Outer/Inner"}, set(timings))
+        for summary in timings.values():
+            self.assertEqual(N_THREADS * N_SPANS, summary["count"])
+        with redirect_stdout(io.StringIO()):
+            functions.write_timings()
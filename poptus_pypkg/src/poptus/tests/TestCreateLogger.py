@@ -152,6 +152,15 @@ class TestCreateLogger(unittest.TestCase):
         # print(buffer.getvalue())
         self.assertTrue(buffer.getvalue().startswith(self.__error_start))
 
+        # Invalid buffer size
+        bad = self.__good_file_config.copy()
+        bad[poptus._constants.LOG_BUFFER_SIZE_KEY] = 0
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(ValueError):
+                poptus.create_logger(bad)
+        # print(buffer.getvalue())
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
     def testCreateStandardLogger(self):
         for level in self.__valid_levels:
             good = self.__good_std_config.copy()
@@ -160,6 +169,70 @@ class TestCreateLogger(unittest.TestCase):
             self.assertTrue(isinstance(logger, poptus.StandardLogger))
             self.assertEqual(level, logger.level)
 
+    def testCreateBufferedStandardLogger(self):
+        good = self.__good_std_config.copy()
+        good[poptus._constants.LOG_BUFFER_SIZE_KEY] = 8192
+        good[poptus._constants.LOG_FLUSH_INTERVAL_KEY] = 0.5
+        logger = poptus.create_logger(good)
+        self.assertTrue(isinstance(logger, poptus.StandardLogger))
+        self.assertEqual(8192, logger.buffer_size)
+        self.assertEqual(0.5, logger.flush_interval)
+
+        # Flush interval is not available for file loggers
+        bad = self.__good_file_config.copy()
+        bad[poptus._constants.LOG_FLUSH_INTERVAL_KEY] = 0.5
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(ValueError):
+                poptus.create_logger(bad)
+        # print(buffer.getvalue())
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testCreateFanOutLogger(self):
+        sinks_key = poptus._constants.LOG_SINKS_KEY
+        good = {sinks_key: [self.__good_std_config.copy(),
+                            self.__good_file_config.copy()]}
+        good[sinks_key][0][poptus._constants.LOG_LEVEL_KEY] = \
+            poptus.LOG_LEVEL_NONE
+        good[sinks_key][1][poptus._constants.LOG_LEVEL_KEY] = \
+            poptus.LOG_LEVEL_MAX
+        logger = poptus.create_logger(good)
+        self.assertTrue(isinstance(logger, poptus.FanOutLogger))
+        self.assertEqual(poptus.LOG_LEVEL_MAX, logger.level)
+        self.assertEqual(2, len(logger.loggers))
+        self.assertTrue(isinstance(logger.loggers[0], poptus.StandardLogger))
+        self.assertTrue(isinstance(logger.loggers[1], poptus.FileLogger))
+
+        for bad, exception in [({sinks_key: None}, TypeError),
+                               ({sinks_key: self.__good_std_config},
+                                TypeError),
+                               ({sinks_key: []}, ValueError),
+                               ({sinks_key: [1]}, TypeError),
+                               ({sinks_key: [self.__good_std_config],
+                                 poptus._constants.LOG_LEVEL_KEY:
+                                 poptus.LOG_LEVEL_DEFAULT}, ValueError)]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.create_logger(bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testCreateWithCallerLevels(self):
+        levels = {"Method": poptus.LOG_LEVEL_MAX}
+        for base in [self.__good_std_config, self.__good_file_config]:
+            good = base.copy()
+            good[poptus._constants.LOG_CALLER_LEVELS_KEY] = levels
+            logger = poptus.create_logger(good)
+            self.assertEqual(levels, logger.caller_levels)
+            self.assertEqual(poptus.LOG_LEVEL_MAX, logger.level_of("Method"))
+
+            bad = base.copy()
+            bad[poptus._constants.LOG_CALLER_LEVELS_KEY] = {"Method": -1}
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.create_logger(bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
     def testCreateFileLogger(self):
         for level in self.__valid_levels:
             good = self.__good_file_config.copy()
@@ -169,3 +242,107 @@ class TestCreateLogger(unittest.TestCase):
             self.assertEqual(level, logger.level)
             self.assertEqual(good[poptus._constants.LOG_FILENAME_KEY],
                              logger.filename)
+            self.assertIsNone(logger.buffer_size)
+
+    def testCreateShardedFileLogger(self):
+        good = self.__good_file_config.copy()
+        good[poptus._constants.LOG_SHARDED_KEY] = True
+        logger = poptus.create_logger(good)
+        self.assertTrue(isinstance(logger, poptus.ShardedFileLogger))
+
+        good[poptus._constants.LOG_SHARDED_KEY] = False
+        logger = poptus.create_logger(good)
+        self.assertFalse(isinstance(logger, poptus.ShardedFileLogger))
+        self.assertTrue(isinstance(logger, poptus.FileLogger))
+
+        for bad in [None, 0, 1, "True", [True]]:
+            bad_cfg = self.__good_file_config.copy()
+            bad_cfg[poptus._constants.LOG_SHARDED_KEY] = bad
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(TypeError):
+                    poptus.create_logger(bad_cfg)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testCreateJsonLinesLogger(self):
+        good = self.__good_file_config.copy()
+        good[poptus._constants.LOG_FORMAT_KEY] = poptus.LOG_FORMAT_JSON_LINES
+        logger = poptus.create_logger(good)
+        self.assertTrue(isinstance(logger, poptus.JsonLinesLogger))
+
+        good[poptus._constants.LOG_FORMAT_KEY] = poptus.LOG_FORMAT_TEXT
+        logger = poptus.create_logger(good)
+        self.assertFalse(isinstance(logger, poptus.JsonLinesLogger))
+        self.assertTrue(isinstance(logger, poptus.FileLogger))
+
+        for bad in [None, 1, "", "JSON", [poptus.LOG_FORMAT_TEXT]]:
+            bad_cfg = self.__good_file_config.copy()
+            bad_cfg[poptus._constants.LOG_FORMAT_KEY] = bad
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.create_logger(bad_cfg)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        # Sharded loggers are text only
+        bad_cfg = self.__good_file_config.copy()
+        bad_cfg[poptus._constants.LOG_SHARDED_KEY] = True
+        bad_cfg[poptus._constants.LOG_FORMAT_KEY] = \
+            poptus.LOG_FORMAT_JSON_LINES
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(ValueError):
+                poptus.create_logger(bad_cfg)
+        # print(buffer.getvalue())
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testCreateBinaryLogger(self):
+        good = self.__good_file_config.copy()
+        good[poptus._constants.LOG_FORMAT_KEY] = poptus.LOG_FORMAT_BINARY
+        logger = poptus.create_logger(good)
+        self.assertTrue(isinstance(logger, poptus.BinaryLogger))
+
+        # Sharded loggers are text only
+        bad_cfg = good.copy()
+        bad_cfg[poptus._constants.LOG_SHARDED_KEY] = True
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(ValueError):
+                poptus.create_logger(bad_cfg)
+        # print(buffer.getvalue())
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testCreateRotatingFileLogger(self):
+        good = self.__good_file_config.copy()
+        good[poptus._constants.LOG_MAX_BYTES_KEY] = 1024
+        good[poptus._constants.LOG_MAX_AGE_KEY] = 3600.0
+        good[poptus._constants.LOG_KEEP_KEY] = 3
+        good[poptus._constants.LOG_COMPRESSION_KEY] = \
+            poptus.LOG_COMPRESSION_LZMA
+        for log_format in [poptus.LOG_FORMAT_TEXT,
+                           poptus.LOG_FORMAT_JSON_LINES]:
+            good[poptus._constants.LOG_FORMAT_KEY] = log_format
+            logger = poptus.create_logger(good)
+            self.assertTrue(isinstance(logger, poptus.FileLogger))
+            self.assertEqual(1024, logger.max_bytes)
+            self.assertEqual(3600.0, logger.max_age)
+            self.assertEqual(3, logger.keep)
+            self.assertEqual(poptus.LOG_COMPRESSION_LZMA, logger.compression)
+
+        # Only text and JSON Lines file loggers rotate
+        for key, value in [(poptus._constants.LOG_SHARDED_KEY, True),
+                           (poptus._constants.LOG_FORMAT_KEY,
+                            poptus.LOG_FORMAT_BINARY)]:
+            bad_cfg = self.__good_file_config.copy()
+            bad_cfg[poptus._constants.LOG_MAX_BYTES_KEY] = 1024
+            bad_cfg[key] = value
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.create_logger(bad_cfg)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testCreateBufferedFileLogger(self):
+        good = self.__good_file_config.copy()
+        good[poptus._constants.LOG_BUFFER_SIZE_KEY] = 8192
+        logger = poptus.create_logger(good)
+        self.assertTrue(isinstance(logger, poptus.FileLogger))
+        self.assertEqual(8192, logger.buffer_size)
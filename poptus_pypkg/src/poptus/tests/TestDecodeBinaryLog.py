@@ -0,0 +1,98 @@
+"""
+Automatic unittest of the decode_binary_log function
+"""
+
+import os
+import io
+import shutil
+import unittest
+
+from pathlib import Path
+from contextlib import redirect_stderr
+
+import poptus
+
+
+class TestDecodeBinaryLog(unittest.TestCase):
+    # All tests should suppress writing to stderr, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_decode")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.bin")
+
+        self.__error_start = "[POptUS] ERROR - "
+
+        logger = poptus.BinaryLogger(self.__filename, False,
+                                     poptus.LOG_LEVEL_MAX)
+        for level in range(poptus.LOG_LEVEL_DEFAULT, poptus.LOG_LEVEL_MAX + 1):
+            logger.log("A", f"A {level}", level)
+            logger.log("B", f"B {level}", level)
+        logger.warn("B", "Careful")
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def testBadArguments(self):
+        not_a_log = self.__dir.joinpath("not_a_log.bin")
+        with open(not_a_log, "w") as fptr:
+            fptr.write("[A] Text log\n")
+
+        for bad, exception in [(None, TypeError), (1, TypeError),
+                               (self.__dir, ValueError),
+                               (self.__dir.joinpath("none.bin"), ValueError),
+                               (not_a_log, ValueError)]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.decode_binary_log(bad)
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for bad in [-1, poptus.LOG_LEVEL_MAX + 1, "1"]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.decode_binary_log(self.__filename, level=bad)
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testFilterByCaller(self):
+        lines = list(poptus.decode_binary_log(self.__filename, callers=["A"]))
+        expected = [
+            f"[A] A {level}\n"
+            for level in range(poptus.LOG_LEVEL_DEFAULT,
+                               poptus.LOG_LEVEL_MAX + 1)
+        ]
+        self.assertEqual(expected, lines)
+
+        lines = list(poptus.decode_binary_log(self.__filename, callers=[]))
+        self.assertEqual([], lines)
+
+    def testFilterByLevel(self):
+        lines = list(poptus.decode_binary_log(
+            self.__filename, level=poptus.LOG_LEVEL_DEFAULT
+        ))
+        self.assertEqual(["[A] A 1\n", "[B] B 1\n", "[B] WARNING - Careful\n"],
+                         lines)
+
+        # Warnings are always decoded
+        lines = list(poptus.decode_binary_log(
+            self.__filename, callers={"B"}, level=poptus.LOG_LEVEL_NONE
+        ))
+        self.assertEqual(["[B] WARNING - Careful\n"], lines)
+
+    def testTruncated(self):
+        lines = list(poptus.decode_binary_log(self.__filename))
+        size = self.__filename.stat().st_size
+
+        # Simulate a crash part way through writing the final record
+        for n_cut in [1, 5, 20]:
+            with open(self.__filename, "r+b") as fptr:
+                fptr.truncate(size - n_cut)
+            self.assertEqual(lines[:-1],
+                             list(poptus.decode_binary_log(self.__filename)))
+
+
+if __name__ == "__main__":
+    unittest.main()
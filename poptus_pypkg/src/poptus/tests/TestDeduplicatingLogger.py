@@ -0,0 +1,185 @@
+"""
+Automatic unittest of the DeduplicatingLogger class
+"""
+
+import gc
+import os
+import io
+import sys
+import shutil
+import weakref
+import unittest
+import subprocess
+
+from pathlib import Path
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
+import poptus
+
+
+class TestDeduplicatingLogger(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_dedup")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.log")
+
+        self.__tag = "Unittest"
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+        self.__sink = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def testBadArguments(self):
+        bad_args = [
+            (TypeError, (None,)),
+            (TypeError, ("logger",)),
+            (TypeError, (self.__sink, 1)),
+            (TypeError, (self.__sink, True, None)),
+            (TypeError, (self.__sink, True, True, None)),
+            (TypeError, (self.__sink, True, True, True)),
+            (TypeError, (self.__sink, True, True, 1.0)),
+            (ValueError, (self.__sink, True, True, 0))
+        ]
+        for exception, args in bad_args:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.DeduplicatingLogger(*args)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testProperties(self):
+        logger = poptus.DeduplicatingLogger(self.__sink, False, True, 10)
+        self.assertTrue(isinstance(logger, poptus.AbstractLogger))
+        self.assertIs(self.__sink, logger.logger)
+        self.assertFalse(logger.warn_once)
+        self.assertTrue(logger.collapse_repeats)
+        self.assertEqual(10, logger.max_warnings)
+        self.assertEqual(0, logger.n_suppressed)
+
+        # Levels are those of the wrapped logger
+        self.assertEqual(poptus.LOG_LEVEL_DEFAULT, logger.level)
+        logger.level = poptus.LOG_LEVEL_MAX
+        self.assertEqual(poptus.LOG_LEVEL_MAX, self.__sink.level)
+        logger.set_caller_levels({"Model": poptus.LOG_LEVEL_NONE})
+        self.assertEqual({"Model": poptus.LOG_LEVEL_NONE},
+                         self.__sink.caller_levels)
+        self.assertEqual(poptus.LOG_LEVEL_NONE, logger.level_of("Model"))
+
+    def testWarnOnce(self):
+        logger = poptus.DeduplicatingLogger(self.__sink, True, False, 2)
+        with redirect_stdout(io.StringIO()) as buffer:
+            for _ in range(3):
+                logger.warn("Method", "Suspicious")
+                logger.warn("Model", "Suspicious")
+            # Evicts least recently seen warning
+            logger.warn("Model", "Other")
+            logger.warn("Method", "Suspicious")
+            logger.warn("Model", "Suspicious")
+        self.assertEqual(["[Method] WARNING - Suspicious",
+                          "[Model] WARNING - Suspicious",
+                          "[Model] WARNING - Other",
+                          "[Method] WARNING - Suspicious",
+                          "[Model] WARNING - Suspicious"],
+                         buffer.getvalue().splitlines())
+        self.assertEqual(4, logger.n_suppressed)
+
+    def testCollapseRepeats(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+
+        logger = poptus.DeduplicatingLogger(self.__sink, False)
+        with redirect_stdout(io.StringIO()) as buffer:
+            for _ in range(5):
+                logger.log("Method", "Restart", DEFAULT)
+            # Messages suppressed by verbosity level do not end the run
+            logger.log("Method", "Debug", poptus.LOG_LEVEL_MAX)
+            logger.log("Method", "Restart", DEFAULT)
+            logger.warn("Method", "Restart")
+            logger.warn("Method", "Restart")
+            logger.log("Model", "Restart", DEFAULT)
+            logger.log_fields("Model", "Restart", DEFAULT, {"i": 1})
+            logger.log_fields("Model", "Restart", DEFAULT, {"i": 1})
+            logger.log("Model", "Restart", DEFAULT)
+            logger.log("Model", "Restart", DEFAULT)
+            logger.flush()
+            logger.log("Model", "Restart", DEFAULT)
+        self.assertEqual(["[Method] Restart",
+                          "[Method] Last message repeated 5 times",
+                          "[Method] WARNING - Restart",
+                          "[Method] WARNING - Last message repeated 1 times",
+                          "[Model] Restart",
+                          "[Model] Restart i=1",
+                          "[Model] Restart i=1",
+                          "[Model] Restart",
+                          "[Model] Last message repeated 1 times",
+                          "[Model] Restart"],
+                         buffer.getvalue().splitlines())
+        self.assertEqual(7, logger.n_suppressed)
+
+        # Errors are never suppressed and end runs
+        with redirect_stdout(io.StringIO()) as buffer:
+            with redirect_stderr(io.StringIO()) as err_buffer:
+                logger.log("Model", "Restart", DEFAULT)
+                logger.error("Model", "Failed")
+                logger.error("Model", "Failed")
+        self.assertEqual("[Model] Last message repeated 1 times\n",
+                         buffer.getvalue())
+        self.assertEqual(2, err_buffer.getvalue().count("Failed"))
+
+    def testRepeatsAtExit(self):
+        env = dict(os.environ)
+        path = str(Path(poptus.__file__).resolve().parent.parent)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [path] + ([env["PYTHONPATH"]] if "PYTHONPATH" in env else [])
+        )
+        code = "import poptus\n" \
+            + "sink = poptus.StandardLogger(buffer_size=1024)\n" \
+            + "logger = poptus.DeduplicatingLogger(sink)\n" \
+            + "for _ in range(5):\n" \
+            + "    logger.log('Model', 'same', 1)\n"
+        result = subprocess.run([sys.executable, "-c", code], env=env,
+                                capture_output=True, check=True, text=True)
+        self.assertEqual("[Model] same\n"
+                         + "[Model] Last message repeated 4 times\n",
+                         result.stdout)
+
+    def testRepeatsWhenCollected(self):
+        # Loggers created by methods are typically collected before exit
+        logger = poptus.DeduplicatingLogger(self.__sink)
+        alive = weakref.ref(logger)
+        with redirect_stdout(io.StringIO()) as buffer:
+            for _ in range(5):
+                logger.log("Model", "same", 1)
+            del logger
+            gc.collect()
+        self.assertTrue(alive() is None)
+        self.assertEqual("[Model] same\n"
+                         + "[Model] Last message repeated 4 times\n",
+                         buffer.getvalue())
+
+    def testFileLogger(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+
+        sink = poptus.FileLogger(self.__filename, True, DEFAULT)
+        with poptus.DeduplicatingLogger(sink) as logger:
+            functions = poptus.create_log_functions(logger, "Method")
+            for _ in range(1000):
+                functions.warn("Stopping criteria is suspiciously large")
+                functions.log("Restarting")
+        # Suppressed warnings do not end runs of collapsed messages
+        with open(self.__filename, "r") as fptr:
+            lines = fptr.read().splitlines()
+        self.assertEqual(
+            ["[Method] WARNING - Stopping criteria is suspiciously large",
+             "[Method] Restarting",
+             "[Method] Last message repeated 999 times"],
+            lines
+        )
@@ -0,0 +1,155 @@
+"""
+Automatic unittest of the FanOutLogger class
+"""
+
+import os
+import io
+import shutil
+import unittest
+
+from pathlib import Path
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
+import poptus
+
+
+class TestFanOutLogger(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_fan_out")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.log")
+
+        self.__tag = "Unittest"
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def _load_log(self):
+        with open(self.__filename, "r") as fptr:
+            return fptr.read()
+
+    def testBadLoggers(self):
+        std_logger = poptus.StandardLogger()
+        for bad in [None, 1, [], [None], [std_logger, "logger"]]:
+            exception = ValueError if bad == [] else TypeError
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.FanOutLogger(bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testLevel(self):
+        for levels in [[poptus.LOG_LEVEL_NONE],
+                       [poptus.LOG_LEVEL_DEFAULT, poptus.LOG_LEVEL_MAX],
+                       [poptus.LOG_LEVEL_MIN_DEBUG, poptus.LOG_LEVEL_NONE]]:
+            sinks = [poptus.StandardLogger(level) for level in levels]
+            logger = poptus.FanOutLogger(iter(sinks))
+            self.assertEqual(max(levels), logger.level)
+            self.assertEqual(tuple(sinks), logger.loggers)
+            with self.assertRaises(AssertionError):
+                logger.log(self.__tag, "Bad", poptus.LOG_LEVEL_NONE)
+
+    def testFanOut(self):
+        console = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        trace = poptus.FileLogger(self.__filename, False,
+                                  poptus.LOG_LEVEL_MAX, buffer_size=4096)
+        logger = poptus.FanOutLogger([console, trace])
+        self.assertEqual(poptus.LOG_LEVEL_MAX, logger.level)
+
+        with redirect_stdout(io.StringIO()) as stdout:
+            with redirect_stderr(io.StringIO()) as stderr:
+                logger.log(self.__tag, "General", poptus.LOG_LEVEL_DEFAULT)
+                logger.log(self.__tag, "Debug", poptus.LOG_LEVEL_MAX)
+                logger.log_fields(self.__tag, "Fields",
+                                  poptus.LOG_LEVEL_MIN_DEBUG, {"x": 1})
+                logger.warn(self.__tag, "Careful")
+                logger.error(self.__tag, "Failed")
+                logger.close()
+
+        self.assertEqual(f"[{self.__tag}] General\n"
+                         + f"[{self.__tag}] WARNING - Careful\n",
+                         stdout.getvalue())
+        self.assertEqual(f"[{self.__tag}] ERROR - Failed\n", stderr.getvalue())
+        self.assertEqual(f"[{self.__tag}] General\n"
+                         + f"[{self.__tag}] Debug\n"
+                         + f"[{self.__tag}] Fields x=1\n"
+                         + f"[{self.__tag}] WARNING - Careful\n"
+                         + f"[{self.__tag}] ERROR - Failed\n",
+                         self._load_log())
+
+    def testErrorPrintedOnce(self):
+        json_fname = self.__dir.joinpath("test.jsonl")
+        trace = poptus.FileLogger(self.__filename, False, buffer_size=4096)
+        console = poptus.StandardLogger(buffer_size=4096)
+        records = poptus.QueueLogger(poptus.JsonLinesLogger(json_fname, False))
+        logger = poptus.FanOutLogger([trace, console, records])
+
+        with redirect_stdout(io.StringIO()) as stdout:
+            with redirect_stderr(io.StringIO()) as stderr:
+                logger.log(self.__tag, "General", poptus.LOG_LEVEL_DEFAULT)
+                # The console's buffered message is written before the error
+                self.assertEqual("", stdout.getvalue())
+                logger.error(self.__tag, "Failed")
+                self.assertEqual(f"[{self.__tag}] General\n",
+                                 stdout.getvalue())
+                logger.close()
+
+        self.assertEqual(f"[{self.__tag}] ERROR - Failed\n", stderr.getvalue())
+        self.assertEqual(f"[{self.__tag}] General\n"
+                         + f"[{self.__tag}] ERROR - Failed\n",
+                         self._load_log())
+        logged = list(poptus.read_json_lines_log(json_fname))
+        self.assertEqual(["General", "Failed"], [e["msg"] for e in logged])
+
+    def testCallerLevels(self):
+        console = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        trace = poptus.FileLogger(self.__filename, False,
+                                  poptus.LOG_LEVEL_MIN_DEBUG)
+        trace.set_caller_levels({"Model": poptus.LOG_LEVEL_DEFAULT})
+        logger = poptus.FanOutLogger([console, trace])
+        self.assertEqual(poptus.LOG_LEVEL_MIN_DEBUG, logger.level_of("Method"))
+        self.assertEqual(poptus.LOG_LEVEL_DEFAULT, logger.level_of("Model"))
+
+        model = poptus.create_log_functions(logger, "Model")
+        self.assertFalse(model.is_enabled(poptus.LOG_LEVEL_MIN_DEBUG))
+
+        # Levels set in the fan-out logger apply to all loggers
+        logger.set_caller_levels({"Model": poptus.LOG_LEVEL_MAX})
+        self.assertEqual({"Model": poptus.LOG_LEVEL_MAX},
+                         console.caller_levels)
+        with redirect_stdout(io.StringIO()) as buffer:
+            logger.log("Model", "Debug", poptus.LOG_LEVEL_MAX)
+            logger.log("Method", "Debug", poptus.LOG_LEVEL_MIN_DEBUG)
+        self.assertEqual("[Model] Debug\n", buffer.getvalue())
+        self.assertEqual("[Model] Debug\n[Method] Debug\n", self._load_log())
+
+    def testBuildMessageOnce(self):
+        n_calls = []
+
+        def build():
+            n_calls.append(None)
+            return "Built"
+
+        sinks = [poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT),
+                 poptus.StandardLogger(poptus.LOG_LEVEL_MIN_DEBUG)]
+        logger = poptus.FanOutLogger(sinks)
+        _, log_debug, _, _ = poptus.create_log_functions(logger, self.__tag)
+        with redirect_stdout(io.StringIO()) as buffer:
+            log_debug(build, poptus.LOG_LEVEL_MAX)
+            self.assertEqual(0, len(n_calls))
+            log_debug(build, poptus.LOG_LEVEL_MIN_DEBUG)
+            self.assertEqual(1, len(n_calls))
+        self.assertEqual(f"[{self.__tag}] Built\n", buffer.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,10 @@ Automatic unittest of the FileLogger class
 
 import os
 import io
+import gzip
+import lzma
+import pickle
+import time
 import shutil
 import unittest
 
@@ -68,6 +72,13 @@ class TestFileLogger(unittest.TestCase):
             set(), {self.__good_overwrite},
             {}, {"a": self.__good_overwrite}
         ]
+        self.__bad_buffer_sizes = [
+            True, False,
+            1.1, "", "1024",
+            [], [1024],
+            set(), {1024},
+            {}, {"BufferSize": 1024}
+        ]
 
     def tearDown(self):
         if self.__dir.is_dir():
@@ -107,6 +118,77 @@ class TestFileLogger(unittest.TestCase):
             # print(buffer.getvalue())
             self.assertTrue(buffer.getvalue().startswith(self.__error_start))
 
+    def testBadBufferSize(self):
+        for bad in self.__bad_buffer_sizes:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(TypeError):
+                    poptus.FileLogger(self.__good_filename,
+                                      self.__good_overwrite,
+                                      self.__good_level,
+                                      buffer_size=bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for bad in [0, -1]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.FileLogger(self.__good_filename,
+                                      self.__good_overwrite,
+                                      self.__good_level,
+                                      buffer_size=bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testBadRotation(self):
+        for kwarg in ["max_bytes", "max_age", "keep"]:
+            for bad in [True, "", "1024", [1024], {}]:
+                with redirect_stderr(io.StringIO()) as buffer:
+                    with self.assertRaises(TypeError):
+                        poptus.FileLogger(self.__good_filename,
+                                          self.__good_overwrite,
+                                          self.__good_level,
+                                          **{"max_bytes": 1024,
+                                             kwarg: bad})
+                # print(buffer.getvalue())
+                self.assertTrue(
+                    buffer.getvalue().startswith(self.__error_start)
+                )
+
+            for bad in [0, -1]:
+                with redirect_stderr(io.StringIO()) as buffer:
+                    with self.assertRaises(ValueError):
+                        poptus.FileLogger(self.__good_filename,
+                                          self.__good_overwrite,
+                                          self.__good_level,
+                                          **{"max_bytes": 1024,
+                                             kwarg: bad})
+                # print(buffer.getvalue())
+                self.assertTrue(
+                    buffer.getvalue().startswith(self.__error_start)
+                )
+
+        for bad in ["", "zip", "GZIP", 1]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.FileLogger(self.__good_filename,
+                                      self.__good_overwrite,
+                                      self.__good_level,
+                                      max_bytes=1024, compression=bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        # Keeping and compressing are meaningless without rotation
+        for kwargs in [{"keep": 2},
+                       {"compression": poptus.LOG_COMPRESSION_GZIP}]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.FileLogger(self.__good_filename,
+                                      self.__good_overwrite,
+                                      self.__good_level,
+                                      **kwargs)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
     def testBadLevel(self):
         for bad in self.__bad_levels:
             self.assertFalse(self.__good_filename.exists())
@@ -188,6 +270,18 @@ class TestFileLogger(unittest.TestCase):
                                    self.__good_level)
         self.assertEqual(self.__good_filename, logger.filename)
 
+    def testBufferSize(self):
+        logger = poptus.FileLogger(self.__good_filename,
+                                   self.__good_overwrite,
+                                   self.__good_level)
+        self.assertIsNone(logger.buffer_size)
+
+        logger = poptus.FileLogger(self.__good_filename,
+                                   self.__good_overwrite,
+                                   self.__good_level,
+                                   buffer_size=4096)
+        self.assertEqual(4096, logger.buffer_size)
+
     def testLogErrors(self):
         MSG = "Pointless message that we don't actually want to log"
 
@@ -304,3 +398,222 @@ class TestFileLogger(unittest.TestCase):
             logger.error(self.__tag, ERROR_MSG)
         self.assertEqual(EXPECTED_ERROR_MSG, buffer.getvalue())
         self.assertEqual(expected, self._load_log())
+
+    def testBuffered(self):
+        ERROR_MSG = "Oops!"
+        EXPECTED_ERROR_MSG = f"[{self.__tag}] ERROR - {ERROR_MSG}\n"
+
+        logger = poptus.FileLogger(self.__good_filename,
+                                   False,
+                                   poptus.LOG_LEVEL_DEFAULT,
+                                   buffer_size=1024 * 1024)
+
+        # Confirm that log file isn't created if nothing logged
+        logger.log(self.__tag, "Skipped", poptus.LOG_LEVEL_MIN_DEBUG)
+        logger.flush()
+        self.assertFalse(self.__good_filename.exists())
+
+        # Messages held in buffer until flushed
+        expected = []
+        for i in range(10):
+            logger.log(self.__tag, f"Info {i}", poptus.LOG_LEVEL_DEFAULT)
+            expected += [f"[{self.__tag}] Info {i}\n"]
+        logger.warn(self.__tag, "Warning")
+        expected += [f"[{self.__tag}] WARNING - Warning\n"]
+        self.assertEqual([], self._load_log())
+        logger.flush()
+        self.assertEqual(expected, self._load_log())
+
+        # Errors flushed immediately along with all previous messages
+        logger.log(self.__tag, "Info 10", poptus.LOG_LEVEL_DEFAULT)
+        expected += [f"[{self.__tag}] Info 10\n", EXPECTED_ERROR_MSG]
+        with redirect_stderr(io.StringIO()) as buffer:
+            logger.error(self.__tag, ERROR_MSG)
+        self.assertEqual(EXPECTED_ERROR_MSG, buffer.getvalue())
+        self.assertEqual(expected, self._load_log())
+
+        # Closing flushes and messages can still be logged afterward
+        logger.log(self.__tag, "Info 11", poptus.LOG_LEVEL_DEFAULT)
+        logger.close()
+        logger.close()
+        expected += [f"[{self.__tag}] Info 11\n"]
+        self.assertEqual(expected, self._load_log())
+        logger.log(self.__tag, "Info 12", poptus.LOG_LEVEL_DEFAULT)
+        logger.close()
+        expected += [f"[{self.__tag}] Info 12\n"]
+        self.assertEqual(expected, self._load_log())
+
+    def testSmallBuffer(self):
+        N_MSGS = 100
+
+        # Buffer fills quickly so that messages reach file without flushing
+        logger = poptus.FileLogger(self.__good_filename,
+                                   False,
+                                   poptus.LOG_LEVEL_DEFAULT,
+                                   buffer_size=1)
+        for i in range(N_MSGS):
+            logger.log(self.__tag, f"Info {i}", poptus.LOG_LEVEL_DEFAULT)
+        self.assertEqual(N_MSGS, len(self._load_log()))
+        logger.close()
+
+    def testContextManager(self):
+        MSG = "I have something rather important to say"
+        EXPECTED_MSG = f"[{self.__tag}] {MSG}\n"
+
+        for buffer_size in [None, 4096]:
+            if self.__good_filename.exists():
+                os.remove(self.__good_filename)
+
+            with poptus.FileLogger(self.__good_filename,
+                                   False,
+                                   poptus.LOG_LEVEL_DEFAULT,
+                                   buffer_size=buffer_size) as logger:
+                self.assertTrue(isinstance(logger, poptus.FileLogger))
+                logger.log(self.__tag, MSG, poptus.LOG_LEVEL_DEFAULT)
+            self.assertEqual([EXPECTED_MSG], self._load_log())
+
+    def testRotateBySize(self):
+        MSG = "0123456789"
+        line = f"[{self.__tag}] {MSG}\n"
+
+        for buffer_size in [None, 4096]:
+            with redirect_stdout(io.StringIO()):
+                logger = poptus.FileLogger(self.__good_filename, True,
+                                           poptus.LOG_LEVEL_DEFAULT,
+                                           buffer_size=buffer_size,
+                                           max_bytes=3 * len(line))
+            self.assertEqual(3 * len(line), logger.max_bytes)
+            self.assertIsNone(logger.keep)
+            for _ in range(10):
+                logger.log(self.__tag, MSG, poptus.LOG_LEVEL_DEFAULT)
+            logger.close()
+
+            self.assertEqual([line], self._load_log())
+            for index in range(1, 4):
+                with open(f"{self.__good_filename}.{index}", "r") as fptr:
+                    self.assertEqual(3 * [line], fptr.readlines())
+            self.assertFalse(Path(f"{self.__good_filename}.4").exists())
+
+    def testRotateCopies(self):
+        # Copies count only what they wrote and so must not rotate a file
+        # already rotated by another copy into an existing rotated file
+        line_length = len(f"[{self.__tag}] A00\n")
+
+        for buffer_size in [None, 4096]:
+            with redirect_stdout(io.StringIO()):
+                logger = poptus.FileLogger(self.__good_filename, True,
+                                           poptus.LOG_LEVEL_DEFAULT,
+                                           buffer_size=buffer_size,
+                                           max_bytes=3 * line_length)
+            logger.log(self.__tag, "A00", poptus.LOG_LEVEL_DEFAULT)
+            copy = pickle.loads(pickle.dumps(logger))
+            expected = [f"[{self.__tag}] A00\n"]
+            for i in range(1, 10):
+                for name, each in [("A", logger), ("B", copy)]:
+                    each.log(self.__tag, f"{name}{i:02d}",
+                             poptus.LOG_LEVEL_DEFAULT)
+                    expected.append(f"[{self.__tag}] {name}{i:02d}\n")
+            logger.close()
+            copy.close()
+
+            lines = self._load_log()
+            rotated = sorted(self.__dir.glob(f"{self.__good_filename.name}.*"))
+            self.assertEqual(
+                {Path(f"{self.__good_filename}.{i}")
+                 for i in range(1, len(rotated) + 1)},
+                set(rotated)
+            )
+            for path in rotated:
+                with open(path, "r") as fptr:
+                    lines += fptr.readlines()
+            self.assertEqual(sorted(expected), sorted(lines))
+
+    def testRotateOversizedMessage(self):
+        MSG = 100 * "x"
+
+        logger = poptus.FileLogger(self.__good_filename, False,
+                                   poptus.LOG_LEVEL_DEFAULT, max_bytes=10)
+        logger.log(self.__tag, MSG, poptus.LOG_LEVEL_DEFAULT)
+        logger.log(self.__tag, MSG, poptus.LOG_LEVEL_DEFAULT)
+
+        # No empty files are created
+        self.assertEqual([f"[{self.__tag}] {MSG}\n"], self._load_log())
+        self.assertTrue(Path(f"{self.__good_filename}.1").is_file())
+        self.assertFalse(Path(f"{self.__good_filename}.2").exists())
+
+    def testRotateByAge(self):
+        logger = poptus.FileLogger(self.__good_filename, False,
+                                   poptus.LOG_LEVEL_DEFAULT, max_age=0.05)
+        self.assertEqual(0.05, logger.max_age)
+        logger.log(self.__tag, "First", poptus.LOG_LEVEL_DEFAULT)
+        logger.log(self.__tag, "Second", poptus.LOG_LEVEL_DEFAULT)
+        time.sleep(0.1)
+        logger.log(self.__tag, "Third", poptus.LOG_LEVEL_DEFAULT)
+
+        self.assertEqual([f"[{self.__tag}] Third\n"], self._load_log())
+        with open(f"{self.__good_filename}.1", "r") as fptr:
+            self.assertEqual([f"[{self.__tag}] First\n",
+                              f"[{self.__tag}] Second\n"], fptr.readlines())
+
+    def testRotateKeep(self):
+        MSG = "Message"
+        line = f"[{self.__tag}] {MSG}\n"
+
+        logger = poptus.FileLogger(self.__good_filename, False,
+                                   poptus.LOG_LEVEL_DEFAULT,
+                                   max_bytes=len(line), keep=2)
+        self.assertEqual(2, logger.keep)
+        for _ in range(10):
+            logger.log(self.__tag, MSG, poptus.LOG_LEVEL_DEFAULT)
+
+        expected = {
+            Path(f"{self.__good_filename}.8"),
+            Path(f"{self.__good_filename}.9"),
+            self.__good_filename
+        }
+        self.assertEqual(expected, set(self.__dir.iterdir()))
+
+        # Rotated files are part of the log file with respect to overwriting
+        os.remove(self.__good_filename)
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(RuntimeError):
+                poptus.FileLogger(self.__good_filename, False,
+                                  poptus.LOG_LEVEL_DEFAULT,
+                                  max_bytes=len(line))
+        # print(buffer.getvalue())
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        with redirect_stdout(io.StringIO()):
+            poptus.FileLogger(self.__good_filename, True,
+                              poptus.LOG_LEVEL_DEFAULT, max_bytes=len(line))
+        self.assertEqual([], list(self.__dir.iterdir()))
+
+    def testRotateCompressed(self):
+        N_MSGS = 200
+        line = f"[{self.__tag}] Message\n"
+
+        for compression, opener, suffix in [
+                    (poptus.LOG_COMPRESSION_GZIP, gzip.open, ".gz"),
+                    (poptus.LOG_COMPRESSION_LZMA, lzma.open, ".xz")
+                ]:
+            with redirect_stdout(io.StringIO()):
+                logger = poptus.FileLogger(self.__good_filename, True,
+                                           poptus.LOG_LEVEL_DEFAULT,
+                                           buffer_size=1024,
+                                           max_bytes=10 * len(line), keep=5,
+                                           compression=compression)
+            self.assertEqual(compression, logger.compression)
+            for _ in range(N_MSGS):
+                logger.log(self.__tag, "Message", poptus.LOG_LEVEL_DEFAULT)
+            # Waits for compression to finish
+            logger.close()
+
+            self.assertEqual(10 * [line], self._load_log())
+            n_rotated = N_MSGS // 10 - 1
+            expected = {self.__good_filename}
+            for index in range(n_rotated - 4, n_rotated + 1):
+                rotated = Path(f"{self.__good_filename}.{index}{suffix}")
+                expected.add(rotated)
+                with opener(rotated, "rt") as fptr:
+                    self.assertEqual(10 * [line], fptr.readlines())
+            self.assertEqual(expected, set(self.__dir.iterdir()))
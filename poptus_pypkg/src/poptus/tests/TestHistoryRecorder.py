@@ -0,0 +1,217 @@
+"""
+Automatic unittest of the HistoryRecorder class
+"""
+
+import os
+import io
+import gc
+import shutil
+import unittest
+import importlib.util
+
+from pathlib import Path
+from contextlib import redirect_stderr
+
+import poptus
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np
+
+
+@unittest.skipIf(not HAS_NUMPY, "NumPy not installed")
+class TestHistoryRecorder(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_history")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("history.npy")
+
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def _trajectory(self, n_records):
+        # Iterates and objective values that are not exact in decimal
+        x = np.arange(3 * n_records, dtype=float).reshape(n_records, 3) / 3.0
+        return x, np.sum(x**2, axis=1) / 7.0
+
+    def testBadArguments(self):
+        bad_args = [
+            (TypeError, (None,)),
+            (TypeError, (2.0,)),
+            (TypeError, (True,)),
+            (ValueError, (0,)),
+            (TypeError, (2, None)),
+            (TypeError, (2, [1])),
+            (ValueError, (2, [""])),
+            (ValueError, (2, ["x"])),
+            (ValueError, (2, ["f", "f"])),
+            (TypeError, (2, ["f"], 1.5)),
+            (ValueError, (2, ["f"], -1)),
+            (TypeError, (2, ["f"], 8, 1)),
+            (ValueError, (2, ["f"], 8, "")),
+            (TypeError, (2, ["f"], 8, self.__filename, None))
+        ]
+        for exception, args in bad_args:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.HistoryRecorder(*args)
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        # Files of other recorders cannot be appended to
+        with poptus.HistoryRecorder(2, ["f"], filename=self.__filename):
+            pass
+        for args in [(3, ["f"]), (2, ["f", "delta"])]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.HistoryRecorder(*args, filename=self.__filename)
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+        np.save(self.__filename, np.zeros(4))
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(ValueError):
+                poptus.HistoryRecorder(1, [], filename=self.__filename)
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        history = poptus.HistoryRecorder(2)
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(TypeError):
+                history.save(None)
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testInMemory(self):
+        N_RECORDS = 100
+
+        x, f = self._trajectory(N_RECORDS)
+        history = poptus.HistoryRecorder(3, ["f", "delta"], capacity=2)
+        self.assertEqual(3, history.n_dims)
+        self.assertEqual(("f", "delta"), history.scalars)
+        self.assertTrue(history.filename is None)
+        self.assertEqual(0, len(history))
+        self.assertEqual((0, 3), history.x.shape)
+
+        for i in range(N_RECORDS):
+            if i % 2 == 0:
+                history.append(x[i], f=f[i], delta=0.5**i)
+            else:
+                history.append(list(x[i]), f=f[i])
+
+        # Capacity grows geometrically
+        self.assertEqual(N_RECORDS, len(history))
+        self.assertEqual(128, history.capacity)
+        np.testing.assert_array_equal(x, history.x)
+        np.testing.assert_array_equal(f, history["f"])
+        np.testing.assert_array_equal(history.x, history["x"])
+        np.testing.assert_array_equal(history.x, history.records["x"])
+        for i, value in enumerate(history["delta"]):
+            if i % 2 == 0:
+                self.assertEqual(0.5**i, value)
+            else:
+                self.assertTrue(np.isnan(value))
+
+        # Values are checked by NumPy
+        with self.assertRaises(ValueError):
+            history.append([1.0, 2.0], f=1.0)
+        with self.assertRaises(ValueError):
+            history.append(x[0], g=1.0)
+        self.assertEqual(N_RECORDS, len(history))
+
+        history.clear()
+        self.assertEqual(0, len(history))
+        history.append(x[0])
+        self.assertTrue(np.isnan(history["f"][0]))
+
+    def testSave(self):
+        N_RECORDS = 10
+
+        x, f = self._trajectory(N_RECORDS)
+        history = poptus.HistoryRecorder(3)
+        for x_i, f_i in zip(x, f):
+            history.append(x_i, f=f_i)
+
+        filename = self.__dir.joinpath("history.npz")
+        history.save(filename)
+        with np.load(filename) as arrays:
+            self.assertEqual({"x", "f"}, set(arrays.files))
+            np.testing.assert_array_equal(x, arrays["x"])
+            np.testing.assert_array_equal(f, arrays["f"])
+
+        history.save(str(self.__filename))
+        records = np.load(self.__filename)
+        self.assertEqual(N_RECORDS, len(records))
+        np.testing.assert_array_equal(x, records["x"])
+        np.testing.assert_array_equal(f, records["f"])
+
+    def testMemoryMappedFile(self):
+        N_RECORDS = 50
+
+        x, f = self._trajectory(2 * N_RECORDS)
+        history = poptus.HistoryRecorder(3, ["f"], capacity=4,
+                                         filename=str(self.__filename))
+        self.assertEqual(self.__filename.resolve(), history.filename)
+        for i in range(N_RECORDS):
+            history.append(x[i], f=f[i])
+        np.testing.assert_array_equal(x[:N_RECORDS], history.x)
+
+        # Only committed records are readable
+        self.assertEqual(0, len(np.load(self.__filename)))
+        history.flush()
+        records = np.load(self.__filename)
+        np.testing.assert_array_equal(x[:N_RECORDS], records["x"])
+        np.testing.assert_array_equal(f[:N_RECORDS], records["f"])
+        records = np.load(self.__filename, mmap_mode="r")
+        self.assertEqual(N_RECORDS, len(records))
+        del records
+
+        # Files are truncated on close
+        history.append(x[0], f=f[0])
+        history.close()
+        history.close()
+        self.assertEqual(N_RECORDS + 1, len(np.load(self.__filename)))
+        header = self.__filename.stat().st_size \
+            - (N_RECORDS + 1) * 4 * np.dtype(np.float64).itemsize
+        self.assertEqual(0, header % 64)
+
+        # New recorders append to existing files unless overwriting
+        with poptus.HistoryRecorder(3, ["f"], capacity=4,
+                                    filename=self.__filename) as history:
+            self.assertEqual(N_RECORDS + 1, len(history))
+            history.clear()
+            self.assertEqual(0, len(np.load(self.__filename)))
+            for i in range(N_RECORDS, 2 * N_RECORDS):
+                history.append(x[i], f=f[i])
+        records = np.load(self.__filename)
+        np.testing.assert_array_equal(x[N_RECORDS:], records["x"])
+
+        with poptus.HistoryRecorder(3, ["f"], filename=self.__filename,
+                                    overwrite=True) as history:
+            self.assertEqual(0, len(history))
+        self.assertEqual(0, len(np.load(self.__filename)))
+
+    def testUnclosedRecorder(self):
+        N_RECORDS = 3
+
+        # Recorders created by methods are typically not closed explicitly
+        x, f = self._trajectory(N_RECORDS)
+
+        def run_method():
+            history = poptus.HistoryRecorder(3, ["f"],
+                                             filename=self.__filename)
+            for x_i, f_i in zip(x, f):
+                history.append(x_i, f=f_i)
+
+        run_method()
+        gc.collect()
+        records = np.load(self.__filename)
+        np.testing.assert_array_equal(x, records["x"])
+        np.testing.assert_array_equal(f, records["f"])
+        header = self.__filename.stat().st_size \
+            - N_RECORDS * 4 * np.dtype(np.float64).itemsize
+        self.assertEqual(0, header % 64)
+        self.assertTrue(header < 256)
@@ -0,0 +1,66 @@
+"""
+Automatic unittest of the importing of the poptus package
+"""
+
+import os
+import sys
+import subprocess
+import unittest
+
+from pathlib import Path
+
+import poptus
+
+
+class TestImport(unittest.TestCase):
+    def __modules_after_import(self, code="import poptus"):
+        # Import in a fresh interpreter so that modules already imported by
+        # the test framework are not counted
+        env = dict(os.environ)
+        path = str(Path(poptus.__file__).resolve().parent.parent)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [path] + ([env["PYTHONPATH"]] if "PYTHONPATH" in env else [])
+        )
+        code += "; import sys; print('\\n'.join(sys.modules))"
+        result = subprocess.run([sys.executable, "-c", code], env=env,
+                                capture_output=True, check=True, text=True)
+        return set(result.stdout.splitlines())
+
+    def testLazyImports(self):
+        modules = self.__modules_after_import()
+        self.assertTrue("poptus" in modules)
+        self.assertTrue("poptus.StandardLogger" in modules)
+        for name in ["unittest", "importlib.metadata", "asyncio", "numpy",
+                     "poptus.test", "poptus.load_tests", "poptus.benchmark",
+                     "poptus.AsyncLogger", "poptus.HistoryRecorder",
+                     "gzip", "lzma", "json", "mmap", "signal"]:
+            self.assertFalse(name in modules, name)
+
+        # Only what is used is imported
+        modules = self.__modules_after_import(
+            "import poptus; poptus.AsyncLogger"
+        )
+        self.assertTrue("asyncio" in modules)
+        self.assertFalse("unittest" in modules)
+
+    def testLazyAttributes(self):
+        self.assertTrue(isinstance(poptus.__version__, str))
+        self.assertTrue(callable(poptus.test))
+        self.assertTrue(callable(poptus.load_tests))
+        self.assertTrue(callable(poptus.benchmark))
+        self.assertTrue(callable(poptus.compare_benchmarks))
+        self.assertTrue(issubclass(poptus.AsyncLogger, poptus.AbstractLogger))
+        for name in ["__version__", "test", "load_tests", "benchmark",
+                     "compare_benchmarks", "AsyncLogger", "create_logger"]:
+            self.assertTrue(name in dir(poptus), name)
+
+        # Importing submodules directly does not hide their functions
+        modules = self.__modules_after_import(
+            "import poptus.__main__, poptus.test; "
+            + "assert callable(poptus.benchmark); assert callable(poptus.test)"
+        )
+        self.assertTrue("poptus.benchmark" in modules)
+
+        with self.assertRaises(AttributeError):
+            poptus.not_an_attribute
+        self.assertFalse(hasattr(poptus, "not_an_attribute"))
@@ -0,0 +1,123 @@
+"""
+Automatic unittest of the install_level_signal_handlers function
+"""
+
+import io
+import os
+import time
+import signal
+import threading
+import unittest
+
+from contextlib import redirect_stderr
+
+import poptus
+
+from poptus.AbstractLogger import _LEVELS_LOCK
+
+
+@unittest.skipUnless(hasattr(signal, "SIGUSR1") and hasattr(signal, "SIGUSR2"),
+                     "SIGUSR1 and SIGUSR2 not available")
+class TestInstallLevelSignalHandlers(unittest.TestCase):
+    def setUp(self):
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+        self.__original = {
+            sig: signal.getsignal(sig)
+            for sig in [signal.SIGUSR1, signal.SIGUSR2]
+        }
+
+    def tearDown(self):
+        for sig, handler in self.__original.items():
+            signal.signal(sig, handler)
+
+    def testBadArguments(self):
+        logger = poptus.StandardLogger()
+        bad_args = [
+            (TypeError, (None,)),
+            (ValueError, (logger, 0, signal.SIGUSR2)),
+            (ValueError, (logger, signal.SIGUSR1, signal.SIGUSR1))
+        ]
+        for exception, args in bad_args:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.install_level_signal_handlers(*args)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        # Only the main thread can install handlers
+        errors = []
+
+        def install():
+            with redirect_stderr(io.StringIO()):
+                try:
+                    poptus.install_level_signal_handlers(logger)
+                except RuntimeError as exc:
+                    errors.append(exc)
+
+        thread = threading.Thread(target=install)
+        thread.start()
+        thread.join()
+        self.assertEqual(1, len(errors))
+
+    def testSignals(self):
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        functions = poptus.create_log_functions(logger, "Method")
+
+        previous = poptus.install_level_signal_handlers(logger)
+        self.assertEqual(self.__original, previous)
+
+        # Levels are changed by another thread soon after the signal is
+        # received
+        os.kill(os.getpid(), signal.SIGUSR1)
+        self.__wait_for_level(logger, poptus.LOG_LEVEL_MIN_DEBUG)
+        self.assertTrue(functions.is_enabled(poptus.LOG_LEVEL_MIN_DEBUG))
+
+        for _ in range(5):
+            os.kill(os.getpid(), signal.SIGUSR1)
+        self.__wait_for_level(logger, poptus.LOG_LEVEL_MAX)
+
+        for _ in range(10):
+            os.kill(os.getpid(), signal.SIGUSR2)
+        self.__wait_for_level(logger, poptus.LOG_LEVEL_NONE)
+        self.assertFalse(functions.is_enabled(poptus.LOG_LEVEL_DEFAULT))
+
+    def testReinstall(self):
+        def workers():
+            return [thread for thread in threading.enumerate()
+                    if thread.name == "poptus-LevelSignals"]
+
+        first = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        second = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        poptus.install_level_signal_handlers(first)
+        self.assertEqual(1, len(workers()))
+
+        # Installing handlers again reuses the thread and only changes the
+        # level of the logger given last
+        for _ in range(5):
+            poptus.install_level_signal_handlers(second)
+        self.assertEqual(1, len(workers()))
+        os.kill(os.getpid(), signal.SIGUSR1)
+        self.__wait_for_level(second, poptus.LOG_LEVEL_MIN_DEBUG)
+        self.assertEqual(poptus.LOG_LEVEL_DEFAULT, first.level)
+
+    def testSignalWhileResolvingLevels(self):
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        poptus.install_level_signal_handlers(logger)
+
+        # Signal the process while the main thread holds the levels lock as it
+        # does while resolving levels
+        with _LEVELS_LOCK:
+            self.assertEqual(poptus.LOG_LEVEL_DEFAULT,
+                             logger.level_of("Method"))
+            os.kill(os.getpid(), signal.SIGUSR1)
+            time.sleep(0.05)
+            self.assertEqual(poptus.LOG_LEVEL_DEFAULT, logger.level)
+            logger.level_of("Method")
+        self.__wait_for_level(logger, poptus.LOG_LEVEL_MIN_DEBUG)
+        self.assertEqual(poptus.LOG_LEVEL_MIN_DEBUG, logger.level_of("Method"))
+
+    def __wait_for_level(self, logger, level):
+        deadline = time.monotonic() + 5.0
+        while (logger.level != level) and (time.monotonic() < deadline):
+            time.sleep(0.001)
+        self.assertEqual(level, logger.level)
@@ -0,0 +1,151 @@
+"""
+Automatic unittest of the JsonLinesLogger class
+"""
+
+import os
+import io
+import json
+import shutil
+import unittest
+
+from pathlib import Path
+from contextlib import redirect_stderr
+
+import poptus
+
+
+class ArrayLike:
+    # Mimic NumPy arrays and scalars, which are not JSON serializable
+    def __init__(self, values):
+        self.__values = values
+
+    def tolist(self):
+        return list(self.__values)
+
+
+class TestJsonLinesLogger(unittest.TestCase):
+    # All tests should suppress writing to stderr, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_json")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.jsonl")
+
+        self.__valid_levels = set(poptus.LOG_LEVELS).difference(
+            {poptus.LOG_LEVEL_NONE}
+        )
+        self.__tag = "Unittest"
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def _load_log(self):
+        with open(self.__filename, "r") as fptr:
+            records = [json.loads(line) for line in fptr]
+        return records
+
+    def testLevel(self):
+        for level in poptus.LOG_LEVELS:
+            logger = poptus.JsonLinesLogger(self.__filename, False, level)
+            self.assertTrue(isinstance(logger, poptus.FileLogger))
+            self.assertEqual(level, logger.level)
+            with self.assertRaises(AssertionError):
+                logger.log(self.__tag, "Bad", poptus.LOG_LEVEL_NONE)
+            with self.assertRaises(AssertionError):
+                logger.log_fields(self.__tag, "Bad", poptus.LOG_LEVEL_NONE, {})
+
+    def testLog(self):
+        for level in self.__valid_levels:
+            if self.__filename.exists():
+                os.remove(self.__filename)
+            logger = poptus.JsonLinesLogger(self.__filename, False, level)
+
+            for msg_level in self.__valid_levels:
+                logger.log(self.__tag, f"Level {msg_level}", msg_level)
+
+            records = self._load_log()
+            expected = [e for e in self.__valid_levels if e <= level]
+            self.assertEqual(len(expected), len(records))
+            for msg_level, record in zip(expected, records):
+                self.assertEqual(poptus.LOG_RECORD_LOG, record["type"])
+                self.assertEqual(msg_level, record["level"])
+                self.assertEqual(self.__tag, record["caller"])
+                self.assertEqual(f"Level {msg_level}", record["msg"])
+                self.assertTrue(isinstance(record["time"], float))
+                self.assertTrue("fields" not in record)
+
+    def testLogFields(self):
+        FIELDS = {
+            "iteration": 12,
+            "f": 1.0 / 3.0,
+            "step_size": 1.0e-300,
+            "converged": False,
+            "x": ArrayLike([1.5, -2.5]),
+            "name": "Method"
+        }
+
+        logger = poptus.JsonLinesLogger(self.__filename, False,
+                                        poptus.LOG_LEVEL_DEFAULT,
+                                        buffer_size=4096)
+        logger.log_fields(self.__tag, "Iterate", poptus.LOG_LEVEL_DEFAULT,
+                          FIELDS)
+        logger.log_fields(self.__tag, "Skipped", poptus.LOG_LEVEL_MIN_DEBUG,
+                          FIELDS)
+        logger.close()
+
+        records = self._load_log()
+        self.assertEqual(1, len(records))
+        fields = records[0]["fields"]
+        self.assertEqual(set(FIELDS), set(fields))
+        self.assertTrue(isinstance(fields["iteration"], int))
+        self.assertEqual(12, fields["iteration"])
+        # Floating point values are recovered exactly
+        self.assertEqual(FIELDS["f"], fields["f"])
+        self.assertEqual(FIELDS["step_size"], fields["step_size"])
+        self.assertIs(False, fields["converged"])
+        self.assertEqual([1.5, -2.5], fields["x"])
+        self.assertEqual("Method", fields["name"])
+
+    def testWarnAndError(self):
+        MSG = "Something unthinkably horrible has occurred."
+        EXPECTED_MSG = f"[{self.__tag}] ERROR - {MSG}\n"
+
+        logger = poptus.JsonLinesLogger(self.__filename, False,
+                                        poptus.LOG_LEVEL_NONE,
+                                        buffer_size=4096)
+        logger.warn(self.__tag, "Warning")
+        with redirect_stderr(io.StringIO()) as buffer:
+            logger.error(self.__tag, MSG)
+        self.assertEqual(EXPECTED_MSG, buffer.getvalue())
+
+        # Error flushed immediately
+        records = self._load_log()
+        self.assertEqual(2, len(records))
+        self.assertEqual(poptus.LOG_RECORD_WARNING, records[0]["type"])
+        self.assertEqual("Warning", records[0]["msg"])
+        self.assertEqual(poptus.LOG_RECORD_ERROR, records[1]["type"])
+        self.assertEqual(MSG, records[1]["msg"])
+        for record in records:
+            self.assertEqual(poptus.LOG_LEVEL_NONE, record["level"])
+            self.assertEqual(self.__tag, record["caller"])
+        logger.close()
+
+    def testLogFunctions(self):
+        logger = poptus.JsonLinesLogger(self.__filename, False,
+                                        poptus.LOG_LEVEL_MIN_DEBUG)
+        functions = poptus.create_log_functions(logger, self.__tag)
+        functions.log("Starting")
+        functions.log_fields("Iteration {}", poptus.LOG_LEVEL_MIN_DEBUG, 3,
+                             iteration=3, f=0.5)
+        functions.log_fields("Skipped", poptus.LOG_LEVEL_MAX, iteration=4)
+
+        records = self._load_log()
+        self.assertEqual(2, len(records))
+        self.assertEqual("Starting", records[0]["msg"])
+        self.assertEqual("Iteration 3", records[1]["msg"])
+        self.assertEqual(poptus.LOG_LEVEL_MIN_DEBUG, records[1]["level"])
+        self.assertEqual({"iteration": 3, "f": 0.5}, records[1]["fields"])
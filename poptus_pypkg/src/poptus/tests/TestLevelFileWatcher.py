@@ -0,0 +1,132 @@
+"""
+Automatic unittest of the LevelFileWatcher class
+"""
+
+import os
+import io
+import time
+import shutil
+import unittest
+
+from pathlib import Path
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
+import poptus
+
+
+class TestLevelFileWatcher(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_level_file")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("levels.cfg")
+
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+        self.__warn_start = f"[{poptus._constants.POPTUS_LOG_TAG}] WARNING"
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def _write(self, text):
+        # Force a new signature even if the file system's clock is coarse
+        self.__filename.write_text(text)
+        stat = self.__filename.stat()
+        os.utime(self.__filename,
+                 ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+    def testBadArguments(self):
+        logger = poptus.StandardLogger()
+        bad_args = [
+            (TypeError, (None, self.__filename)),
+            (TypeError, (logger, None)),
+            (ValueError, (logger, "")),
+            (TypeError, (logger, self.__filename, None)),
+            (TypeError, (logger, self.__filename, True)),
+            (ValueError, (logger, self.__filename, 0)),
+            (ValueError, (logger, self.__filename, -1.0))
+        ]
+        for exception, args in bad_args:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.LevelFileWatcher(*args)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testCheck(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+        MAX = poptus.LOG_LEVEL_MAX
+
+        logger = poptus.StandardLogger(DEFAULT)
+        functions = poptus.create_log_functions(logger, "Method.linesearch")
+
+        # Use a long interval so that only explicit checks are made
+        with poptus.LevelFileWatcher(logger, self.__filename, 3600) as watcher:
+            self.assertEqual(self.__filename.resolve(), watcher.filename)
+            self.assertEqual(3600, watcher.interval)
+            self.assertIs(logger, watcher.logger)
+
+            # Missing file
+            self.assertFalse(watcher.check())
+            self.assertEqual(DEFAULT, logger.level)
+
+            self._write(f"# Comment\n\nLevel = {MAX}\n")
+            self.assertTrue(watcher.check())
+            self.assertFalse(watcher.check())
+            self.assertEqual(MAX, logger.level)
+            self.assertEqual({}, logger.caller_levels)
+            self.assertTrue(functions.is_enabled(MAX))
+
+            self._write(f"Level={DEFAULT}\nMethod = {poptus.LOG_LEVEL_NONE}\n"
+                        + f"Method.linesearch = {MAX}  # Debug\n")
+            self.assertTrue(watcher.check())
+            self.assertEqual(DEFAULT, logger.level)
+            self.assertEqual({"Method": poptus.LOG_LEVEL_NONE,
+                              "Method.linesearch": MAX},
+                             logger.caller_levels)
+            self.assertTrue(functions.is_enabled(MAX))
+
+            # Caller levels are unaltered if none are given
+            self._write(f"Level = {MAX}\n")
+            self.assertTrue(watcher.check())
+            self.assertEqual(MAX, logger.level)
+            self.assertEqual(2, len(logger.caller_levels))
+
+            # Invalid files are ignored entirely
+            for bad in ["Level\n", "= 1\n", "Level = one\n", "Level = -1\n",
+                        f"Level = 1\nMethod = {MAX + 1}\n"]:
+                self._write(bad)
+                with redirect_stdout(io.StringIO()) as buffer:
+                    self.assertFalse(watcher.check())
+                # print(buffer.getvalue())
+                self.assertTrue(buffer.getvalue().startswith(self.__warn_start))
+                self.assertEqual(MAX, logger.level)
+                self.assertEqual(2, len(logger.caller_levels))
+
+    def testPolling(self):
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        functions = poptus.create_log_functions(logger, "Method")
+
+        # The file is read when the watcher is created
+        self._write(f"Level = {poptus.LOG_LEVEL_MIN_DEBUG}\n")
+        watcher = poptus.LevelFileWatcher(logger, self.__filename, 0.01)
+        self.assertEqual(poptus.LOG_LEVEL_MIN_DEBUG, logger.level)
+
+        self._write(f"Level = {poptus.LOG_LEVEL_MAX}\n")
+        start = time.monotonic()
+        while (not functions.is_enabled(poptus.LOG_LEVEL_MAX)) and \
+                (time.monotonic() - start < 10.0):
+            time.sleep(0.01)
+        watcher.stop()
+        self.assertEqual(poptus.LOG_LEVEL_MAX, logger.level)
+
+        # Stopped watchers no longer apply changes
+        self._write(f"Level = {poptus.LOG_LEVEL_NONE}\n")
+        time.sleep(0.05)
+        self.assertEqual(poptus.LOG_LEVEL_MAX, logger.level)
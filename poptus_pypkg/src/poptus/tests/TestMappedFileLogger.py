@@ -0,0 +1,254 @@
+"""
+Automatic unittest of the MappedFileLogger class and recover_mapped_log
+function
+"""
+
+import os
+import io
+import sys
+import mmap
+import pickle
+import shutil
+import unittest
+import threading
+import subprocess
+
+from pathlib import Path
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
+import poptus
+
+
+class TestMappedFileLogger(unittest.TestCase):
+    # All tests should suppress writing to stderr, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_mapped")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.log")
+        self.__text_fname = self.__dir.joinpath("text.log")
+
+        self.__valid_levels = set(poptus.LOG_LEVELS).difference(
+            {poptus.LOG_LEVEL_NONE}
+        )
+        self.__tag = "Unittest"
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def _load(self, filename):
+        with open(filename, "rb") as fptr:
+            return fptr.read()
+
+    def _log_all(self, logger):
+        for msg_level in self.__valid_levels:
+            logger.log(self.__tag, f"Level {msg_level}", msg_level)
+            logger.log("Other", f"Other level {msg_level}", msg_level)
+        logger.log(self.__tag, "Ünïcödé\nover two lines", 1)
+        logger.warn("Other", "Be careful")
+        with redirect_stderr(io.StringIO()) as buffer:
+            logger.error(self.__tag, "Bad thing")
+        self.assertEqual(f"[{self.__tag}] ERROR - Bad thing\n",
+                         buffer.getvalue())
+
+    def testBadArguments(self):
+        bad_args = [
+            (TypeError, (None, False)),
+            (ValueError, ("", False)),
+            (TypeError, (self.__filename, None)),
+            (TypeError, (self.__filename, False, poptus.LOG_LEVEL_DEFAULT,
+                         1.5)),
+            (TypeError, (self.__filename, False, poptus.LOG_LEVEL_DEFAULT,
+                         True)),
+            (ValueError, (self.__filename, False, poptus.LOG_LEVEL_DEFAULT,
+                          0))
+        ]
+        for exception, args in bad_args:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.MappedFileLogger(*args)
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for exception, filename in [(TypeError, None),
+                                    (ValueError, self.__filename)]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.recover_mapped_log(filename)
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testLevel(self):
+        for level in poptus.LOG_LEVELS:
+            logger = poptus.MappedFileLogger(self.__filename, False, level)
+            self.assertTrue(isinstance(logger, poptus.FileLogger))
+            self.assertEqual(level, logger.level)
+            with self.assertRaises(AssertionError):
+                logger.log(self.__tag, "Bad", poptus.LOG_LEVEL_NONE)
+
+    def testNoFileIfNothingLogged(self):
+        with poptus.MappedFileLogger(self.__filename, False) as logger:
+            logger.log(self.__tag, "Suppressed", poptus.LOG_LEVEL_MAX)
+        self.assertFalse(self.__filename.exists())
+
+    def testSameTextAsFileLogger(self):
+        for level in poptus.LOG_LEVELS:
+            for fname in [self.__filename, self.__text_fname]:
+                if fname.exists():
+                    os.remove(fname)
+
+            text_logger = poptus.FileLogger(self.__text_fname, False, level)
+            self._log_all(text_logger)
+            text_logger.close()
+
+            logger = poptus.MappedFileLogger(self.__filename, False, level)
+            self._log_all(logger)
+            logger.close()
+            self.assertEqual(self._load(self.__text_fname),
+                             self._load(self.__filename))
+
+    def testGrowth(self):
+        N_MSGS = 1000
+
+        logger = poptus.MappedFileLogger(self.__filename, False,
+                                         chunk_size=1)
+        chunk_size = mmap.ALLOCATIONGRANULARITY
+        self.assertEqual(chunk_size, logger.chunk_size)
+
+        expected = b""
+        for i in range(N_MSGS):
+            msg = f"Message {i}" if i != N_MSGS // 2 else "x" * 3 * chunk_size
+            logger.log(self.__tag, msg, poptus.LOG_LEVEL_DEFAULT)
+            expected += f"[{self.__tag}] {msg}\n".encode()
+
+        # Messages are visible immediately in a file grown by whole chunks
+        contents = self._load(self.__filename)
+        self.assertTrue(len(contents) > len(expected))
+        self.assertEqual(0, len(contents) % chunk_size)
+        self.assertEqual(expected, contents[:len(expected)])
+        self.assertEqual(b"", contents[len(expected):].strip(b"\0"))
+        logger.flush()
+
+        logger.close()
+        logger.close()
+        self.assertEqual(expected, self._load(self.__filename))
+        self.assertEqual(len(expected),
+                         poptus.recover_mapped_log(self.__filename))
+        self.assertEqual(expected, self._load(self.__filename))
+
+        # Messages logged after closing are appended
+        logger.log(self.__tag, "Reopened", poptus.LOG_LEVEL_DEFAULT)
+        logger.close()
+        expected += f"[{self.__tag}] Reopened\n".encode()
+        self.assertEqual(expected, self._load(self.__filename))
+
+    def testThreads(self):
+        N_THREADS = 8
+        N_MSGS = 500
+
+        logger = poptus.MappedFileLogger(self.__filename, False,
+                                         chunk_size=1)
+
+        def work(index):
+            for i in range(N_MSGS):
+                logger.log(self.__tag, f"Thread {index} message {i}",
+                           poptus.LOG_LEVEL_DEFAULT)
+
+        threads = [threading.Thread(target=work, args=(i,))
+                   for i in range(N_THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.close()
+
+        lines = self._load(self.__filename).decode().splitlines()
+        self.assertEqual(N_THREADS * N_MSGS, len(lines))
+        for index in range(N_THREADS):
+            prefix = f"[{self.__tag}] Thread {index} "
+            expected = [f"{prefix}message {i}" for i in range(N_MSGS)]
+            self.assertEqual(expected,
+                             [e for e in lines if e.startswith(prefix)])
+
+    def testNullCharacters(self):
+        # Messages with null characters are not truncated when copies of the
+        # logger append to the file.  Backslashes are written unchanged so that
+        # the substitution cannot be undone.
+        warning = f"[{poptus._constants.POPTUS_LOG_TAG}] WARNING - " \
+            + f"Overwriting {self.__filename.resolve()}\n"
+        messages = ["Null\0", "\0Null\0in\0\0middle\0", "Literal \\x00"]
+        for i, msg in enumerate(messages):
+            with redirect_stdout(io.StringIO()) as buffer:
+                logger = poptus.MappedFileLogger(self.__filename, True)
+            self.assertEqual("" if i == 0 else warning, buffer.getvalue())
+            logger.log(self.__tag, msg, poptus.LOG_LEVEL_DEFAULT)
+            logger.close()
+            copy = pickle.loads(pickle.dumps(logger))
+            copy.log(self.__tag, "After", poptus.LOG_LEVEL_DEFAULT)
+            copy.close()
+
+            escaped = msg.replace("\0", "\\x00")
+            expected = f"[{self.__tag}] {escaped}\n[{self.__tag}] After\n"
+            self.assertEqual(expected.encode(), self._load(self.__filename))
+
+    def testPickle(self):
+        logger = poptus.MappedFileLogger(self.__filename, False,
+                                         chunk_size=8192)
+        logger.log(self.__tag, "Before", poptus.LOG_LEVEL_DEFAULT)
+        logger.close()
+
+        copy = pickle.loads(pickle.dumps(logger))
+        self.assertEqual(logger.filename, copy.filename)
+        self.assertEqual(logger.chunk_size, copy.chunk_size)
+        copy.log(self.__tag, "Copy", poptus.LOG_LEVEL_DEFAULT)
+        copy.close()
+
+        expected = f"[{self.__tag}] Before\n[{self.__tag}] Copy\n"
+        self.assertEqual(expected.encode(), self._load(self.__filename))
+
+    def testCrashRecovery(self):
+        N_MSGS = 100
+
+        # Crash without closing the logger or running exit handlers
+        env = dict(os.environ)
+        path = str(Path(poptus.__file__).resolve().parent.parent)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [path] + ([env["PYTHONPATH"]] if "PYTHONPATH" in env else [])
+        )
+        code = "import os, poptus\n" \
+            + f"logger = poptus.MappedFileLogger({str(self.__filename)!r}, " \
+            + "False)\n" \
+            + f"for i in range({N_MSGS}):\n" \
+            + f"    logger.log({self.__tag!r}, f'Message {{i}}', 1)\n" \
+            + f"logger.log({self.__tag!r}, 'Null\\0', 1)\n" \
+            + "os._exit(1)\n"
+        result = subprocess.run([sys.executable, "-c", code], env=env)
+        self.assertEqual(1, result.returncode)
+
+        expected = "".join(f"[{self.__tag}] Message {i}\n"
+                           for i in range(N_MSGS)).encode() \
+            + f"[{self.__tag}] Null\\x00\n".encode()
+        contents = self._load(self.__filename)
+        self.assertTrue(len(contents) > len(expected))
+        self.assertEqual(expected, contents[:len(expected)])
+
+        self.assertEqual(len(expected),
+                         poptus.recover_mapped_log(self.__filename))
+        self.assertEqual(expected, self._load(self.__filename))
+
+        # Partially-written final messages are removed
+        with open(self.__filename, "ab") as fptr:
+            fptr.write(f"[{self.__tag}] Partial".encode() + b"\0" * 100)
+        self.assertEqual(len(expected),
+                         poptus.recover_mapped_log(str(self.__filename)))
+        self.assertEqual(expected, self._load(self.__filename))
+
+        with open(self.__filename, "wb") as fptr:
+            fptr.write(b"\0" * 100)
+        self.assertEqual(0, poptus.recover_mapped_log(self.__filename))
+        self.assertEqual(b"", self._load(self.__filename))
@@ -0,0 +1,117 @@
+"""
+Automatic unittest of the merge_log_shards function
+"""
+
+import os
+import io
+import shutil
+import unittest
+
+from pathlib import Path
+from contextlib import redirect_stderr
+
+import poptus
+
+
+class TestMergeLogShards(unittest.TestCase):
+    # All tests should suppress writing to stderr, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_merge")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.log")
+
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def _write_shard(self, pid, records):
+        shard = self.__dir.joinpath(f"test.log.{pid}.shard")
+        with open(shard, "w") as fptr:
+            fptr.write("".join(records))
+        return shard
+
+    def _load_log(self):
+        with open(self.__filename, "r") as fptr:
+            lines = fptr.readlines()
+        return lines
+
+    def testBadArguments(self):
+        for bad in [None, 1, 1.1, [], [self.__filename], {}]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(TypeError):
+                    poptus.merge_log_shards(bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for kwarg in ["overwrite", "remove_shards"]:
+            for bad in [None, 0, 1, "", [], {}]:
+                with redirect_stderr(io.StringIO()) as buffer:
+                    with self.assertRaises(TypeError):
+                        poptus.merge_log_shards(self.__filename,
+                                                **{kwarg: bad})
+                # print(buffer.getvalue())
+                self.assertTrue(
+                    buffer.getvalue().startswith(self.__error_start)
+                )
+
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(ValueError):
+                poptus.merge_log_shards("")
+        # print(buffer.getvalue())
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        # No shards
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(RuntimeError):
+                poptus.merge_log_shards(self.__filename)
+        # print(buffer.getvalue())
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testOrder(self):
+        # Ties in timestamps broken by process ID and then sequence number
+        shard_1 = self._write_shard(12, [
+            "100 0 [A] 1\n",
+            "300 1 [A] 4\n",
+            "300 2 [A] 5\n",
+            "700 3 [A] WARNING - 8\\nwith newline and \\\\n\n",
+        ])
+        shard_2 = self._write_shard(3, [
+            "200 0 [B] 2\n",
+            "300 1 [B] 3\n",
+            "600 2 [B] 7\n",
+            # Partially-written final record
+            "800 3 [B] 9",
+        ])
+        shard_3 = self._write_shard(5, ["500 0 [C] 6\n"])
+        # Ignored since not named as a shard
+        self.__dir.joinpath("test.log.other.shard").touch()
+
+        n_records = poptus.merge_log_shards(self.__filename)
+        self.assertEqual(8, n_records)
+        expected = [
+            "[A] 1\n", "[B] 2\n", "[B] 3\n", "[A] 4\n", "[A] 5\n", "[C] 6\n",
+            "[B] 7\n", "[A] WARNING - 8\n", "with newline and \\n\n"
+        ]
+        self.assertEqual(expected, self._load_log())
+        for shard in [shard_1, shard_2, shard_3]:
+            self.assertTrue(shard.exists())
+
+        # Merged file exists
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(RuntimeError):
+                poptus.merge_log_shards(self.__filename)
+        # print(buffer.getvalue())
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        n_records = poptus.merge_log_shards(self.__filename, overwrite=True,
+                                            remove_shards=True)
+        self.assertEqual(8, n_records)
+        self.assertEqual(expected, self._load_log())
+        for shard in [shard_1, shard_2, shard_3]:
+            self.assertFalse(shard.exists())
@@ -0,0 +1,230 @@
+"""
+Automatic unittest of the MetricsRegistry class
+"""
+
+import gc
+import os
+import io
+import sys
+import time
+import shutil
+import weakref
+import unittest
+import threading
+import subprocess
+
+from pathlib import Path
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
+import poptus
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_metrics")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("metrics.jsonl")
+
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def testBadArguments(self):
+        logger = poptus.StandardLogger()
+        bad_args = [
+            (TypeError, (None,)),
+            (TypeError, (logger, "1")),
+            (TypeError, (logger, True)),
+            (ValueError, (logger, 0)),
+            (ValueError, (logger, -1.0)),
+            (ValueError, (logger, float("inf"))),
+            (TypeError, (logger, None, 1))
+        ]
+        for exception, args in bad_args:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.MetricsRegistry(*args)
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        metrics = poptus.MetricsRegistry(logger, at_exit=False)
+        metrics.counter("Method", "n_evals")
+        bad_calls = [
+            (TypeError, metrics.counter, (None, "n")),
+            (ValueError, metrics.counter, ("", "n")),
+            (TypeError, metrics.gauge, ("Method", 1)),
+            (ValueError, metrics.gauge, ("Method", "")),
+            (ValueError, metrics.gauge, ("Method", "n_evals")),
+            (TypeError, metrics.histogram, ("Model", "t", None)),
+            (ValueError, metrics.histogram, ("Model", "t", [])),
+            (TypeError, metrics.histogram, ("Model", "t", ["1"])),
+            (ValueError, metrics.histogram, ("Model", "t", [1.0, 1.0])),
+            (ValueError, metrics.histogram, ("Model", "t", [2.0, 1.0])),
+            (ValueError, metrics.histogram, ("Model", "t", [float("nan")])),
+            (ValueError, metrics.histogram, ("Method", "n_evals", [1.0]))
+        ]
+        for exception, call, args in bad_calls:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    call(*args)
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        metrics.histogram("Model", "t", [1.0, 2.0])
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(ValueError):
+                metrics.histogram("Model", "t", [1.0, 3.0])
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testMetrics(self):
+        metrics = poptus.MetricsRegistry(poptus.StandardLogger(),
+                                         at_exit=False)
+        self.assertEqual({}, metrics.snapshot())
+
+        n_evals = metrics.counter("Method", "n_evals")
+        radius = metrics.gauge("Method", "radius")
+        times = metrics.histogram("Model", "time", [0.1, 1, 10.0])
+        self.assertEqual(0, n_evals.value)
+        self.assertEqual(0.0, radius.value)
+
+        # Metrics are registered once
+        self.assertTrue(n_evals is metrics.counter("Method", "n_evals"))
+        self.assertTrue(radius is metrics.gauge("Method", "radius"))
+        self.assertTrue(times is metrics.histogram("Model", "time",
+                                                   [0.1, 1.0, 10.0]))
+        other = metrics.counter("Model", "n_evals")
+
+        for _ in range(5):
+            n_evals.increment()
+        n_evals.increment(10)
+        other.increment()
+        radius.set(0.5)
+        radius.set(0.25)
+        for value in [0.01, 0.1, 0.5, 1.0, 5.0, 100.0, 1000.0]:
+            times.observe(value)
+
+        expected = {
+            "Method": {"n_evals": 15, "radius": 0.25},
+            "Model": {
+                "time": {"bounds": [0.1, 1.0, 10.0], "counts": [2, 2, 1, 2],
+                         "count": 7, "sum": 1106.61},
+                "n_evals": 1
+            }
+        }
+        snapshot = metrics.snapshot()
+        self.assertAlmostEqual(expected["Model"]["time"].pop("sum"),
+                               snapshot["Model"]["time"].pop("sum"))
+        self.assertEqual(expected, snapshot)
+
+    def testWrite(self):
+        logger = poptus.JsonLinesLogger(self.__filename, False)
+        metrics = poptus.MetricsRegistry(logger, at_exit=False)
+        metrics.counter("Method", "n_evals").increment(3)
+        metrics.histogram("Model", "time", [1.0]).observe(0.5)
+        metrics.gauge("Empty", "value")
+        metrics.write()
+        logger.close()
+
+        records = list(poptus.read_json_lines_log(self.__filename))
+        self.assertEqual(3, len(records))
+        by_caller = {e["caller"]: e for e in records}
+        self.assertEqual("Metrics", by_caller["Method"]["msg"])
+        self.assertEqual(poptus.LOG_LEVEL_DEFAULT, by_caller["Method"]["level"])
+        self.assertEqual({"n_evals": 3}, by_caller["Method"]["fields"])
+        self.assertEqual({"time": {"bounds": [1.0], "counts": [1, 0],
+                                   "count": 1, "sum": 0.5}},
+                         by_caller["Model"]["fields"])
+        self.assertEqual({"value": 0.0}, by_caller["Empty"]["fields"])
+
+        # Text loggers record fields as text
+        metrics = poptus.MetricsRegistry(poptus.StandardLogger(),
+                                         at_exit=False)
+        metrics.counter("Method", "n_evals").increment(3)
+        metrics.gauge("Method", "radius").set(0.5)
+        with redirect_stdout(io.StringIO()) as buffer:
+            metrics.write()
+        self.assertEqual("[Method] Metrics n_evals=3 radius=0.5\n",
+                         buffer.getvalue())
+
+    def testPeriodicSnapshots(self):
+        INTERVAL = 0.02
+
+        logger = poptus.JsonLinesLogger(self.__filename, False)
+        with poptus.MetricsRegistry(logger, INTERVAL, False) as metrics:
+            self.assertEqual(INTERVAL, metrics.interval)
+            self.assertTrue(metrics.logger is logger)
+            n_evals = metrics.counter("Method", "n_evals")
+            n_evals.increment()
+            time.sleep(10 * INTERVAL)
+        n_snapshots = len(list(poptus.read_json_lines_log(self.__filename)))
+        self.assertTrue(n_snapshots >= 2)
+
+        # No snapshots are taken once stopped
+        time.sleep(5 * INTERVAL)
+        records = list(poptus.read_json_lines_log(self.__filename))
+        self.assertEqual(n_snapshots, len(records))
+        self.assertEqual({"n_evals": 1}, records[-1]["fields"])
+
+    def testSnapshotAtExit(self):
+        # Registries created by drivers are typically no longer referenced
+        # while their metrics are still in use
+        env = dict(os.environ)
+        path = str(Path(poptus.__file__).resolve().parent.parent)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [path] + ([env["PYTHONPATH"]] if "PYTHONPATH" in env else [])
+        )
+        code = "import gc, poptus\n" \
+            + "def setup():\n" \
+            + "    logger = poptus.StandardLogger()\n" \
+            + "    return poptus.MetricsRegistry(logger).counter('M', 'n')\n" \
+            + "n_evals = setup()\n" \
+            + "gc.collect()\n" \
+            + "for _ in range(5):\n" \
+            + "    n_evals.increment()\n"
+        result = subprocess.run([sys.executable, "-c", code], env=env,
+                                capture_output=True, check=True, text=True)
+        self.assertEqual("[M] Metrics n=5\n", result.stdout)
+
+    def testSnapshotOnceUnused(self):
+        # The final snapshot is written once neither the registry nor its
+        # metrics are in use rather than holding them until exit
+        metrics = poptus.MetricsRegistry(poptus.StandardLogger())
+        n_evals = metrics.counter("M", "n")
+        alive = weakref.ref(metrics)
+        with redirect_stdout(io.StringIO()) as buffer:
+            del metrics
+            gc.collect()
+            for _ in range(3):
+                n_evals.increment()
+            self.assertTrue(alive() is not None)
+            self.assertEqual("", buffer.getvalue())
+
+            del n_evals
+            gc.collect()
+            self.assertTrue(alive() is None)
+        self.assertEqual("[M] Metrics n=3\n", buffer.getvalue())
+
+    def testConcurrentRegistration(self):
+        N_THREADS = 8
+
+        metrics = poptus.MetricsRegistry(poptus.StandardLogger(),
+                                         at_exit=False)
+        counters = []
+
+        def work():
+            counters.append(metrics.counter("Method", "n_evals"))
+
+        threads = [threading.Thread(target=work) for _ in range(N_THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, len({id(e) for e in counters}))
@@ -0,0 +1,329 @@
+"""
+Automatic unittest of passing loggers and log functions to other processes by
+pickling and by forking
+"""
+
+import os
+import io
+import pickle
+import shutil
+import warnings
+import threading
+import unittest
+import multiprocessing
+
+from pathlib import Path
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+from concurrent.futures import ProcessPoolExecutor
+
+import poptus
+
+N_WORKER_MSGS = 100
+
+
+def log_in_worker(log_debug, index):
+    for i in range(N_WORKER_MSGS):
+        log_debug("Task {} message {}", poptus.LOG_LEVEL_MIN_DEBUG, index, i)
+    return os.getpid()
+
+
+class TestProcessSafety(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_process")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.log")
+
+        self.__tag = "Unittest"
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def _load(self, filename):
+        with open(filename, "r") as fptr:
+            lines = fptr.readlines()
+        return lines
+
+    def _fork(self, work):
+        # Run the given work in a forked child and return its exit code
+        with warnings.catch_warnings():
+            # Python warns about forking multi-threaded processes
+            warnings.simplefilter("ignore", DeprecationWarning)
+            pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                with redirect_stdout(io.StringIO()):
+                    with redirect_stderr(io.StringIO()):
+                        work()
+                code = 0
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        return os.waitstatus_to_exitcode(status) \
+            if hasattr(os, "waitstatus_to_exitcode") else status
+
+    def testPickleFileLoggers(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+
+        for LoggerClass in [poptus.FileLogger, poptus.JsonLinesLogger,
+                            poptus.BinaryLogger]:
+            filename = self.__dir.joinpath(LoggerClass.__name__)
+            logger = LoggerClass(filename, False, poptus.LOG_LEVEL_MIN_DEBUG,
+                                 buffer_size=4096)
+            logger.set_caller_levels({"Quiet": poptus.LOG_LEVEL_NONE})
+            # The open file handle is not copied
+            logger.log(self.__tag, "Before", DEFAULT)
+
+            copy = pickle.loads(pickle.dumps(logger))
+            self.assertTrue(type(copy) is LoggerClass)
+            self.assertEqual(logger.level, copy.level)
+            self.assertEqual(logger.caller_levels, copy.caller_levels)
+            self.assertEqual(logger.filename, copy.filename)
+            self.assertEqual(logger.buffer_size, copy.buffer_size)
+            copy.log(self.__tag, "Copy", DEFAULT)
+            copy.log("Quiet", "Not logged", DEFAULT)
+            copy.close()
+            logger.log(self.__tag, "After", DEFAULT)
+            logger.close()
+
+            # Copies append rather than overwrite
+            if LoggerClass is poptus.JsonLinesLogger:
+                records = list(poptus.read_json_lines_log(filename))
+                self.assertEqual(["Copy", "Before", "After"],
+                                 [e["msg"] for e in records])
+            elif LoggerClass is poptus.FileLogger:
+                expected = [f"[{self.__tag}] {e}\n"
+                            for e in ["Copy", "Before", "After"]]
+                self.assertEqual(expected, self._load(filename))
+
+    def testPickleStandardLogger(self):
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT,
+                                       buffer_size=1024)
+        logger.log(self.__tag, "Before", poptus.LOG_LEVEL_DEFAULT)
+
+        # Gathered messages are not copied
+        copy = pickle.loads(pickle.dumps(logger))
+        self.assertEqual(logger.buffer_size, copy.buffer_size)
+        with redirect_stdout(io.StringIO()) as buffer:
+            copy.flush()
+        self.assertEqual("", buffer.getvalue())
+        with redirect_stdout(io.StringIO()) as buffer:
+            copy.log(self.__tag, "Copy", poptus.LOG_LEVEL_DEFAULT)
+            copy.flush()
+            logger.flush()
+        self.assertEqual(f"[{self.__tag}] Copy\n[{self.__tag}] Before\n",
+                         buffer.getvalue())
+
+    def testPickleWrappingLoggers(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+        MIN_DEBUG = poptus.LOG_LEVEL_MIN_DEBUG
+
+        builders = [
+            lambda x: poptus.FanOutLogger([x, poptus.StandardLogger()]),
+            lambda x: poptus.QueueLogger(x, max_size=16),
+            lambda x: poptus.RingBufferLogger(x, 8, MIN_DEBUG),
+            lambda x: poptus.DeduplicatingLogger(x, max_warnings=4),
+            lambda x: poptus.ThreadBufferedLogger(x, max_records=4),
+            lambda x: poptus.AsyncLogger(
+                x, policy=poptus.QUEUE_POLICY_DROP_NEW
+            )
+        ]
+        for i, build in enumerate(builders):
+            filename = self.__dir.joinpath(f"test_{i}.log")
+            sink = poptus.FileLogger(filename, False, DEFAULT,
+                                     buffer_size=4096)
+            logger = build(sink)
+            with redirect_stdout(io.StringIO()):
+                logger.log(self.__tag, "Before", DEFAULT)
+                logger.log(self.__tag, "Buffered", MIN_DEBUG)
+
+            copy = pickle.loads(pickle.dumps(logger))
+            self.assertTrue(type(copy) is type(logger))
+            self.assertEqual(logger.level, copy.level)
+            for name in ["max_size", "policy", "capacity", "warn_once",
+                         "collapse_repeats", "max_warnings", "max_records"]:
+                if hasattr(logger, name):
+                    self.assertEqual(getattr(logger, name),
+                                     getattr(copy, name))
+
+            # Copies are refreshed when the levels of their loggers change
+            functions = poptus.create_log_functions(copy, self.__tag)
+            self.assertFalse(functions.is_enabled(MIN_DEBUG + 1))
+            copy.set_caller_levels({self.__tag: poptus.LOG_LEVEL_MAX})
+            self.assertTrue(functions.is_enabled(MIN_DEBUG + 1))
+
+            with redirect_stdout(io.StringIO()):
+                copy.log(self.__tag, "Copy", DEFAULT)
+                copy.close()
+                logger.close()
+
+            lines = self._load(filename)
+            for msg in ["Before", "Copy"]:
+                self.assertEqual(1, lines.count(f"[{self.__tag}] {msg}\n"))
+
+    def testPickleLogFunctions(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+
+        logger = poptus.FileLogger(self.__filename, False, DEFAULT,
+                                   buffer_size=4096)
+        functions = poptus.create_log_functions(logger, self.__tag,
+                                                sample={DEFAULT: 2})
+        log, _, _, _ = functions
+        for i in range(4):
+            log("Message {}", i)
+        self.assertEqual({DEFAULT: 2}, functions.n_suppressed)
+
+        copy = pickle.loads(pickle.dumps(functions))
+        self.assertEqual(self.__tag, copy.caller)
+        self.assertEqual({DEFAULT: 0}, copy.n_suppressed)
+        self.assertTrue(copy.is_enabled(DEFAULT))
+        copy.logger.level = poptus.LOG_LEVEL_NONE
+        self.assertFalse(copy.is_enabled(DEFAULT))
+        self.assertTrue(functions.is_enabled(DEFAULT))
+
+        # Bound log functions are pickled with their log functions
+        log_copy = pickle.loads(pickle.dumps(log))
+        log_copy("Copy")
+        log_copy("Suppressed")
+        log_copy.__self__.logger.close()
+        logger.close()
+
+        expected = [f"[{self.__tag}] {e}\n"
+                    for e in ["Copy", "Message 0", "Message 2"]]
+        self.assertEqual(expected, self._load(self.__filename))
+
+    def testProcessPool(self):
+        N_WORKERS = 2
+        N_TASKS = 4
+
+        methods = multiprocessing.get_all_start_methods()
+        for method in [e for e in ["fork", "spawn"] if e in methods]:
+            context = multiprocessing.get_context(method)
+            with redirect_stdout(io.StringIO()):
+                logger = poptus.FileLogger(self.__filename, True,
+                                           poptus.LOG_LEVEL_MIN_DEBUG,
+                                           buffer_size=1024 * 1024)
+            log, log_debug, _, _ = \
+                poptus.create_log_functions(logger, self.__tag)
+            log("Start")
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                with ProcessPoolExecutor(max_workers=N_WORKERS,
+                                         mp_context=context) as pool:
+                    pids = list(pool.map(log_in_worker,
+                                         [log_debug] * N_TASKS,
+                                         range(N_TASKS)))
+            log("End")
+            logger.close()
+            self.assertTrue(os.getpid() not in pids)
+
+            # No buffered messages are lost or duplicated
+            lines = self._load(self.__filename)
+            self.assertEqual(N_TASKS * N_WORKER_MSGS + 2, len(lines))
+            self.assertEqual(1, lines.count(f"[{self.__tag}] Start\n"))
+            self.assertEqual(f"[{self.__tag}] End\n", lines[-1])
+            for index in range(N_TASKS):
+                prefix = f"[{self.__tag}] Task {index} "
+                messages = [e for e in lines if e.startswith(prefix)]
+                expected = [f"{prefix}message {i}\n"
+                            for i in range(N_WORKER_MSGS)]
+                self.assertEqual(expected, messages)
+
+    @unittest.skipIf(not hasattr(os, "fork"), "os.fork not available")
+    def testForkFileLogger(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+
+        logger = poptus.FileLogger(self.__filename, False, DEFAULT,
+                                   buffer_size=4096)
+        log, _, _, _ = poptus.create_log_functions(logger, self.__tag)
+        log("Before")
+
+        def work():
+            log("Child")
+            logger.close()
+
+        # Messages buffered before forking are written once
+        self.assertEqual(0, self._fork(work))
+        log("After")
+        logger.close()
+
+        expected = [f"[{self.__tag}] {e}\n"
+                    for e in ["Before", "Child", "After"]]
+        self.assertEqual(expected, self._load(self.__filename))
+
+    @unittest.skipIf(not hasattr(os, "fork"), "os.fork not available")
+    def testForkQueueLoggerLazily(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+
+        def writers():
+            return [thread for thread in threading.enumerate()
+                    if thread.name == "poptus-QueueLogger"]
+
+        sink = poptus.FileLogger(self.__filename, False, DEFAULT)
+        used = poptus.QueueLogger(sink)
+        unused = poptus.QueueLogger(sink)
+        used.log(self.__tag, "Before", DEFAULT)
+        used.flush()
+
+        def work():
+            # Children start writer threads only for the loggers that they use
+            assert len(writers()) == 0
+            used.log(self.__tag, "Child", DEFAULT)
+            assert len(writers()) == 1
+            used.close()
+            unused.close()
+            assert len(writers()) == 0
+
+        self.assertEqual(0, self._fork(work))
+        used.close()
+        unused.close()
+
+        expected = [f"[{self.__tag}] {e}\n" for e in ["Before", "Child"]]
+        self.assertEqual(expected, self._load(self.__filename))
+
+    @unittest.skipIf(not hasattr(os, "fork"), "os.fork not available")
+    def testForkWrappingLoggers(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+
+        sink = poptus.FileLogger(self.__filename, False, DEFAULT,
+                                 buffer_size=4096)
+        logger = poptus.DeduplicatingLogger(
+            poptus.ThreadBufferedLogger(
+                poptus.AsyncLogger(poptus.QueueLogger(sink))
+            )
+        )
+        log, _, warn, _ = poptus.create_log_functions(
+            logger, self.__tag, rate_limit={DEFAULT: (1.0e-6, 1)}
+        )
+        log("Before")
+        log("Suppressed")
+        warn("Repeated")
+        warn("Repeated")
+        self.assertEqual({DEFAULT: 1}, log.__self__.n_suppressed)
+
+        def work():
+            # Workers and filters are restarted in the child
+            assert log.__self__.n_suppressed == {DEFAULT: 0}
+            log("Child")
+            warn("Child")
+            logger.close()
+
+        self.assertEqual(0, self._fork(work))
+        log("After")
+        logger.close()
+
+        lines = self._load(self.__filename)
+        self.assertEqual(1, lines.count(f"[{self.__tag}] Before\n"))
+        self.assertEqual(1, lines.count(f"[{self.__tag}] WARNING - Repeated\n"))
+        self.assertEqual(1, lines.count(f"[{self.__tag}] Child\n"))
+        self.assertEqual(1, lines.count(f"[{self.__tag}] WARNING - Child\n"))
+        self.assertEqual(0, lines.count(f"[{self.__tag}] After\n"))
+        self.assertEqual(0, lines.count(f"[{self.__tag}] Suppressed\n"))
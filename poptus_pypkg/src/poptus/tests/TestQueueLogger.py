@@ -0,0 +1,288 @@
+"""
+Automatic unittest of the QueueLogger class
+"""
+
+import gc
+import os
+import io
+import shutil
+import threading
+import weakref
+import unittest
+
+from pathlib import Path
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
+import poptus
+
+
+class GatedLogger(poptus.AbstractLogger):
+    # Logger that records all messages in memory and that only writes messages
+    # once its gate is open so that tests can control when the queue drains.
+    def __init__(self, level):
+        super().__init__(level)
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+        self.records = []
+        self.n_closes = 0
+
+    def log(self, caller, msg, level):
+        self.entered.set()
+        self.gate.wait()
+        if self.level_of(caller) >= level:
+            self.records.append(f"[{caller}] {msg}")
+
+    def warn(self, caller, msg):
+        self.entered.set()
+        self.gate.wait()
+        self.records.append(f"[{caller}] WARNING - {msg}")
+
+    def error(self, caller, msg):
+        self.records.append(f"[{caller}] ERROR - {msg}")
+
+    def close(self):
+        self.n_closes += 1
+
+
+class TestQueueLogger(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_queue")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.log")
+
+        self.__tag = "Unittest"
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+
+        # Confirm good arguments
+        logger = poptus.QueueLogger(poptus.StandardLogger())
+        self.assertEqual(poptus.LOG_LEVEL_DEFAULT, logger.level)
+        self.assertEqual(poptus.QUEUE_POLICY_BLOCK, logger.policy)
+        self.assertEqual(0, logger.n_dropped)
+        logger.close()
+
+        self.__bad_loggers = [
+            None, 1, 1.1, "", "Logger",
+            [], [poptus.StandardLogger()],
+            {}, {"Logger": poptus.StandardLogger()}
+        ]
+        self.__bad_max_sizes = [
+            None, True, 1.1, "", "10", [], [10], {}, {"MaxSize": 10}
+        ]
+        self.__bad_policies = [
+            None, 1, "", "Drop", [], [poptus.QUEUE_POLICY_BLOCK]
+        ]
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def testBadArguments(self):
+        for bad in self.__bad_loggers:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(TypeError):
+                    poptus.QueueLogger(bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for bad in self.__bad_max_sizes:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(TypeError):
+                    poptus.QueueLogger(poptus.StandardLogger(), max_size=bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for bad in [0, -1]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.QueueLogger(poptus.StandardLogger(), max_size=bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for bad in self.__bad_policies:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.QueueLogger(poptus.StandardLogger(), policy=bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testLevel(self):
+        for level in poptus.LOG_LEVELS:
+            inner = poptus.StandardLogger(level)
+            with poptus.QueueLogger(inner) as logger:
+                self.assertEqual(level, logger.level)
+                self.assertTrue(inner is logger.logger)
+                with self.assertRaises(AssertionError):
+                    logger.log(self.__tag, "Bad", poptus.LOG_LEVEL_NONE)
+
+    def testFileLogger(self):
+        N_MSGS = 1000
+        ERROR_MSG = "Oops!"
+        EXPECTED_ERROR_MSG = f"[{self.__tag}] ERROR - {ERROR_MSG}\n"
+
+        inner = poptus.FileLogger(self.__filename, False,
+                                  poptus.LOG_LEVEL_MIN_DEBUG,
+                                  buffer_size=4096)
+        logger = poptus.QueueLogger(inner, max_size=10)
+
+        expected = []
+        for i in range(N_MSGS):
+            logger.log(self.__tag, f"Info {i}", poptus.LOG_LEVEL_DEFAULT)
+            logger.log(self.__tag, f"Debug {i}", poptus.LOG_LEVEL_MIN_DEBUG)
+            logger.log(self.__tag, f"Skipped {i}", poptus.LOG_LEVEL_MAX)
+            expected += [f"[{self.__tag}] Info {i}\n",
+                         f"[{self.__tag}] Debug {i}\n"]
+        logger.warn(self.__tag, "Warning")
+        expected += [f"[{self.__tag}] WARNING - Warning\n"]
+
+        # Errors are written synchronously after all queued messages
+        with redirect_stderr(io.StringIO()) as buffer:
+            logger.error(self.__tag, ERROR_MSG)
+        self.assertEqual(EXPECTED_ERROR_MSG, buffer.getvalue())
+        expected += [EXPECTED_ERROR_MSG]
+        with open(self.__filename, "r") as fptr:
+            self.assertEqual(expected, fptr.readlines())
+
+        # Closing drains queue
+        logger.log(self.__tag, "Last", poptus.LOG_LEVEL_DEFAULT)
+        logger.close()
+        logger.close()
+        expected += [f"[{self.__tag}] Last\n"]
+        with open(self.__filename, "r") as fptr:
+            self.assertEqual(expected, fptr.readlines())
+        self.assertEqual(0, logger.n_dropped)
+
+        # Messages still logged synchronously after close
+        logger.log(self.__tag, "After", poptus.LOG_LEVEL_DEFAULT)
+        inner.close()
+        expected += [f"[{self.__tag}] After\n"]
+        with open(self.__filename, "r") as fptr:
+            self.assertEqual(expected, fptr.readlines())
+
+    def testStandardLogger(self):
+        MSG = "I have something rather important to say"
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            with poptus.QueueLogger(poptus.StandardLogger()) as logger:
+                logger.log(self.__tag, MSG, poptus.LOG_LEVEL_DEFAULT)
+                logger.log_fields(self.__tag, MSG, poptus.LOG_LEVEL_DEFAULT,
+                                  {"iteration": 1})
+                logger.log_fields(self.__tag, MSG, poptus.LOG_LEVEL_MAX,
+                                  {"iteration": 2})
+                logger.warn(self.__tag, MSG)
+        expected = f"[{self.__tag}] {MSG}\n" \
+            + f"[{self.__tag}] {MSG} iteration=1\n" \
+            + f"[{self.__tag}] WARNING - {MSG}\n"
+        self.assertEqual(expected, buffer.getvalue())
+
+    def testDropNew(self):
+        MAX_SIZE = 5
+
+        inner = GatedLogger(poptus.LOG_LEVEL_DEFAULT)
+        logger = poptus.QueueLogger(inner, MAX_SIZE,
+                                    poptus.QUEUE_POLICY_DROP_NEW)
+
+        # Hold the writer thread on the first message so that the queue fills
+        # deterministically
+        inner.gate.clear()
+        logger.log(self.__tag, "Held", poptus.LOG_LEVEL_DEFAULT)
+        inner.entered.wait()
+        for i in range(MAX_SIZE + 3):
+            logger.log(self.__tag, f"{i}", poptus.LOG_LEVEL_DEFAULT)
+        self.assertEqual(3, logger.n_dropped)
+
+        inner.gate.set()
+        logger.close()
+        expected = [f"[{self.__tag}] Held"]
+        expected += [f"[{self.__tag}] {i}" for i in range(MAX_SIZE)]
+        self.assertEqual(expected, inner.records)
+        self.assertEqual(1, inner.n_closes)
+
+    def testDropOldest(self):
+        MAX_SIZE = 5
+
+        inner = GatedLogger(poptus.LOG_LEVEL_DEFAULT)
+        logger = poptus.QueueLogger(inner, MAX_SIZE,
+                                    poptus.QUEUE_POLICY_DROP_OLDEST)
+
+        inner.gate.clear()
+        logger.log(self.__tag, "Held", poptus.LOG_LEVEL_DEFAULT)
+        inner.entered.wait()
+        for i in range(MAX_SIZE + 3):
+            logger.warn(self.__tag, f"{i}")
+        self.assertEqual(3, logger.n_dropped)
+
+        inner.gate.set()
+        logger.close()
+        expected = [f"[{self.__tag}] Held"]
+        expected += [f"[{self.__tag}] WARNING - {i}"
+                     for i in range(3, MAX_SIZE + 3)]
+        self.assertEqual(expected, inner.records)
+
+    def testBlock(self):
+        MAX_SIZE = 2
+        N_MSGS = 10
+
+        inner = GatedLogger(poptus.LOG_LEVEL_DEFAULT)
+        logger = poptus.QueueLogger(inner, MAX_SIZE, poptus.QUEUE_POLICY_BLOCK)
+
+        inner.gate.clear()
+
+        def produce():
+            for i in range(N_MSGS):
+                logger.log(self.__tag, f"{i}", poptus.LOG_LEVEL_DEFAULT)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        producer.join(timeout=0.1)
+        # Producer is blocked on full queue
+        self.assertTrue(producer.is_alive())
+
+        inner.gate.set()
+        producer.join()
+        logger.close()
+        expected = [f"[{self.__tag}] {i}" for i in range(N_MSGS)]
+        self.assertEqual(expected, inner.records)
+        self.assertEqual(0, logger.n_dropped)
+
+    def testCallerLevels(self):
+        inner = GatedLogger(poptus.LOG_LEVEL_DEFAULT)
+        logger = poptus.QueueLogger(inner)
+        logger.set_caller_levels({"Method": poptus.LOG_LEVEL_MAX})
+        self.assertEqual({"Method": poptus.LOG_LEVEL_MAX}, inner.caller_levels)
+        self.assertEqual({"Method": poptus.LOG_LEVEL_MAX}, logger.caller_levels)
+        self.assertEqual(poptus.LOG_LEVEL_MAX, logger.level_of("Method"))
+
+        logger.log("Method", "Debug", poptus.LOG_LEVEL_MAX)
+        logger.log("Model", "Debug", poptus.LOG_LEVEL_MAX)
+        logger.close()
+        self.assertEqual(["[Method] Debug"], inner.records)
+
+    def testUnclosedLogger(self):
+        def writers():
+            return [thread for thread in threading.enumerate()
+                    if thread.name == "poptus-QueueLogger"]
+
+        inner = GatedLogger(poptus.LOG_LEVEL_DEFAULT)
+        n_writers = len(writers())
+        logger = poptus.QueueLogger(inner)
+        self.assertEqual(n_writers + 1, len(writers()))
+        for i in range(10):
+            logger.log(self.__tag, f"{i}", poptus.LOG_LEVEL_DEFAULT)
+
+        # Loggers that are no longer in use write all queued messages and stop
+        # their writer thread
+        ref = weakref.ref(logger)
+        del logger
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(n_writers, len(writers()))
+        expected = [f"[{self.__tag}] {i}" for i in range(10)]
+        self.assertEqual(expected, inner.records)
@@ -0,0 +1,96 @@
+"""
+Automatic unittest of the read_json_lines_log function
+"""
+
+import os
+import io
+import types
+import shutil
+import unittest
+
+from pathlib import Path
+from contextlib import redirect_stderr
+
+import poptus
+
+
+class TestReadJsonLinesLog(unittest.TestCase):
+    # All tests should suppress writing to stderr, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_read_json")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.jsonl")
+
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+
+        logger = poptus.JsonLinesLogger(self.__filename, False,
+                                        poptus.LOG_LEVEL_DEFAULT)
+        for i in range(10):
+            logger.log_fields("Method", f"Iteration {i}",
+                              poptus.LOG_LEVEL_DEFAULT, {"iteration": i})
+            logger.log("Model", "Method", poptus.LOG_LEVEL_DEFAULT)
+        logger.warn("Method", "Warning")
+        logger.warn("Model \"quoted\"", "Warning")
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def testBadArguments(self):
+        for bad in [None, 1, 1.1, [], [self.__filename], {}]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(TypeError):
+                    poptus.read_json_lines_log(bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for bad in ["", self.__dir, self.__dir.joinpath("not_a_file.jsonl")]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.read_json_lines_log(bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testReadAll(self):
+        records = poptus.read_json_lines_log(self.__filename)
+        self.assertTrue(isinstance(records, types.GeneratorType))
+        records = list(records)
+        self.assertEqual(22, len(records))
+        self.assertEqual("Iteration 0", records[0]["msg"])
+        self.assertEqual({"iteration": 0}, records[0]["fields"])
+        self.assertEqual("Model \"quoted\"", records[-1]["caller"])
+
+    def testFilters(self):
+        # Message containing caller name is not mistaken for the caller
+        records = list(poptus.read_json_lines_log(self.__filename,
+                                                  callers=["Method"]))
+        self.assertEqual(11, len(records))
+        self.assertEqual(list(range(10)),
+                         [e["fields"]["iteration"] for e in records[:-1]])
+        for record in records:
+            self.assertEqual("Method", record["caller"])
+
+        records = list(poptus.read_json_lines_log(
+            self.__filename, callers={"Model", "Model \"quoted\""}
+        ))
+        self.assertEqual(11, len(records))
+
+        records = list(poptus.read_json_lines_log(
+            self.__filename, record_types=[poptus.LOG_RECORD_WARNING]
+        ))
+        self.assertEqual(2, len(records))
+
+        records = list(poptus.read_json_lines_log(
+            self.__filename,
+            callers=["Model \"quoted\""],
+            record_types=[poptus.LOG_RECORD_WARNING]
+        ))
+        self.assertEqual(1, len(records))
+
+        records = list(poptus.read_json_lines_log(self.__filename,
+                                                  callers=["Nobody"]))
+        self.assertEqual([], records)
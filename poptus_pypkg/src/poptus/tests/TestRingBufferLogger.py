@@ -0,0 +1,174 @@
+"""
+Automatic unittest of the RingBufferLogger class
+"""
+
+import io
+import unittest
+
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
+import poptus
+
+
+class TestRingBufferLogger(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__tag = "Unittest"
+        self.__poptus_tag = poptus._constants.POPTUS_LOG_TAG
+        self.__error_start = f"[{self.__poptus_tag}] ERROR"
+        self.__sink = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+
+    def testBadArguments(self):
+        for bad in [None, 1, "logger"]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(TypeError):
+                    poptus.RingBufferLogger(bad, 10)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        for bad in [None, True, 1.0, "10", [10]]:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(TypeError):
+                    poptus.RingBufferLogger(self.__sink, bad)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        bad_cases = [
+            (self.__sink, 0, poptus.LOG_LEVEL_MAX),
+            (self.__sink, -1, poptus.LOG_LEVEL_MAX),
+            (self.__sink, 10, poptus.LOG_LEVEL_MAX + 1),
+            (self.__sink, 10, poptus.LOG_LEVEL_NONE),
+            (poptus.StandardLogger(poptus.LOG_LEVEL_NONE), 10,
+             poptus.LOG_LEVEL_MAX),
+            (poptus.StandardLogger(poptus.LOG_LEVEL_MAX), 10,
+             poptus.LOG_LEVEL_MIN_DEBUG)
+        ]
+        for sink, capacity, level in bad_cases:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(ValueError):
+                    poptus.RingBufferLogger(sink, capacity, level)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testProperties(self):
+        logger = poptus.RingBufferLogger(self.__sink, 10)
+        self.assertTrue(isinstance(logger, poptus.AbstractLogger))
+        self.assertEqual(poptus.LOG_LEVEL_MAX, logger.level)
+        self.assertTrue(logger.logger is self.__sink)
+        self.assertEqual(10, logger.capacity)
+        self.assertEqual(0, logger.n_buffered)
+        with self.assertRaises(AssertionError):
+            logger.log(self.__tag, "Bad", poptus.LOG_LEVEL_NONE)
+
+    def testPassThrough(self):
+        logger = poptus.RingBufferLogger(self.__sink, 10,
+                                         poptus.LOG_LEVEL_MIN_DEBUG)
+        with redirect_stdout(io.StringIO()) as buffer:
+            logger.log(self.__tag, "General", poptus.LOG_LEVEL_DEFAULT)
+            logger.log_fields(self.__tag, "Fields", poptus.LOG_LEVEL_DEFAULT,
+                              {"x": 1})
+            logger.log(self.__tag, "Debug", poptus.LOG_LEVEL_MIN_DEBUG)
+            logger.log(self.__tag, "Ignored", poptus.LOG_LEVEL_MAX)
+            logger.warn(self.__tag, "Careful")
+        expected = f"[{self.__tag}] General\n" \
+            + f"[{self.__tag}] Fields x=1\n" \
+            + f"[{self.__tag}] WARNING - Careful\n"
+        self.assertEqual(expected, buffer.getvalue())
+        self.assertEqual(1, logger.n_buffered)
+
+    def testDumpOnError(self):
+        logger = poptus.RingBufferLogger(self.__sink, 3)
+        with redirect_stdout(io.StringIO()) as buffer:
+            for i in range(5):
+                logger.log(self.__tag, f"Debug {i}", poptus.LOG_LEVEL_MAX)
+            logger.log_fields(self.__tag, "", poptus.LOG_LEVEL_MIN_DEBUG,
+                              {"i": 5})
+        self.assertEqual("", buffer.getvalue())
+        self.assertEqual(3, logger.n_buffered)
+
+        MAX = poptus.LOG_LEVEL_MAX
+        MIN_DEBUG = poptus.LOG_LEVEL_MIN_DEBUG
+        with redirect_stdout(io.StringIO()) as buffer:
+            with redirect_stderr(io.StringIO()) as err_buffer:
+                logger.error(self.__tag, "Failed")
+        expected = \
+            f"[{self.__poptus_tag}] Begin last 3 of 6 buffered messages\n" \
+            + f"[{self.__tag}] (level {MAX}) Debug 3\n" \
+            + f"[{self.__tag}] (level {MAX}) Debug 4\n" \
+            + f"[{self.__tag}] (level {MIN_DEBUG}) i=5\n" \
+            + f"[{self.__poptus_tag}] End of buffered messages\n"
+        self.assertEqual(expected, buffer.getvalue())
+        self.assertEqual(f"[{self.__tag}] ERROR - Failed\n",
+                         err_buffer.getvalue())
+        self.assertEqual(0, logger.n_buffered)
+
+        # Nothing left to dump
+        with redirect_stdout(io.StringIO()) as buffer:
+            logger.dump()
+        self.assertEqual("", buffer.getvalue())
+
+    def testDumpOnDemand(self):
+        logger = poptus.RingBufferLogger(self.__sink, 100)
+        with redirect_stdout(io.StringIO()) as buffer:
+            logger.log(self.__tag, "Debug", poptus.LOG_LEVEL_MAX)
+            logger.dump()
+        expected = \
+            f"[{self.__poptus_tag}] Begin last 1 of 1 buffered messages\n" \
+            + f"[{self.__tag}] (level {poptus.LOG_LEVEL_MAX}) Debug\n" \
+            + f"[{self.__poptus_tag}] End of buffered messages\n"
+        self.assertEqual(expected, buffer.getvalue())
+
+    def testLogFunctions(self):
+        logger = poptus.RingBufferLogger(self.__sink, 2)
+        log, log_debug, _, log_and_abort = \
+            poptus.create_log_functions(logger, self.__tag)
+        with redirect_stdout(io.StringIO()) as buffer:
+            log("Start")
+            for i in range(100):
+                log_debug("Iteration {}", poptus.LOG_LEVEL_MAX, i)
+            with redirect_stderr(io.StringIO()):
+                with self.assertRaises(RuntimeError):
+                    log_and_abort(RuntimeError, "Diverged")
+        lines = buffer.getvalue().splitlines()
+        MAX = poptus.LOG_LEVEL_MAX
+        self.assertEqual([f"[{self.__tag}] Start",
+                          f"[{self.__tag}] (level {MAX}) Iteration 98",
+                          f"[{self.__tag}] (level {MAX}) Iteration 99"],
+                         [lines[0]] + lines[2:4])
+
+    def testCallerLevels(self):
+        sink = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        sink.set_caller_levels({"Method": poptus.LOG_LEVEL_MAX})
+        logger = poptus.RingBufferLogger(sink, 10, poptus.LOG_LEVEL_MIN_DEBUG)
+        logger.set_caller_levels({"Model": poptus.LOG_LEVEL_DEFAULT})
+        self.assertEqual(poptus.LOG_LEVEL_MAX, logger.level_of("Method"))
+        self.assertEqual(poptus.LOG_LEVEL_DEFAULT, logger.level_of("Model"))
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            logger.log("Method", "Written", poptus.LOG_LEVEL_MAX)
+            logger.log("Model", "Dropped", poptus.LOG_LEVEL_MIN_DEBUG)
+            logger.log("Other", "Buffered", poptus.LOG_LEVEL_MIN_DEBUG)
+        self.assertEqual("[Method] Written\n", buffer.getvalue())
+        self.assertEqual(1, logger.n_buffered)
+
+    def testDumpThroughSilencedCaller(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+        MIN_DEBUG = poptus.LOG_LEVEL_MIN_DEBUG
+        sink = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+        sink.set_caller_levels({"Model": poptus.LOG_LEVEL_NONE})
+        logger = poptus.RingBufferLogger(sink, 10)
+        with redirect_stdout(io.StringIO()) as buffer:
+            logger.log("Model", "General", poptus.LOG_LEVEL_DEFAULT)
+            logger.log("Model", "Debug", poptus.LOG_LEVEL_MIN_DEBUG)
+            with redirect_stderr(io.StringIO()):
+                logger.error("Model", "Failed")
+        expected = \
+            f"[{self.__poptus_tag}] Begin last 2 of 2 buffered messages\n" \
+            + f"[Model] WARNING - (level {DEFAULT}) General\n" \
+            + f"[Model] WARNING - (level {MIN_DEBUG}) Debug\n" \
+            + f"[{self.__poptus_tag}] End of buffered messages\n"
+        self.assertEqual(expected, buffer.getvalue())
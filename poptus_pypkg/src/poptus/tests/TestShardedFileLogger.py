@@ -0,0 +1,200 @@
+"""
+Automatic unittest of the ShardedFileLogger class
+"""
+
+import os
+import io
+import pickle
+import shutil
+import unittest
+import threading
+import multiprocessing
+
+from pathlib import Path
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+from concurrent.futures import ProcessPoolExecutor
+
+import poptus
+
+N_WORKER_MSGS = 200
+
+
+def log_in_worker(logger, index):
+    for i in range(N_WORKER_MSGS):
+        logger.log(f"Worker {index}", f"Message {i}",
+                   poptus.LOG_LEVEL_DEFAULT)
+    return os.getpid()
+
+
+class TestShardedFileLogger(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_sharded")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.log")
+
+        self.__tag = "Unittest"
+        self.__warn_start = f"[{poptus._constants.POPTUS_LOG_TAG}] WARNING"
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def _load(self, filename):
+        with open(filename, "r") as fptr:
+            lines = fptr.readlines()
+        return lines
+
+    def testShardFilename(self):
+        logger = poptus.ShardedFileLogger(self.__filename, False)
+        self.assertTrue(isinstance(logger, poptus.FileLogger))
+        self.assertEqual(self.__filename, logger.filename)
+        expected = self.__dir.joinpath(f"test.log.{os.getpid()}.shard")
+        self.assertEqual(expected, logger.shard_filename)
+
+    def testLog(self):
+        ERROR_MSG = "Oops!"
+        EXPECTED_ERROR_MSG = f"[{self.__tag}] ERROR - {ERROR_MSG}\n"
+
+        for buffer_size in [None, 4096]:
+            with redirect_stdout(io.StringIO()):
+                logger = poptus.ShardedFileLogger(self.__filename, True,
+                                                  poptus.LOG_LEVEL_DEFAULT,
+                                                  buffer_size=buffer_size)
+            shard = logger.shard_filename
+
+            # Nothing written until a message is logged
+            logger.log(self.__tag, "Skipped", poptus.LOG_LEVEL_MIN_DEBUG)
+            self.assertFalse(shard.exists())
+            self.assertFalse(self.__filename.exists())
+
+            logger.log(self.__tag, "Info", poptus.LOG_LEVEL_DEFAULT)
+            logger.warn(self.__tag, "Multi-line\nwarning with \\n")
+            with redirect_stderr(io.StringIO()) as buffer:
+                logger.error(self.__tag, ERROR_MSG)
+            self.assertEqual(EXPECTED_ERROR_MSG, buffer.getvalue())
+            logger.close()
+            self.assertFalse(self.__filename.exists())
+
+            lines = self._load(shard)
+            self.assertEqual(3, len(lines))
+            for sequence, line in enumerate(lines):
+                timestamp, n, _ = line.split(" ", 2)
+                self.assertEqual(sequence, int(n))
+                self.assertTrue(int(timestamp) > 0)
+
+            self.assertEqual(3, poptus.merge_log_shards(self.__filename,
+                                                        remove_shards=True))
+            expected = [
+                f"[{self.__tag}] Info\n",
+                f"[{self.__tag}] WARNING - Multi-line\n",
+                "warning with \\n\n",
+                EXPECTED_ERROR_MSG
+            ]
+            self.assertEqual(expected, self._load(self.__filename))
+
+    def testThreads(self):
+        N_THREADS = 8
+
+        logger = poptus.ShardedFileLogger(self.__filename, False,
+                                          buffer_size=4096)
+
+        def work(index):
+            log_in_worker(logger, index)
+
+        threads = [threading.Thread(target=work, args=(i,))
+                   for i in range(N_THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.close()
+
+        # Records are written in order of both sequence number and timestamp
+        records = [line.split(" ", 2) for line in self._load(
+            logger.shard_filename
+        )]
+        self.assertEqual(N_THREADS * N_WORKER_MSGS, len(records))
+        self.assertEqual(list(range(len(records))),
+                         [int(n) for _, n, _ in records])
+        timestamps = [int(timestamp) for timestamp, _, _ in records]
+        self.assertEqual(sorted(timestamps), timestamps)
+
+    def testOverwrite(self):
+        logger = poptus.ShardedFileLogger(self.__filename, False)
+        logger.warn(self.__tag, "Warning")
+        self.assertTrue(logger.shard_filename.exists())
+
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(RuntimeError):
+                poptus.ShardedFileLogger(self.__filename, False)
+        # print(buffer.getvalue())
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            logger = poptus.ShardedFileLogger(self.__filename, True)
+        self.assertTrue(buffer.getvalue().startswith(self.__warn_start))
+        self.assertFalse(logger.shard_filename.exists())
+
+    def testPickle(self):
+        logger = poptus.ShardedFileLogger(self.__filename, False,
+                                          poptus.LOG_LEVEL_MIN_DEBUG,
+                                          buffer_size=4096)
+        logger.log(self.__tag, "Before", poptus.LOG_LEVEL_DEFAULT)
+
+        copy = pickle.loads(pickle.dumps(logger))
+        self.assertEqual(logger.level, copy.level)
+        self.assertEqual(logger.filename, copy.filename)
+        self.assertEqual(logger.buffer_size, copy.buffer_size)
+        copy.log(self.__tag, "After", poptus.LOG_LEVEL_DEFAULT)
+        copy.close()
+        logger.close()
+
+        # Both objects write to the same shard in this process
+        self.assertEqual(2, len(self._load(logger.shard_filename)))
+
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(),
+                     "fork start method not available")
+    def testProcessPool(self):
+        N_WORKERS = 4
+        N_TASKS = 8
+
+        context = multiprocessing.get_context("fork")
+        for buffer_size in [None, 1024]:
+            with redirect_stdout(io.StringIO()):
+                logger = poptus.ShardedFileLogger(self.__filename, True,
+                                                  poptus.LOG_LEVEL_DEFAULT,
+                                                  buffer_size=buffer_size)
+            logger.log(self.__tag, "Start", poptus.LOG_LEVEL_DEFAULT)
+            with ProcessPoolExecutor(max_workers=N_WORKERS,
+                                     mp_context=context) as pool:
+                pids = list(pool.map(log_in_worker,
+                                     [logger] * N_TASKS,
+                                     range(N_TASKS)))
+            logger.log(self.__tag, "End", poptus.LOG_LEVEL_DEFAULT)
+            logger.close()
+
+            n_records = poptus.merge_log_shards(self.__filename,
+                                                overwrite=True,
+                                                remove_shards=True)
+            self.assertEqual(N_TASKS * N_WORKER_MSGS + 2, n_records)
+            self.assertTrue(os.getpid() not in pids)
+
+            lines = self._load(self.__filename)
+            self.assertEqual(n_records, len(lines))
+            self.assertEqual(f"[{self.__tag}] Start\n", lines[0])
+            self.assertEqual(f"[{self.__tag}] End\n", lines[-1])
+            # Messages of each task are complete and in order
+            for index in range(N_TASKS):
+                caller = f"[Worker {index}] "
+                messages = [e for e in lines if e.startswith(caller)]
+                expected = [f"{caller}Message {i}\n"
+                            for i in range(N_WORKER_MSGS)]
+                self.assertEqual(expected, messages)
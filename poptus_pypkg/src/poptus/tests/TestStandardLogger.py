@@ -3,6 +3,7 @@ Automatic unittest of the StandardLogger class
 """
 
 import io
+import time
 import unittest
 
 from contextlib import (
@@ -109,3 +110,96 @@ class TestStandardLogger(unittest.TestCase):
             with redirect_stderr(io.StringIO()) as buffer:
                 logger.error(self.__tag, MSG)
             self.assertEqual(EXPECTED_MSG, buffer.getvalue())
+
+    def testBadBuffering(self):
+        for kwarg in ["buffer_size", "flush_interval"]:
+            for bad in [True, "", "1024", [1024], {}]:
+                with redirect_stderr(io.StringIO()) as buffer:
+                    with self.assertRaises(TypeError):
+                        poptus.StandardLogger(self.__good_level,
+                                              **{"buffer_size": 1024,
+                                                 kwarg: bad})
+                # print(buffer.getvalue())
+                self.assertTrue(
+                    buffer.getvalue().startswith(self.__error_start)
+                )
+
+            for bad in [0, -1]:
+                with redirect_stderr(io.StringIO()) as buffer:
+                    with self.assertRaises(ValueError):
+                        poptus.StandardLogger(self.__good_level,
+                                              **{"buffer_size": 1024,
+                                                 kwarg: bad})
+                # print(buffer.getvalue())
+                self.assertTrue(
+                    buffer.getvalue().startswith(self.__error_start)
+                )
+
+        # Flush interval only meaningful with buffering
+        with redirect_stderr(io.StringIO()) as buffer:
+            with self.assertRaises(ValueError):
+                poptus.StandardLogger(self.__good_level, flush_interval=1.0)
+        # print(buffer.getvalue())
+        self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testBuffered(self):
+        MSG = "Buffered"
+        EXPECTED_MSG = f"[{self.__tag}] {MSG}\n"
+
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT,
+                                       buffer_size=10 * len(EXPECTED_MSG))
+        self.assertEqual(10 * len(EXPECTED_MSG), logger.buffer_size)
+        self.assertIsNone(logger.flush_interval)
+        with redirect_stdout(io.StringIO()) as buffer:
+            for _ in range(9):
+                logger.log(self.__tag, MSG, poptus.LOG_LEVEL_DEFAULT)
+            logger.log(self.__tag, MSG, poptus.LOG_LEVEL_MIN_DEBUG)
+            self.assertEqual("", buffer.getvalue())
+
+            # Buffer full
+            logger.log(self.__tag, MSG, poptus.LOG_LEVEL_DEFAULT)
+            self.assertEqual(10 * EXPECTED_MSG, buffer.getvalue())
+
+            logger.log(self.__tag, MSG, poptus.LOG_LEVEL_DEFAULT)
+            logger.close()
+            self.assertEqual(11 * EXPECTED_MSG, buffer.getvalue())
+
+    def testFlushInterval(self):
+        MSG = "Buffered"
+        EXPECTED_MSG = f"[{self.__tag}] {MSG}\n"
+
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT,
+                                       buffer_size=1024 * 1024,
+                                       flush_interval=0.05)
+        self.assertEqual(0.05, logger.flush_interval)
+        with redirect_stdout(io.StringIO()) as buffer:
+            # Messages are written on time without logging further messages
+            for n_msgs in [1, 2]:
+                logger.log(self.__tag, MSG, poptus.LOG_LEVEL_DEFAULT)
+                self.assertEqual((n_msgs - 1) * EXPECTED_MSG,
+                                 buffer.getvalue())
+                end = time.monotonic() + 5.0
+                while (buffer.getvalue() != n_msgs * EXPECTED_MSG) and \
+                        (time.monotonic() < end):
+                    time.sleep(0.01)
+                self.assertEqual(n_msgs * EXPECTED_MSG, buffer.getvalue())
+
+    def testBufferedOrdering(self):
+        expected = f"[{self.__tag}] First\n" \
+            + f"[{self.__tag}] WARNING - Second\n" \
+            + f"[{self.__tag}] Third\n" \
+            + f"[{self.__tag}] ERROR - Fourth\n"
+
+        logger = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT,
+                                       buffer_size=1024 * 1024)
+        with redirect_stdout(io.StringIO()) as buffer:
+            with redirect_stderr(buffer):
+                logger.log(self.__tag, "First", poptus.LOG_LEVEL_DEFAULT)
+                logger.warn(self.__tag, "Second")
+                self.assertEqual(
+                    "".join(expected.splitlines(keepends=True)[:2]),
+                    buffer.getvalue()
+                )
+                logger.log(self.__tag, "Third", poptus.LOG_LEVEL_DEFAULT)
+                logger.error(self.__tag, "Fourth")
+        self.assertEqual(expected, buffer.getvalue())
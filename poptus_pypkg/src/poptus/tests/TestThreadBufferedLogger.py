@@ -0,0 +1,157 @@
+"""
+Automatic unittest of the ThreadBufferedLogger class
+"""
+
+import os
+import io
+import re
+import shutil
+import threading
+import unittest
+
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import (
+    redirect_stdout, redirect_stderr
+)
+
+import poptus
+
+
+class TestThreadBufferedLogger(unittest.TestCase):
+    # All tests should suppress writing to stdout/err, but check content of
+    # suppressed messages where useful.
+
+    def setUp(self):
+        self.__dir = Path.cwd().joinpath("delete_me_thread_buffered")
+        if self.__dir.exists():
+            shutil.rmtree(self.__dir)
+        os.mkdir(self.__dir)
+        self.__filename = self.__dir.joinpath("test.log")
+
+        self.__error_start = f"[{poptus._constants.POPTUS_LOG_TAG}] ERROR"
+        self.__sink = poptus.StandardLogger(poptus.LOG_LEVEL_DEFAULT)
+
+    def tearDown(self):
+        if self.__dir.is_dir():
+            shutil.rmtree(self.__dir)
+
+    def testBadArguments(self):
+        bad_args = [
+            (TypeError, (None,)),
+            (TypeError, ("logger",)),
+            (TypeError, (self.__sink, None)),
+            (TypeError, (self.__sink, True)),
+            (TypeError, (self.__sink, 1.0)),
+            (ValueError, (self.__sink, 0)),
+            (ValueError, (self.__sink, -1))
+        ]
+        for exception, args in bad_args:
+            with redirect_stderr(io.StringIO()) as buffer:
+                with self.assertRaises(exception):
+                    poptus.ThreadBufferedLogger(*args)
+            # print(buffer.getvalue())
+            self.assertTrue(buffer.getvalue().startswith(self.__error_start))
+
+    def testProperties(self):
+        logger = poptus.ThreadBufferedLogger(self.__sink, 10)
+        self.assertTrue(isinstance(logger, poptus.AbstractLogger))
+        self.assertIs(self.__sink, logger.logger)
+        self.assertEqual(10, logger.max_records)
+        self.assertEqual(poptus.LOG_LEVEL_DEFAULT, logger.level)
+
+        functions = poptus.create_log_functions(logger, "Model")
+        logger.level = poptus.LOG_LEVEL_MAX
+        self.assertEqual(poptus.LOG_LEVEL_MAX, self.__sink.level)
+        self.assertTrue(functions.is_enabled(poptus.LOG_LEVEL_MAX))
+        logger.set_caller_levels({"Model": poptus.LOG_LEVEL_NONE})
+        self.assertEqual(poptus.LOG_LEVEL_NONE, logger.level_of("Model"))
+        self.assertFalse(functions.is_enabled(poptus.LOG_LEVEL_DEFAULT))
+
+    def testOrder(self):
+        DEFAULT = poptus.LOG_LEVEL_DEFAULT
+
+        logger = poptus.ThreadBufferedLogger(self.__sink)
+
+        def log_in_thread(msg):
+            thread = threading.Thread(target=logger.log,
+                                      args=("Thread", msg, DEFAULT))
+            thread.start()
+            thread.join()
+
+        with redirect_stdout(io.StringIO()) as buffer:
+            logger.log("Main", "First", DEFAULT)
+            log_in_thread("Second")
+            logger.warn("Main", "Third")
+            log_in_thread("Fourth")
+            logger.log_fields("Main", "Fifth", DEFAULT, {"i": 5})
+            logger.log("Main", "Not logged", poptus.LOG_LEVEL_MAX)
+            self.assertEqual("", buffer.getvalue())
+            logger.flush()
+        self.assertEqual(["[Main] First",
+                          "[Thread] Second",
+                          "[Main] WARNING - Third",
+                          "[Thread] Fourth",
+                          "[Main] Fifth i=5"],
+                         buffer.getvalue().splitlines())
+
+        # Errors are written after all buffered messages
+        with redirect_stdout(io.StringIO()) as buffer:
+            with redirect_stderr(io.StringIO()) as err_buffer:
+                logger.log("Main", "Before", DEFAULT)
+                logger.error("Main", "Failed")
+        self.assertEqual("[Main] Before\n", buffer.getvalue())
+        self.assertEqual("[Main] ERROR - Failed\n", err_buffer.getvalue())
+
+        # Full buffers are written immediately
+        logger = poptus.ThreadBufferedLogger(self.__sink, 3)
+        with redirect_stdout(io.StringIO()) as buffer:
+            for i in range(7):
+                logger.log("Main", f"{i}", DEFAULT)
+            self.assertEqual(6, len(buffer.getvalue().splitlines()))
+            logger.close()
+        self.assertEqual(7, len(buffer.getvalue().splitlines()))
+
+    def testStress(self):
+        N_TASKS = 32
+        N_RECORDS = 2000
+
+        sink = poptus.FileLogger(self.__filename, True,
+                                 poptus.LOG_LEVEL_MIN_DEBUG, 64 * 1024)
+        logger = poptus.ThreadBufferedLogger(sink, 100)
+
+        def evaluate(task):
+            log, log_debug, warn, _ = \
+                poptus.create_log_functions(logger, f"Task{task}")
+            for i in range(N_RECORDS):
+                if i % 100 == 0:
+                    warn("Record {} of task {}", i, task)
+                else:
+                    log_debug("Record {} of task {} " + "x" * (i % 50),
+                              poptus.LOG_LEVEL_MIN_DEBUG, i, task)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(evaluate, range(N_TASKS)))
+        logger.close()
+
+        with open(self.__filename, "r") as fptr:
+            lines = fptr.read().splitlines()
+        self.assertEqual(N_TASKS * N_RECORDS, len(lines))
+
+        # No record is lost, torn, or out of order within its task
+        pattern = re.compile(
+            r"^\[Task(\d+)\] (WARNING - )?Record (\d+) of task (\d+) ?(x*)$"
+        )
+        next_record = [0] * N_TASKS
+        for line in lines:
+            match = pattern.match(line)
+            self.assertIsNotNone(match, line)
+            task = int(match.group(1))
+            i = int(match.group(3))
+            self.assertEqual(task, int(match.group(4)))
+            self.assertEqual(next_record[task], i)
+            self.assertEqual(i % 100 == 0, match.group(2) is not None)
+            self.assertEqual(0 if i % 100 == 0 else i % 50,
+                             len(match.group(5)))
+            next_record[task] += 1
+        self.assertEqual([N_RECORDS] * N_TASKS, next_record)